@@ -10,25 +10,15 @@ import pymysql
 import os
 import socket
 import platform
-import geocoder
 import secrets
-import io,random
-import plotly.express as px # to create visualisations at the admin session
-import plotly.graph_objects as go
-from geopy.geocoders import Nominatim
-# libraries used to parse the pdf files
-from pyresparser import ResumeParser
-from pdfminer3.layout import LAParams, LTTextBox
-from pdfminer3.pdfpage import PDFPage
-from pdfminer3.pdfinterp import PDFResourceManager
-from pdfminer3.pdfinterp import PDFPageInterpreter
-from pdfminer3.converter import TextConverter
-from streamlit_tags import st_tags
+# text readers only pull in pdfminer/pyresparser when a file is actually read
+from text_extraction import resume_readers, upload_types, file_extension
 from PIL import Image
 # pre stored data for prediction purposes
-from Courses import ds_course,web_course,android_course,ios_course,uiux_course,resume_videos,interview_videos
-import nltk
-nltk.download('stopwords')
+from Courses import resume_videos,interview_videos
+from resources import missing_nlp_resources
+# plotly, geopy/geocoder, pyresparser (spaCy) and the search/catalog indexes
+# are imported inside the pages that use them, so the first page renders fast
 
 
 ###### Preprocessing functions ######
@@ -43,77 +33,97 @@ def get_csv_download_link(df,filename,text):
     return href
 
 
-# Reads Pdf file and check_extractable
-def pdf_reader(file):
-    resource_manager = PDFResourceManager()
-    fake_file_handle = io.StringIO()
-    converter = TextConverter(resource_manager, fake_file_handle, laparams=LAParams())
-    page_interpreter = PDFPageInterpreter(resource_manager, converter)
-    with open(file, 'rb') as fh:
-        for page in PDFPage.get_pages(fh,
-                                      caching=True,
-                                      check_extractable=True):
-            page_interpreter.process_page(page)
-            print(page)
-        text = fake_file_handle.getvalue()
-
-    ## close open handles
-    converter.close()
-    fake_file_handle.close()
-    return text
+# split [(label, count), ...] rows from the analytics queries into pie chart inputs
+def split_counts(rows):
+    return [label for label, _ in rows], [count for _, count in rows]
 
 
 # show uploaded file path to view pdf_display
-def show_pdf(file_path):
-    with open(file_path, "rb") as f:
-        base64_pdf = base64.b64encode(f.read()).decode('utf-8')
+def show_pdf(data):
+    ## data is the upload's buffer (bytes or memoryview), encoded without a copy to disk
+    base64_pdf = base64.b64encode(data).decode('utf-8')
     pdf_display = F'<iframe src="data:application/pdf;base64,{base64_pdf}" width="700" height="1000" type="application/pdf"></iframe>'
     st.markdown(pdf_display, unsafe_allow_html=True)
 
 
-# course recommendations which has data already loaded from Courses.py
-def course_recommender(course_list):
+# course recommendations ranked by the skills the candidate is missing for the field
+def course_recommender(category, skills, budget):
     st.subheader("**Courses & Certificates Recommendations 👨‍🎓**")
-    c = 0
+    from course_catalog import course_catalog
     rec_course = []
     ## slider to choose from range 1-10
     no_of_reco = st.slider('Choose Number of Course Recommendations:', 1, 10, 5)
-    random.shuffle(course_list)
-    for c_name, c_link in course_list:
-        c += 1
+    courses = budget.run('course recommendations', course_catalog.recommend, category, skills, no_of_reco, default=[])
+    for c, (c_name, c_link) in enumerate(courses, start=1):
         st.markdown(f"({c}) [{c_name}]({c_link})")
         rec_course.append(c_name)
-        if c == no_of_reco:
-            break
     return rec_course
 
 
+# public IP location of the machine serving the app: two network calls, run under a deadline
+def locate():
+    import geocoder
+    from geopy.geocoders import Nominatim
+    latlong = geocoder.ip('me').latlng
+    location = Nominatim(user_agent="http").reverse(latlong, language='en')
+    address = location.raw['address']
+    return latlong, address.get('city', ''), address.get('state', ''), address.get('country', '')
+
+
+# resume fields and full text, read from the in-memory upload
+def parse_upload(pdf_file, file_ext):
+    from pyresparser import ResumeParser
+    from profiling import profiled
+    with profiled('parse', pdf_file.getbuffer()):
+        pdf_file.seek(0)
+        resume_data = ResumeParser(pdf_file).get_extracted_data()
+        pdf_file.seek(0)
+        resume_text = resume_readers[file_ext](pdf_file)
+    return resume_data, resume_text
+
+
 ###### Database Stuffs ######
 
 
-# sql connector
-connection = pymysql.connect(host='localhost',user='root',password='root@MySQL4admin',db='cv')
-cursor = connection.cursor()
+# sql connector, shared with db_manager so every insert goes through insert_user_data.
+# Opened on first use so pages that never touch the database don't wait for it.
+connection = None
+cursor = None
+
+
+def connect_db():
+    global connection, cursor
+    if connection is None:
+        from database import db_manager
+        db_manager.connect()
+        # Create table user_data, user_feedback and the tables derived from them
+        db_manager.create_tables()
+        connection = db_manager.connection
+        cursor = connection.cursor(pymysql.cursors.Cursor)
+    return cursor
 
 
 # inserting miscellaneous data, fetched results, prediction and recommendation into user_data table
-def insert_data(sec_token,ip_add,host_name,dev_user,os_name_ver,latlong,city,state,country,act_name,act_mail,act_mob,name,email,res_score,timestamp,no_of_pages,reco_field,cand_level,skills,recommended_skills,courses,pdf_name):
-    DB_table_name = 'user_data'
-    insert_sql = "insert into " + DB_table_name + """
-    values (0,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)"""
-    rec_values = (str(sec_token),str(ip_add),host_name,dev_user,os_name_ver,str(latlong),city,state,country,act_name,act_mail,act_mob,name,email,str(res_score),timestamp,str(no_of_pages),reco_field,cand_level,skills,recommended_skills,courses,pdf_name)
-    cursor.execute(insert_sql, rec_values)
-    connection.commit()
+def insert_data(sec_token,ip_add,host_name,dev_user,os_name_ver,latlong,city,state,country,act_name,act_mail,act_mob,name,email,res_score,timestamp,no_of_pages,reco_field,cand_level,skills,recommended_skills,courses,pdf_name,resume_text=''):
+    data_dict = {
+        'sec_token': str(sec_token), 'ip_add': str(ip_add), 'host_name': host_name,
+        'dev_user': dev_user, 'os_name_ver': os_name_ver, 'latlong': str(latlong),
+        'city': city, 'state': state, 'country': country,
+        'act_name': act_name, 'act_mail': act_mail, 'act_mob': act_mob,
+        'name': name, 'email': email, 'resume_score': str(res_score),
+        'timestamp': timestamp, 'no_of_pages': str(no_of_pages), 'reco_field': reco_field,
+        'cand_level': cand_level, 'skills': skills, 'recommended_skills': recommended_skills,
+        'courses': courses, 'pdf_name': pdf_name, 'resume_text': resume_text,
+    }
+    from database import db_manager
+    db_manager.insert_user_data(data_dict)
 
 
 # inserting feedback data into user_feedback table
 def insertf_data(feed_name,feed_email,feed_score,comments,Timestamp):
-    DBf_table_name = 'user_feedback'
-    insertfeed_sql = "insert into " + DBf_table_name + """
-    values (0,%s,%s,%s,%s,%s)"""
-    rec_values = (feed_name, feed_email, feed_score, comments, Timestamp)
-    cursor.execute(insertfeed_sql, rec_values)
-    connection.commit()
+    from feedback_store import feedback_store
+    feedback_store.add({'feed_name': feed_name, 'feed_email': feed_email, 'feed_score': feed_score,
+                        'comments': comments, 'timestamp': Timestamp})
 
 
 ###### Setting Page Configuration (favicon, Logo, Title) ######
@@ -153,64 +163,20 @@ def run():
     
     ''', unsafe_allow_html=True)
 
-    ###### Creating Database and Table ######
-
-
-    # Create the DB
-    db_sql = """CREATE DATABASE IF NOT EXISTS CV;"""
-    cursor.execute(db_sql)
-
-
-    # Create table user_data and user_feedback
-    DB_table_name = 'user_data'
-    table_sql = "CREATE TABLE IF NOT EXISTS " + DB_table_name + """
-                    (ID INT NOT NULL AUTO_INCREMENT,
-                    sec_token varchar(20) NOT NULL,
-                    ip_add varchar(50) NULL,
-                    host_name varchar(50) NULL,
-                    dev_user varchar(50) NULL,
-                    os_name_ver varchar(50) NULL,
-                    latlong varchar(50) NULL,
-                    city varchar(50) NULL,
-                    state varchar(50) NULL,
-                    country varchar(50) NULL,
-                    act_name varchar(50) NOT NULL,
-                    act_mail varchar(50) NOT NULL,
-                    act_mob varchar(20) NOT NULL,
-                    Name varchar(500) NOT NULL,
-                    Email_ID VARCHAR(500) NOT NULL,
-                    resume_score VARCHAR(8) NOT NULL,
-                    Timestamp VARCHAR(50) NOT NULL,
-                    Page_no VARCHAR(5) NOT NULL,
-                    Predicted_Field BLOB NOT NULL,
-                    User_level BLOB NOT NULL,
-                    Actual_skills BLOB NOT NULL,
-                    Recommended_skills BLOB NOT NULL,
-                    Recommended_courses BLOB NOT NULL,
-                    pdf_name varchar(50) NOT NULL,
-                    PRIMARY KEY (ID)
-                    );
-                """
-    cursor.execute(table_sql)
-
-
-    DBf_table_name = 'user_feedback'
-    tablef_sql = "CREATE TABLE IF NOT EXISTS " + DBf_table_name + """
-                    (ID INT NOT NULL AUTO_INCREMENT,
-                        feed_name varchar(50) NOT NULL,
-                        feed_email VARCHAR(50) NOT NULL,
-                        feed_score VARCHAR(5) NOT NULL,
-                        comments VARCHAR(100) NULL,
-                        Timestamp VARCHAR(50) NOT NULL,
-                        PRIMARY KEY (ID)
-                    );
-                """
-    cursor.execute(tablef_sql)
-
-
     ###### CODE FOR CLIENT SIDE (USER) ######
 
     if choice == 'User':
+        from deadlines import Budget, DeadlineExceeded
+        from streamlit_tags import st_tags
+
+        ## models are checked on disk, never downloaded while serving
+        missing = missing_nlp_resources()
+        if missing:
+            st.error("Missing NLP resources: " + ", ".join(missing) + ". Install them before analysing resumes.")
+            return
+        connect_db()
+        ## every slow stage below gets a deadline, and all of them share one overall budget
+        budget = Budget()
         
         # Collecting Miscellaneous Information
         act_name = st.text_input('Name*')
@@ -221,41 +187,72 @@ def run():
         ip_add = socket.gethostbyname(host_name)
         dev_user = os.getlogin()
         os_name_ver = platform.system() + " " + platform.release()
-        g = geocoder.ip('me')
-        latlong = g.latlng
-        geolocator = Nominatim(user_agent="http")
-        location = geolocator.reverse(latlong, language='en')
-        address = location.raw['address']
-        cityy = address.get('city', '')
-        statee = address.get('state', '')
-        countryy = address.get('country', '')  
-        city = cityy
-        state = statee
-        country = countryy
+        ## looked up once per session; left blank when the lookup is slow or fails
+        if 'location' not in st.session_state:
+            st.session_state['location'] = budget.run('geolocation', locate, default=(None, '', '', ''))
+        latlong, city, state, country = st.session_state['location']
 
 
         # Upload Resume
         st.markdown('''<h5 style='text-align: left; color: #021659;'> Upload Your Resume, And Get Smart Recommendations</h5>''',unsafe_allow_html=True)
         
-        ## file upload in pdf format
-        pdf_file = st.file_uploader("Choose your Resume", type=["pdf"])
+        ## file upload in pdf / docx format
+        pdf_file = st.file_uploader("Choose your Resume", type=upload_types)
         if pdf_file is not None:
-            with st.spinner('Hang On While We Cook Magic For You...'):
-                time.sleep(4)
         
-            ### saving the uploaded resume to folder
-            save_image_path = './Uploaded_Resumes/'+pdf_file.name
+            ### the upload is parsed straight from memory; keeping a copy in the
+            ### upload folder (SAVE_UPLOADS) happens on a background thread
+            from upload_store import upload_store
             pdf_name = pdf_file.name
-            with open(save_image_path, "wb") as f:
-                f.write(pdf_file.getbuffer())
-            show_pdf(save_image_path)
-
-            ### parsing and extracting whole resume 
-            resume_data = ResumeParser(save_image_path).get_extracted_data()
+            file_ext = file_extension(pdf_name)
+            upload_store.save(pdf_name, pdf_file.getbuffer())
+            if file_ext == 'pdf':
+                show_pdf(pdf_file.getbuffer())
+
+            ### optionally hand the analysis to the job workers (python job_queue.py) and check back
+            if st.checkbox('Analyse in the background and check back for the result'):
+                import hashlib
+                from job_queue import job_queue
+                resume_bytes = bytes(pdf_file.getbuffer())
+                ## same upload from the same person -> same job ID, so reruns don't queue it twice
+                job_key = hashlib.sha1(resume_bytes + (act_name + act_mail).encode('utf-8')).hexdigest()[:32]
+                metadata = {'ip_add': ip_add, 'host_name': host_name, 'dev_user': dev_user,
+                            'os_name_ver': os_name_ver, 'latlong': latlong, 'city': city, 'state': state,
+                            'country': country, 'act_name': act_name, 'act_mail': act_mail,
+                            'act_mob': act_mob, 'filename': pdf_name}
+                job_id = job_queue.submit('analyze', {'filename': pdf_name, 'metadata': metadata},
+                                          resume_bytes, job_id=job_key)
+                job = job_queue.status(job_id)
+                st.info(f"Analysis job **{job_id}** is {job['status']} (attempt {job['attempts']})")
+                st.button('Refresh status')
+                if job['status'] == 'done':
+                    result = job['result']
+                    st.success(f"Resume score: {result['resume_score']} | Field: {result['reco_field']} | Level: {result['cand_level']}")
+                    st.subheader("**Courses & Certificates Recommendations 👨‍🎓**")
+                    for c, c_name in enumerate(result.get('courses', []), start=1):
+                        st.markdown(f"({c}) {c_name}")
+                elif job['status'] == 'dead':
+                    st.error(f"Analysis failed: {job['error']}")
+                return
+
+            ### parsing and extracting whole resume
+            with st.spinner('Hang On While We Cook Magic For You...'):
+                ## the uploaded file is an in-memory BytesIO named after the upload;
+                ## PDFs are read in a resource-capped child process
+                from pyresparser.sandbox import ExtractionRejected
+                try:
+                    resume_data, resume_text = budget.run('parsing', parse_upload, pdf_file, file_ext, required=True)
+                except DeadlineExceeded as e:
+                    st.error(f"Reading this resume took longer than {e.seconds:.0f}s. Tick 'Analyse in the background' above to get the result when it is ready.")
+                    return
+                except ExtractionRejected as e:
+                    st.error(f"This PDF could not be read safely and was set aside for review. {str(e)}")
+                    return
             if resume_data:
-                
-                ## Get the whole resume data into resume_text
-                resume_text = pdf_reader(save_image_path)
+
+                ## Word only records a page count when it last saved the file
+                if resume_data['no_of_pages'] is None:
+                    resume_data['no_of_pages'] = 1
 
                 ## Showing Analyzed data from (resume_data)
                 st.header("**Resume Analysis 🤘**")
@@ -342,7 +339,7 @@ def run():
                         text='Recommended skills generated from System',value=recommended_skills,key = '2')
                         st.markdown('''<h5 style='text-align: left; color: #1ed760;'>Adding this skills to resume will boost🚀 the chances of getting a Job</h5>''',unsafe_allow_html=True)
                         # course recommendation
-                        rec_course = course_recommender(ds_course)
+                        rec_course = course_recommender('data_science', resume_data['skills'], budget)
                         break
 
                     #### Web development recommendation
@@ -355,7 +352,7 @@ def run():
                         text='Recommended skills generated from System',value=recommended_skills,key = '3')
                         st.markdown('''<h5 style='text-align: left; color: #1ed760;'>Adding this skills to resume will boost🚀 the chances of getting a Job💼</h5>''',unsafe_allow_html=True)
                         # course recommendation
-                        rec_course = course_recommender(web_course)
+                        rec_course = course_recommender('web_development', resume_data['skills'], budget)
                         break
 
                     #### Android App Development
@@ -368,7 +365,7 @@ def run():
                         text='Recommended skills generated from System',value=recommended_skills,key = '4')
                         st.markdown('''<h5 style='text-align: left; color: #1ed760;'>Adding this skills to resume will boost🚀 the chances of getting a Job💼</h5>''',unsafe_allow_html=True)
                         # course recommendation
-                        rec_course = course_recommender(android_course)
+                        rec_course = course_recommender('android_development', resume_data['skills'], budget)
                         break
 
                     #### IOS App Development
@@ -381,7 +378,7 @@ def run():
                         text='Recommended skills generated from System',value=recommended_skills,key = '5')
                         st.markdown('''<h5 style='text-align: left; color: #1ed760;'>Adding this skills to resume will boost🚀 the chances of getting a Job💼</h5>''',unsafe_allow_html=True)
                         # course recommendation
-                        rec_course = course_recommender(ios_course)
+                        rec_course = course_recommender('ios_development', resume_data['skills'], budget)
                         break
 
                     #### Ui-UX Recommendation
@@ -394,7 +391,7 @@ def run():
                         text='Recommended skills generated from System',value=recommended_skills,key = '6')
                         st.markdown('''<h5 style='text-align: left; color: #1ed760;'>Adding this skills to resume will boost🚀 the chances of getting a Job💼</h5>''',unsafe_allow_html=True)
                         # course recommendation
-                        rec_course = course_recommender(uiux_course)
+                        rec_course = course_recommender('uiux_development', resume_data['skills'], budget)
                         break
 
                     #### For Not Any Recommendations
@@ -413,113 +410,14 @@ def run():
 
                 ## Resume Scorer & Resume Writing Tips
                 st.subheader("**Resume Tips & Ideas 🥂**")
-                resume_score = 0
-                
-                ### Predicting Whether these key points are added to the resume
-                if 'Objective' or 'Summary' in resume_text:
-                    resume_score = resume_score+6
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added Objective/Summary</h4>''',unsafe_allow_html=True)                
-                else:
-                    st.markdown('''<h5 style='text-align: left; color: #000000;'>[-] Please add your career objective, it will give your career intension to the Recruiters.</h4>''',unsafe_allow_html=True)
-
-                if 'Education' or 'School' or 'College'  in resume_text:
-                    resume_score = resume_score + 12
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added Education Details</h4>''',unsafe_allow_html=True)
-                else:
-                    st.markdown('''<h5 style='text-align: left; color: #000000;'>[-] Please add Education. It will give Your Qualification level to the recruiter</h4>''',unsafe_allow_html=True)
-
-                if 'EXPERIENCE' in resume_text:
-                    resume_score = resume_score + 16
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added Experience</h4>''',unsafe_allow_html=True)
-                elif 'Experience' in resume_text:
-                    resume_score = resume_score + 16
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added Experience</h4>''',unsafe_allow_html=True)
-                else:
-                    st.markdown('''<h5 style='text-align: left; color: #000000;'>[-] Please add Experience. It will help you to stand out from crowd</h4>''',unsafe_allow_html=True)
-
-                if 'INTERNSHIPS'  in resume_text:
-                    resume_score = resume_score + 6
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added Internships</h4>''',unsafe_allow_html=True)
-                elif 'INTERNSHIP'  in resume_text:
-                    resume_score = resume_score + 6
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added Internships</h4>''',unsafe_allow_html=True)
-                elif 'Internships'  in resume_text:
-                    resume_score = resume_score + 6
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added Internships</h4>''',unsafe_allow_html=True)
-                elif 'Internship'  in resume_text:
-                    resume_score = resume_score + 6
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added Internships</h4>''',unsafe_allow_html=True)
-                else:
-                    st.markdown('''<h5 style='text-align: left; color: #000000;'>[-] Please add Internships. It will help you to stand out from crowd</h4>''',unsafe_allow_html=True)
-
-                if 'SKILLS'  in resume_text:
-                    resume_score = resume_score + 7
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added Skills</h4>''',unsafe_allow_html=True)
-                elif 'SKILL'  in resume_text:
-                    resume_score = resume_score + 7
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added Skills</h4>''',unsafe_allow_html=True)
-                elif 'Skills'  in resume_text:
-                    resume_score = resume_score + 7
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added Skills</h4>''',unsafe_allow_html=True)
-                elif 'Skill'  in resume_text:
-                    resume_score = resume_score + 7
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added Skills</h4>''',unsafe_allow_html=True)
-                else:
-                    st.markdown('''<h5 style='text-align: left; color: #000000;'>[-] Please add Skills. It will help you a lot</h4>''',unsafe_allow_html=True)
-
-                if 'HOBBIES' in resume_text:
-                    resume_score = resume_score + 4
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added your Hobbies</h4>''',unsafe_allow_html=True)
-                elif 'Hobbies' in resume_text:
-                    resume_score = resume_score + 4
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added your Hobbies</h4>''',unsafe_allow_html=True)
-                else:
-                    st.markdown('''<h5 style='text-align: left; color: #000000;'>[-] Please add Hobbies. It will show your personality to the Recruiters and give the assurance that you are fit for this role or not.</h4>''',unsafe_allow_html=True)
-
-                if 'INTERESTS'in resume_text:
-                    resume_score = resume_score + 5
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added your Interest</h4>''',unsafe_allow_html=True)
-                elif 'Interests'in resume_text:
-                    resume_score = resume_score + 5
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added your Interest</h4>''',unsafe_allow_html=True)
-                else:
-                    st.markdown('''<h5 style='text-align: left; color: #000000;'>[-] Please add Interest. It will show your interest other that job.</h4>''',unsafe_allow_html=True)
-
-                if 'ACHIEVEMENTS' in resume_text:
-                    resume_score = resume_score + 13
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added your Achievements </h4>''',unsafe_allow_html=True)
-                elif 'Achievements' in resume_text:
-                    resume_score = resume_score + 13
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added your Achievements </h4>''',unsafe_allow_html=True)
-                else:
-                    st.markdown('''<h5 style='text-align: left; color: #000000;'>[-] Please add Achievements. It will show that you are capable for the required position.</h4>''',unsafe_allow_html=True)
-
-                if 'CERTIFICATIONS' in resume_text:
-                    resume_score = resume_score + 12
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added your Certifications </h4>''',unsafe_allow_html=True)
-                elif 'Certifications' in resume_text:
-                    resume_score = resume_score + 12
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added your Certifications </h4>''',unsafe_allow_html=True)
-                elif 'Certification' in resume_text:
-                    resume_score = resume_score + 12
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added your Certifications </h4>''',unsafe_allow_html=True)
-                else:
-                    st.markdown('''<h5 style='text-align: left; color: #000000;'>[-] Please add Certifications. It will show that you have done some specialization for the required position.</h4>''',unsafe_allow_html=True)
-
-                if 'PROJECTS' in resume_text:
-                    resume_score = resume_score + 19
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added your Projects</h4>''',unsafe_allow_html=True)
-                elif 'PROJECT' in resume_text:
-                    resume_score = resume_score + 19
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added your Projects</h4>''',unsafe_allow_html=True)
-                elif 'Projects' in resume_text:
-                    resume_score = resume_score + 19
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added your Projects</h4>''',unsafe_allow_html=True)
-                elif 'Project' in resume_text:
-                    resume_score = resume_score + 19
-                    st.markdown('''<h5 style='text-align: left; color: #1ed760;'>[+] Awesome! You have added your Projects</h4>''',unsafe_allow_html=True)
-                else:
-                    st.markdown('''<h5 style='text-align: left; color: #000000;'>[-] Please add Projects. It will show that you have done work related the required position or not.</h4>''',unsafe_allow_html=True)
+                ### Scored by the same section features that rescore_all recomputes stored scores from
+                from resume_analyzer import resume_analyzer
+                resume_score, score_details = resume_analyzer.calculate_resume_score(resume_text)
+                for detail in score_details:
+                    if detail['status'] == 'Present':
+                        st.markdown(f"""<h5 style='text-align: left; color: #1ed760;'>[+] {detail['message']}</h4>""",unsafe_allow_html=True)
+                    else:
+                        st.markdown(f"""<h5 style='text-align: left; color: #000000;'>[-] {detail['message']}</h4>""",unsafe_allow_html=True)
 
                 st.subheader("**Resume Score 📝**")
                 
@@ -555,18 +453,23 @@ def run():
                 timestamp = str(cur_date+'_'+cur_time)
 
 
-                ## Calling insert_data to add all the data into user_data                
-                insert_data(str(sec_token), str(ip_add), (host_name), (dev_user), (os_name_ver), (latlong), (city), (state), (country), (act_name), (act_mail), (act_mob), resume_data['name'], resume_data['email'], str(resume_score), timestamp, str(resume_data['no_of_pages']), reco_field, cand_level, str(resume_data['skills']), str(recommended_skills), str(rec_course), pdf_name)
+                ## Calling insert_data to add all the data into user_data (a slow write finishes in the background)
+                budget.run('database write', insert_data, str(sec_token), str(ip_add), (host_name), (dev_user), (os_name_ver), (latlong), (city), (state), (country), (act_name), (act_mail), (act_mob), resume_data['name'], resume_data['email'], str(resume_score), timestamp, str(resume_data['no_of_pages']), reco_field, cand_level, str(resume_data['skills']), str(recommended_skills), str(rec_course), pdf_name, resume_text, background=True)
+
+                if budget.allows('bonus videos'):
+                    ## Recommending Resume Writing Video
+                    st.header("**Bonus Video for Resume Writing Tips💡**")
+                    resume_vid = random.choice(resume_videos)
+                    st.video(resume_vid)
 
-                ## Recommending Resume Writing Video
-                st.header("**Bonus Video for Resume Writing Tips💡**")
-                resume_vid = random.choice(resume_videos)
-                st.video(resume_vid)
+                    ## Recommending Interview Preparation Video
+                    st.header("**Bonus Video for Interview Tips💡**")
+                    interview_vid = random.choice(interview_videos)
+                    st.video(interview_vid)
 
-                ## Recommending Interview Preparation Video
-                st.header("**Bonus Video for Interview Tips💡**")
-                interview_vid = random.choice(interview_videos)
-                st.video(interview_vid)
+                ## Telling the user what was left out to keep the analysis quick
+                if budget.skipped:
+                    st.info("Your analysis is complete. To keep it quick, some extras were left out: " + budget.summary())
 
                 ## On Successful Result 
                 st.balloons()
@@ -577,6 +480,9 @@ def run():
 
     ###### CODE FOR FEEDBACK SIDE ######
     elif choice == 'Feedback':   
+        import plotly.express as px
+        from feedback_store import feedback_store
+        connect_db()
         
         # timestamp 
         ts = time.time()
@@ -602,14 +508,8 @@ def run():
                 st.balloons()    
 
 
-        # query to fetch data from user feedback table
-        query = 'select * from user_feedback'        
-        plotfeed_data = pd.read_sql(query, connection)                        
-
-
-        # fetching feed_score from the query and getting the unique values and total value count 
-        labels = plotfeed_data.feed_score.unique()
-        values = plotfeed_data.feed_score.value_counts()
+        # rating counts are kept up to date by the feedback store, no table scan
+        labels, values = split_counts(feedback_store.rating_counts())
 
 
         # plotting pie chart for user ratings
@@ -618,13 +518,23 @@ def run():
         st.plotly_chart(fig)
 
 
-        #  Fetching Comment History
-        cursor.execute('select feed_name, comments from user_feedback')
-        plfeed_cmt_data = cursor.fetchall()
-
+        #  Comment history: keyword search, else newest first with "older" pages by ID
         st.subheader("**User Comment's**")
-        dff = pd.DataFrame(plfeed_cmt_data, columns=['User', 'Comment'])
+        keywords = st.text_input('Search comments')
+        if keywords:
+            rows = feedback_store.search(keywords, limit=50)
+        else:
+            rows = feedback_store.page(st.session_state.get('feedback_before'))
+        dff = pd.DataFrame([(row['feed_name'], row['comments']) for row in rows], columns=['User', 'Comment'])
         st.dataframe(dff, width=1000)
+        if not keywords:
+            col_newest, col_older = st.columns(2)
+            if col_newest.button('Newest comments'):
+                st.session_state.pop('feedback_before', None)
+                st.experimental_rerun()
+            if rows and col_older.button('Older comments'):
+                st.session_state['feedback_before'] = rows[-1]['ID']
+                st.experimental_rerun()
 
     
     ###### CODE FOR ABOUT PAGE ######
@@ -661,6 +571,12 @@ def run():
 
     ###### CODE FOR ADMIN SIDE (ADMIN) ######
     else:
+        import plotly.express as px
+        from database import db_manager
+        from candidate_search import candidate_index
+        from analytics import analytics
+        from table_cache import table_cache
+        connect_db()
         st.success('Welcome to Admin Side')
 
         #  Admin Login
@@ -671,25 +587,19 @@ def run():
             
             ## Credentials 
             if ad_user == 'admin' and ad_password == 'admin@resume-analyzer':
+                st.session_state['admin_authenticated'] = True
                 
-                ### Fetch miscellaneous data from user_data(table) and convert it into dataframe
-                cursor.execute('''SELECT ID, ip_add, resume_score, convert(Predicted_Field using utf8), convert(User_level using utf8), city, state, country from user_data''')
-                datanalys = cursor.fetchall()
-                plot_data = pd.DataFrame(datanalys, columns=['Idt', 'IP_add', 'resume_score', 'Predicted_Field', 'User_Level', 'City', 'State', 'Country'])
-                
+                ### User data as a cached dataframe, topped up with rows newer than its ID watermark
+                df = table_cache.frame('user_data')
+
                 ### Total Users Count with a Welcome Message
-                values = plot_data.Idt.count()
+                values = len(df)
                 st.success("Welcome Deepak ! Total %d " % values + " User's Have Used Our Tool : )")                
-                
-                ### Fetch user data from user_data(table) and convert it into dataframe
-                cursor.execute('''SELECT ID, sec_token, ip_add, act_name, act_mail, act_mob, convert(Predicted_Field using utf8), Timestamp, Name, Email_ID, resume_score, Page_no, pdf_name, convert(User_level using utf8), convert(Actual_skills using utf8), convert(Recommended_skills using utf8), convert(Recommended_courses using utf8), city, state, country, latlong, os_name_ver, host_name, dev_user from user_data''')
-                data = cursor.fetchall()                
+                duplicates = db_manager.get_duplicate_count()
+                if duplicates:
+                    st.info("%d of these uploads are near-duplicates of an earlier resume (%d unique)" % (duplicates, values - duplicates))
 
                 st.header("**User's Data**")
-                df = pd.DataFrame(data, columns=['ID', 'Token', 'IP Address', 'Name', 'Mail', 'Mobile Number', 'Predicted Field', 'Timestamp',
-                                                 'Predicted Name', 'Predicted Mail', 'Resume Score', 'Total Page',  'File Name',   
-                                                 'User Level', 'Actual Skills', 'Recommended Skills', 'Recommended Course',
-                                                 'City', 'State', 'Country', 'Lat Long', 'Server OS', 'Server Name', 'Server User',])
                 
                 ### Viewing the dataframe
                 st.dataframe(df)
@@ -697,23 +607,19 @@ def run():
                 ### Downloading Report of user_data in csv file
                 st.markdown(get_csv_download_link(df,'User_Data.csv','Download Report'), unsafe_allow_html=True)
 
-                ### Fetch feedback data from user_feedback(table) and convert it into dataframe
-                cursor.execute('''SELECT * from user_feedback''')
-                data = cursor.fetchall()
+                ### Newest feedback from the feedback store (older comments are paged on the Feedback page)
+                from feedback_store import feedback_store
+                data = feedback_store.latest(feedback_store.recent_size)
 
                 st.header("**User's Feedback Data**")
-                df = pd.DataFrame(data, columns=['ID', 'Name', 'Email', 'Feedback Score', 'Comments', 'Timestamp'])
+                df = pd.DataFrame([(row['ID'], row['feed_name'], row['feed_email'], row['feed_score'], row['comments'], row['Timestamp']) for row in data],
+                                  columns=['ID', 'Name', 'Email', 'Feedback Score', 'Comments', 'Timestamp'])
                 st.dataframe(df)
 
-                ### query to fetch data from user_feedback(table)
-                query = 'select * from user_feedback'
-                plotfeed_data = pd.read_sql(query, connection)                        
-
-                ### Analyzing All the Data's in pie charts
+                ### Analyzing All the Data's in pie charts (counts come from GROUP BY queries)
 
-                # fetching feed_score from the query and getting the unique values and total value count 
-                labels = plotfeed_data.feed_score.unique()
-                values = plotfeed_data.feed_score.value_counts()
+                # rating counts of user_feedback
+                labels, values = split_counts(feedback_store.rating_counts())
                 
                 # Pie chart for user ratings
                 st.subheader("**User Rating's**")
@@ -721,8 +627,7 @@ def run():
                 st.plotly_chart(fig)
 
                 # fetching Predicted_Field from the query and getting the unique values and total value count                 
-                labels = plot_data.Predicted_Field.unique()
-                values = plot_data.Predicted_Field.value_counts()
+                labels, values = split_counts(analytics.value_counts('Predicted_Field'))
 
                 # Pie chart for predicted field recommendations
                 st.subheader("**Pie-Chart for Predicted Field Recommendation**")
@@ -730,8 +635,7 @@ def run():
                 st.plotly_chart(fig)
 
                 # fetching User_Level from the query and getting the unique values and total value count                 
-                labels = plot_data.User_Level.unique()
-                values = plot_data.User_Level.value_counts()
+                labels, values = split_counts(analytics.value_counts('User_level'))
 
                 # Pie chart for User's👨‍💻 Experienced Level
                 st.subheader("**Pie-Chart for User's Experienced Level**")
@@ -739,8 +643,7 @@ def run():
                 st.plotly_chart(fig)
 
                 # fetching resume_score from the query and getting the unique values and total value count                 
-                labels = plot_data.resume_score.unique()                
-                values = plot_data.resume_score.value_counts()
+                labels, values = split_counts(analytics.value_counts('resume_score'))
 
                 # Pie chart for Resume Score
                 st.subheader("**Pie-Chart for Resume Score**")
@@ -748,8 +651,7 @@ def run():
                 st.plotly_chart(fig)
 
                 # fetching IP_add from the query and getting the unique values and total value count 
-                labels = plot_data.IP_add.unique()
-                values = plot_data.IP_add.value_counts()
+                labels, values = split_counts(analytics.value_counts('ip_add'))
 
                 # Pie chart for Users
                 st.subheader("**Pie-Chart for Users App Used Count**")
@@ -757,8 +659,7 @@ def run():
                 st.plotly_chart(fig)
 
                 # fetching City from the query and getting the unique values and total value count 
-                labels = plot_data.City.unique()
-                values = plot_data.City.value_counts()
+                labels, values = split_counts(analytics.value_counts('city'))
 
                 # Pie chart for City
                 st.subheader("**Pie-Chart for City**")
@@ -766,8 +667,7 @@ def run():
                 st.plotly_chart(fig)
 
                 # fetching State from the query and getting the unique values and total value count 
-                labels = plot_data.State.unique()
-                values = plot_data.State.value_counts()
+                labels, values = split_counts(analytics.value_counts('state'))
 
                 # Pie chart for State
                 st.subheader("**Pie-Chart for State**")
@@ -775,8 +675,7 @@ def run():
                 st.plotly_chart(fig)
 
                 # fetching Country from the query and getting the unique values and total value count 
-                labels = plot_data.Country.unique()
-                values = plot_data.Country.value_counts()
+                labels, values = split_counts(analytics.value_counts('country'))
 
                 # Pie chart for Country
                 st.subheader("**Pie-Chart for Country**")
@@ -785,7 +684,105 @@ def run():
 
             ## For Wrong Credentials
             else:
+                st.session_state['admin_authenticated'] = False
                 st.error("Wrong ID & Password Provided")
 
+        ## Time-windowed analytics and candidate search stay available across reruns once logged in
+        if st.session_state.get('admin_authenticated'):
+            st.header("**Submissions Over Time 📅**")
+            today = datetime.date.today()
+            window = st.date_input('Date window', (today - datetime.timedelta(days=30), today))
+            granularity = st.selectbox('Granularity', ['hour', 'day', 'week', 'month'], index=1)
+            if isinstance(window, (list, tuple)) and len(window) == 2:
+                start = datetime.datetime.combine(window[0], datetime.time.min)
+                end = datetime.datetime.combine(window[1] + datetime.timedelta(days=1), datetime.time.min)
+                buckets, counts = split_counts(analytics.submissions_over_time(start, end, granularity))
+                if buckets:
+                    st.plotly_chart(px.bar(x=buckets, y=counts, labels={'x': granularity.title(), 'y': 'Uploads'},
+                                           title='Uploads per ' + granularity))
+                    bins, counts = split_counts(analytics.score_histogram(start, end))
+                    st.plotly_chart(px.bar(x=bins, y=counts, labels={'x': 'Resume score', 'y': 'Resumes'},
+                                           title='Score distribution'))
+                    st.subheader("**Field & Level Mix**")
+                    st.dataframe(pd.DataFrame(analytics.field_level_mix(start, end), columns=['Predicted Field', 'User Level', 'Resumes']))
+                    st.subheader("**Top Candidates per Field**")
+                    st.dataframe(pd.DataFrame(analytics.top_candidates(start, end)))
+                else:
+                    st.info("No uploads in this window")
+
+            st.header("**Skills 🧰**")
+            skills, counts = split_counts(analytics.skill_frequency(limit=25))
+            if skills:
+                st.plotly_chart(px.bar(x=skills, y=counts, labels={'x': 'Skill', 'y': 'Candidates'},
+                                       title='Most listed skills'))
+            skill = st.text_input('Candidates listing a skill')
+            if skill:
+                st.write(f"**{analytics.skill_count(skill)}** candidates list {skill}")
+                st.dataframe(pd.DataFrame(analytics.skill_cooccurrence(skill), columns=['Listed together with', 'Candidates']))
+            if st.button('Backfill skill tables'):
+                with st.spinner('Filling the skill dictionary from stored resumes...'):
+                    added = db_manager.backfill_skills()
+                analytics.clear()
+                st.success(f"Recorded skills of {added} stored resumes")
+
+            st.header("**Filter Candidates 🧮**")
+            from facet_index import facet_index
+            skill_options = [skill for skill, _ in facet_index.values('skill')]
+            col_all, col_none = st.columns(2)
+            all_skills = col_all.multiselect('Has all of these skills', skill_options)
+            no_skills = col_none.multiselect('Has none of these skills', skill_options)
+            any_skills = st.multiselect('Has at least one of these skills', skill_options)
+            col_field, col_level = st.columns(2)
+            fields = col_field.multiselect('Predicted field', [value for value, _ in facet_index.values('field')])
+            levels = col_level.multiselect('Experience level', [value for value, _ in facet_index.values('level')])
+            min_score, max_score = st.slider('Resume score', 0, 100, (0, 100))
+            if all_skills or no_skills or any_skills or fields or levels or (min_score, max_score) != (0, 100):
+                ids = facet_index.query(all_skills, any_skills, no_skills, fields, levels, min_score, max_score)
+                st.write(f"**{len(ids)}** matching candidates")
+                st.dataframe(pd.DataFrame(sorted(db_manager.get_candidates_by_ids(ids[:200]), key=lambda row: -row['ID'])))
+
+            st.header("**Quarantined Uploads 🚧**")
+            if st.checkbox('Show PDFs rejected by the extraction sandbox'):
+                from pyresparser.sandbox import quarantine_dir, quarantined
+                reports = quarantined()
+                st.write(f"**{len(reports)}** files in {quarantine_dir()}")
+                if reports:
+                    st.dataframe(pd.DataFrame(reports, columns=['time', 'filename', 'reason', 'bytes', 'sha1']))
+
+            st.header("**Candidate Search 🔎**")
+            job_description = st.text_area('Paste a job description to rank stored candidates')
+            top_k = st.slider('Number of candidates', 1, 50, 10)
+            if st.button('Rebuild search index'):
+                from duplicate_detector import duplicate_detector
+                with st.spinner('Indexing stored resumes and compacting the indexes...'):
+                    added = db_manager.rebuild_candidate_index()
+                    duplicate_detector.save()
+                st.success(f"Indexed {added} stored resumes")
+            if st.button('Re-score stored resumes with current weights'):
+                rescored = db_manager.rescore_all()
+                table_cache.reset('user_data')
+                st.success(f"Rescored {rescored} resumes whose score changed (rows stored before section features were kept have their old score)")
+            if st.button('Archive cold months and prune old uploads'):
+                from retention import retention_manager
+                with st.spinner('Archiving submissions older than the hot window...'):
+                    result = retention_manager.run()
+                archived = sum(result['archived'].values())
+                st.success(f"Archived {archived} rows from {len(result['archived'])} months, "
+                           f"compressed {result['uploads']['compressed']} and deleted {result['uploads']['deleted']} uploads")
+            if job_description:
+                ranked = candidate_index.search(job_description, top_k)
+                rows = {row['ID']: row for row in db_manager.get_candidates_by_ids([row_id for row_id, _ in ranked])}
+                df = pd.DataFrame([
+                    {'ID': row_id, 'Match': round(score, 2), 'Name': rows[row_id]['Name'],
+                     'Mail': rows[row_id]['Email_ID'], 'Resume Score': rows[row_id]['resume_score'],
+                     'Predicted Field': rows[row_id]['Predicted_Field'], 'User Level': rows[row_id]['User_level'],
+                     'Actual Skills': rows[row_id]['Actual_skills'], 'Timestamp': rows[row_id]['Timestamp']}
+                    for row_id, score in ranked if row_id in rows
+                ])
+                if df.empty:
+                    st.warning("No matching candidates found")
+                else:
+                    st.dataframe(df)
+
 # Calling the main (run()) function to make the whole process run
 run()
@@ -0,0 +1,117 @@
+import io
+import os
+import time
+import datetime
+import secrets
+import logging
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Functions in this module run inside pool worker processes. Heavy imports
+# (pyresparser/spaCy, pdfminer) happen in init_worker so every worker pays
+# for them once, before it takes its first task.
+
+
+def init_worker():
+    """Pool initializer: import the parsing stack once per worker process"""
+    from pyresparser.resume_parser import load_models
+    import text_extraction  # noqa: F401
+    load_models()
+    logger.info(f"Analysis worker {os.getpid()} ready")
+
+
+def ping() -> int:
+    """No-op task used to pre-warm workers"""
+    return os.getpid()
+
+
+def _buffer(data: bytes, filename: str) -> io.BytesIO:
+    buffer = io.BytesIO(data)
+    # ResumeParser reads the extension from the buffer's name
+    buffer.name = filename
+    return buffer
+
+
+def parse_resume(data: bytes, filename: str) -> Dict:
+    """Extract resume fields and text with ResumeParser from uploaded bytes"""
+    from pyresparser import ResumeParser
+    from text_extraction import extract_resume_text
+    from profiling import profiled
+    with profiled('parse', data):
+        resume_data = ResumeParser(_buffer(data, filename)).get_extracted_data().to_dict()
+        resume_data['resume_text'] = extract_resume_text(_buffer(data, filename), filename)
+    if resume_data.get('no_of_pages') is None:
+        resume_data['no_of_pages'] = 1
+    return resume_data
+
+
+def score_resume(resume_text: str, no_of_pages: int = 1) -> Dict:
+    """Score resume sections and estimate experience level"""
+    from resume_analyzer import resume_analyzer
+    score, details = resume_analyzer.calculate_resume_score(resume_text)
+    level, message = resume_analyzer.analyze_experience_level(resume_text, no_of_pages)
+    return {'resume_score': score, 'score_details': details,
+            'cand_level': level, 'level_message': message}
+
+
+def classify_skills(skills: List[str]) -> Dict:
+    """Predict the candidate's field and recommended skills"""
+    from resume_analyzer import resume_analyzer
+    field, recommended_skills, message = resume_analyzer.analyze_skills(skills)
+    return {'reco_field': field, 'recommended_skills': recommended_skills, 'message': message}
+
+
+def analyze_resume(data: bytes, filename: str) -> Dict:
+    """Parse, score and classify a resume in one task"""
+    from profiling import profiled
+    with profiled('analyze', data):
+        result = parse_resume(data, filename)
+        result.update(score_resume(result['resume_text'], result['no_of_pages']))
+        result.update(classify_skills(result.get('skills') or []))
+    return result
+
+
+def build_user_record(result: Dict, metadata: Dict, courses: List[str]) -> Dict:
+    """Shape an analysis result and submitter details into an insert_user_data dict"""
+    timestamp = datetime.datetime.fromtimestamp(time.time()).strftime('%Y-%m-%d_%H:%M:%S')
+    return {
+        'sec_token': metadata.get('sec_token') or secrets.token_urlsafe(12),
+        'ip_add': metadata.get('ip_add'), 'host_name': metadata.get('host_name'),
+        'dev_user': metadata.get('dev_user'), 'os_name_ver': metadata.get('os_name_ver'),
+        'latlong': str(metadata.get('latlong')), 'city': metadata.get('city'),
+        'state': metadata.get('state'), 'country': metadata.get('country'),
+        'act_name': metadata.get('act_name', ''), 'act_mail': metadata.get('act_mail', ''),
+        'act_mob': metadata.get('act_mob', ''),
+        'name': result.get('name') or '', 'email': result.get('email') or '',
+        'resume_score': str(result['resume_score']), 'timestamp': timestamp,
+        'no_of_pages': str(result['no_of_pages']), 'reco_field': result['reco_field'],
+        'cand_level': result['cand_level'], 'skills': str(result.get('skills') or []),
+        'recommended_skills': str(result['recommended_skills']), 'courses': str(courses),
+        'pdf_name': metadata.get('filename', ''), 'resume_text': result['resume_text'],
+    }
+
+
+def run_analysis_job(data: bytes, payload: Dict, job_id: Optional[str] = None) -> Dict:
+    """
+    Job queue handler: parse -> score -> classify -> insert into user_data.
+    The row's sec_token is derived from the job ID, so a retried job whose
+    earlier attempt already inserted its row does not insert it again.
+    """
+    from course_catalog import course_catalog
+    from database import db_manager
+    result = analyze_resume(data, payload['filename'])
+    category = result['reco_field'].lower().replace(' ', '_')
+    courses = [name for name, _ in course_catalog.recommend(category, result.get('skills') or [])]
+    if db_manager.connection is None and not db_manager.connect():
+        raise RuntimeError("Database unavailable")
+    metadata = dict(payload.get('metadata', {}))
+    if job_id:
+        metadata['sec_token'] = job_id[:20]
+    record = build_user_record(result, metadata, courses)
+    if not (job_id and db_manager.user_data_exists(record['sec_token'])):
+        if not db_manager.insert_user_data(record):
+            raise RuntimeError("Inserting user data failed")
+    result['courses'] = courses
+    result.pop('resume_text', None)
+    return result
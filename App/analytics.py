@@ -0,0 +1,193 @@
+import time
+import datetime
+import threading
+import logging
+from typing import Dict, List, Optional, Tuple
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# DATE_FORMAT patterns that label each bucket; weeks are ISO weeks
+GRANULARITIES = {
+    'hour': '%Y-%m-%d %H:00',
+    'day': '%Y-%m-%d',
+    'week': '%x-W%v',
+    'month': '%Y-%m',
+}
+
+# columns the admin charts may count by (never interpolate anything else into SQL)
+USER_COLUMNS = {
+    'ip_add': 'ip_add',
+    'city': 'city',
+    'state': 'state',
+    'country': 'country',
+    'resume_score': 'resume_score',
+    'Predicted_Field': 'convert(Predicted_Field using utf8)',
+    'User_level': 'convert(User_level using utf8)',
+}
+
+
+class Analytics:
+    """
+    Dashboard aggregates computed by the database (GROUP BY over the indexed
+    submitted_at column) instead of pandas over the whole table. Every result
+    is cached for ANALYTICS_CACHE_TTL seconds, so repeated dashboard loads
+    within that window run no queries.
+    """
+
+    def __init__(self, ttl: Optional[int] = None):
+        self.ttl = Config.ANALYTICS_CACHE_TTL if ttl is None else ttl
+        self._cache: Dict[Tuple, Tuple[float, List]] = {}
+        self._lock = threading.Lock()
+
+    def _query(self, sql: str, params: Tuple = ()) -> List[Dict]:
+        """Run a read query through db_manager, served from the TTL cache when fresh"""
+        from database import db_manager
+        key = (sql, params)
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] > now:
+                return cached[1]
+        try:
+            if db_manager.connection is None and not db_manager.connect():
+                return []
+            db_manager.cursor.execute(sql, params)
+            rows = list(db_manager.cursor.fetchall())
+        except Exception as e:
+            logger.error(f"Error running analytics query: {str(e)}")
+            return []
+        with self._lock:
+            if len(self._cache) >= 256:
+                self._cache = {k: v for k, v in self._cache.items() if v[0] > now}
+            self._cache[key] = (now + self.ttl, rows)
+        return rows
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    @staticmethod
+    def _window(start: Optional[datetime.datetime], end: Optional[datetime.datetime]) -> Tuple[str, Tuple]:
+        """WHERE clause for a [start, end) window on submitted_at; open ends are unbounded"""
+        clauses, params = [], []
+        if start is not None:
+            clauses.append('submitted_at >= %s')
+            params.append(start)
+        if end is not None:
+            clauses.append('submitted_at < %s')
+            params.append(end)
+        return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', tuple(params)
+
+    def submissions_over_time(self, start=None, end=None, granularity: str = 'day') -> List[Tuple[str, int]]:
+        """Uploads per hour/day/week/month. Returns: [(bucket label, count), ...] oldest first"""
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"granularity must be one of {', '.join(GRANULARITIES)}")
+        where, params = self._window(start, end)
+        rows = self._query(f"""
+            SELECT DATE_FORMAT(submitted_at, %s) AS bucket, COUNT(*) AS total
+            FROM user_data{where}
+            GROUP BY bucket ORDER BY bucket
+            """, (GRANULARITIES[granularity],) + params)
+        return [(row['bucket'], row['total']) for row in rows]
+
+    def score_histogram(self, start=None, end=None, bin_size: int = 10) -> List[Tuple[int, int]]:
+        """Resume scores in bins of bin_size. Returns: [(bin start, count), ...]"""
+        where, params = self._window(start, end)
+        rows = self._query(f"""
+            SELECT FLOOR(CAST(resume_score AS UNSIGNED) / %s) * %s AS bin, COUNT(*) AS total
+            FROM user_data{where}
+            GROUP BY bin ORDER BY bin
+            """, (int(bin_size), int(bin_size)) + params)
+        return [(int(row['bin']), row['total']) for row in rows]
+
+    def field_level_mix(self, start=None, end=None) -> List[Tuple[str, str, int]]:
+        """Predicted field x experience level counts. Returns: [(field, level, count), ...]"""
+        where, params = self._window(start, end)
+        rows = self._query(f"""
+            SELECT convert(Predicted_Field using utf8) AS field, convert(User_level using utf8) AS level,
+                   COUNT(*) AS total
+            FROM user_data{where}
+            GROUP BY field, level ORDER BY total DESC
+            """, params)
+        return [(row['field'], row['level'], row['total']) for row in rows]
+
+    def top_candidates(self, start=None, end=None, per_field: int = 5) -> List[Dict]:
+        """Best-scoring candidates of each predicted field (MySQL 8 window function)"""
+        where, params = self._window(start, end)
+        return self._query(f"""
+            SELECT ID, Name, Email_ID, field, score, Timestamp FROM (
+                SELECT ID, Name, Email_ID, Timestamp, convert(Predicted_Field using utf8) AS field,
+                       CAST(resume_score AS UNSIGNED) AS score,
+                       ROW_NUMBER() OVER (PARTITION BY Predicted_Field
+                                          ORDER BY CAST(resume_score AS UNSIGNED) DESC, ID DESC) AS field_rank
+                FROM user_data{where}
+            ) ranked
+            WHERE field_rank <= %s
+            ORDER BY field, score DESC
+            """, params + (int(per_field),))
+
+    def value_counts(self, column: str, start=None, end=None) -> List[Tuple[str, int]]:
+        """Counts of each value of a user_data column. Returns: [(value, count), ...] most common first"""
+        if column not in USER_COLUMNS:
+            raise ValueError(f"Cannot count by {column}")
+        where, params = self._window(start, end)
+        rows = self._query(f"""
+            SELECT {USER_COLUMNS[column]} AS value, COUNT(*) AS total
+            FROM user_data{where}
+            GROUP BY value ORDER BY total DESC
+            """, params)
+        return [(row['value'], row['total']) for row in rows]
+
+    def total_users(self, start=None, end=None) -> int:
+        where, params = self._window(start, end)
+        rows = self._query(f"SELECT COUNT(*) AS total FROM user_data{where}", params)
+        return rows[0]['total'] if rows else 0
+
+    def _skill_window(self, start, end) -> Tuple[str, str, Tuple]:
+        """Join and extra condition limiting candidate_skills c to rows submitted in [start, end)"""
+        where, params = self._window(start, end)
+        if not where:
+            return '', '', ()
+        return ' JOIN user_data u ON u.ID = c.ID', where.replace(' WHERE ', ' AND ', 1), params
+
+    def skill_frequency(self, kind: str = 'actual', start=None, end=None, limit: int = 20) -> List[Tuple[str, int]]:
+        """Candidates listing each skill. Returns: [(skill, candidates), ...] most common first"""
+        from database import SKILL_KINDS
+        join, condition, params = self._skill_window(start, end)
+        rows = self._query(f"""
+            SELECT s.label AS skill, COUNT(*) AS total
+            FROM candidate_skills c JOIN skills s ON s.ID = c.skill_id{join}
+            WHERE c.kind = %s{condition}
+            GROUP BY c.skill_id, s.label ORDER BY total DESC LIMIT %s
+            """, (SKILL_KINDS[kind],) + params + (int(limit),))
+        return [(row['skill'], row['total']) for row in rows]
+
+    def skill_count(self, skill: str, start=None, end=None) -> int:
+        """Number of candidates whose extracted skills include `skill`"""
+        from database import SKILL_KINDS, normalize_skill
+        join, condition, params = self._skill_window(start, end)
+        rows = self._query(f"""
+            SELECT COUNT(*) AS total
+            FROM candidate_skills c JOIN skills s ON s.ID = c.skill_id{join}
+            WHERE s.name = %s AND c.kind = %s{condition}
+            """, (normalize_skill(skill), SKILL_KINDS['actual']) + params)
+        return rows[0]['total'] if rows else 0
+
+    def skill_cooccurrence(self, skill: str, start=None, end=None, limit: int = 10) -> List[Tuple[str, int]]:
+        """Skills most often listed together with `skill`. Returns: [(other skill, candidates), ...]"""
+        from database import SKILL_KINDS, normalize_skill
+        join, condition, params = self._skill_window(start, end)
+        rows = self._query(f"""
+            SELECT o.label AS skill, COUNT(*) AS total
+            FROM skills s
+            JOIN candidate_skills c ON c.skill_id = s.ID AND c.kind = %s
+            JOIN candidate_skills other ON other.ID = c.ID AND other.kind = c.kind AND other.skill_id <> c.skill_id
+            JOIN skills o ON o.ID = other.skill_id{join}
+            WHERE s.name = %s{condition}
+            GROUP BY other.skill_id, o.label ORDER BY total DESC LIMIT %s
+            """, (SKILL_KINDS['actual'], normalize_skill(skill)) + params + (int(limit),))
+        return [(row['skill'], row['total']) for row in rows]
+
+# Global analytics instance
+analytics = Analytics()
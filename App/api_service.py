@@ -0,0 +1,268 @@
+"""
+Headless HTTP API for resume analysis.
+
+A plain ASGI application (no framework needed), served for example with
+    uvicorn api_service:app --host 0.0.0.0 --port 8000
+
+Endpoints:
+    GET  /health            pool status
+    POST /parse?filename=   raw resume bytes -> extracted fields and text
+    POST /score             {"resume_text": ..., "no_of_pages": ...}
+    POST /classify          {"skills": [...]}
+    POST /analyze?filename= raw resume bytes -> parse + score + classify
+    POST /jobs?filename=    raw resume bytes -> 202 {"job_id": ...}; other
+                            query parameters (act_name, act_mail, ...) are
+                            stored with the row
+    GET  /jobs/<job_id>     job status, result once done
+    POST /candidates/filter {"all_skills": [...], "any_skills": [...], "no_skills": [...],
+                             "fields": [...], "levels": [...], "min_score": 70,
+                             "max_score": 100, "limit": 50} -> stored candidates
+                            matching every condition, from the bitmap index;
+                            needs an X-Admin-Token header equal to
+                            API_ADMIN_TOKEN (disabled while that is unset)
+
+CPU-bound work runs in a pre-warmed process pool. Once API_WORKERS x
+API_QUEUE_SIZE requests are in flight, new ones get 429 instead of
+queueing without bound.
+"""
+import hmac
+import json
+import asyncio
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+from config import Config
+from text_extraction import upload_types, file_extension
+import analysis_worker
+from job_queue import job_queue
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceSaturated(Exception):
+    """Raised when the pool already holds the maximum number of requests"""
+
+
+class AnalysisService:
+    """Process pool with a bounded number of in-flight tasks"""
+
+    def __init__(self, workers: Optional[int] = None, queue_size: Optional[int] = None):
+        self.workers = workers or Config.API_WORKERS
+        self.max_in_flight = self.workers * (queue_size or Config.API_QUEUE_SIZE)
+        self.in_flight = 0
+        self.pool: Optional[ProcessPoolExecutor] = None
+        self._start_lock = threading.Lock()
+
+    def start(self):
+        """Create the pool and load the parsing stack in every worker (blocks until warm)"""
+        with self._start_lock:
+            if self.pool is not None:
+                return
+            pool = ProcessPoolExecutor(max_workers=self.workers, initializer=analysis_worker.init_worker)
+            warm = [pool.submit(analysis_worker.ping) for _ in range(self.workers)]
+            pids = {future.result() for future in warm}
+            self.pool = pool
+            logger.info(f"Analysis pool started with {len(pids)} warm workers")
+
+    def stop(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=True)
+            self.pool = None
+
+    async def run(self, fn, *args):
+        """Run fn in the pool, or raise ServiceSaturated when the queue is full"""
+        if self.in_flight >= self.max_in_flight:
+            raise ServiceSaturated()
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            if self.pool is None:
+                # no lifespan startup (e.g. TestClient): warm up off the event loop
+                await loop.run_in_executor(None, self.start)
+            return await loop.run_in_executor(self.pool, fn, *args)
+        finally:
+            self.in_flight -= 1
+
+
+def filter_candidates(data: Dict) -> Dict:
+    """Answer a boolean candidate filter from the facet index. Returns: {total, candidates}"""
+    from database import db_manager
+    from facet_index import facet_index
+    ids = facet_index.query(
+        all_skills=data.get('all_skills', []), any_skills=data.get('any_skills', []),
+        no_skills=data.get('no_skills', []), fields=data.get('fields', []), levels=data.get('levels', []),
+        min_score=data.get('min_score'), max_score=data.get('max_score'))
+    page = ids[:int(data.get('limit', 50))]
+    rows = {row['ID']: row for row in db_manager.get_candidates_by_ids(page)}
+    return {'total': len(ids), 'candidates': [rows[row_id] for row_id in page if row_id in rows]}
+
+
+class ResumeAPI:
+    """ASGI application routing requests to the analysis service"""
+
+    def __init__(self, service: Optional[AnalysisService] = None):
+        self.service = service or AnalysisService()
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+        body = b''
+        more_body = True
+        while more_body:
+            message = await receive()
+            body += message.get('body', b'')
+            more_body = message.get('more_body', False)
+            if len(body) > Config.MAX_FILE_SIZE:
+                await self._respond(send, 413, {'error': 'Request body too large'})
+                return
+        query = {key: values[0] for key, values in parse_qs(scope.get('query_string', b'').decode()).items()}
+        headers = {name.decode('latin-1').lower(): value.decode('latin-1') for name, value in scope.get('headers', [])}
+        status, payload = await self.handle(scope['method'], scope['path'], query, body, headers)
+        await self._respond(send, status, payload)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                try:
+                    # warming the workers takes seconds; keep the event loop free meanwhile
+                    await asyncio.get_running_loop().run_in_executor(None, self.service.start)
+                    await send({'type': 'lifespan.startup.complete'})
+                except Exception as e:
+                    await send({'type': 'lifespan.startup.failed', 'message': str(e)})
+            elif message['type'] == 'lifespan.shutdown':
+                await asyncio.get_running_loop().run_in_executor(None, self.service.stop)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    @staticmethod
+    async def _respond(send, status: int, payload: Dict):
+        body = json.dumps(payload, default=str).encode('utf-8')
+        await send({'type': 'http.response.start', 'status': status,
+                    'headers': [(b'content-type', b'application/json'),
+                                (b'content-length', str(len(body)).encode())]})
+        await send({'type': 'http.response.body', 'body': body})
+
+    @staticmethod
+    def _is_admin(headers: Dict) -> bool:
+        """Whether the request carries the admin token (never, while API_ADMIN_TOKEN is unset)"""
+        token = headers.get('x-admin-token', '')
+        return bool(Config.API_ADMIN_TOKEN) and hmac.compare_digest(token.encode(), Config.API_ADMIN_TOKEN.encode())
+
+    async def handle(self, method: str, path: str, query: Dict, body: bytes,
+                     headers: Optional[Dict] = None) -> Tuple[int, Dict]:
+        """Route one request. Returns: (status, json payload)"""
+        try:
+            if method == 'GET' and path == '/health':
+                return 200, {'workers': self.service.workers, 'in_flight': self.service.in_flight,
+                             'max_in_flight': self.service.max_in_flight}
+            if method == 'GET' and path.startswith('/jobs/'):
+                job = job_queue.status(path[len('/jobs/'):])
+                return (200, job) if job else (404, {'error': 'Unknown job'})
+            if method != 'POST':
+                return 405, {'error': 'Method not allowed'}
+            if path in ('/parse', '/analyze'):
+                filename = query.get('filename', '')
+                if file_extension(filename) not in upload_types:
+                    return 400, {'error': f"Pass ?filename= with one of {', '.join(upload_types)}"}
+                fn = analysis_worker.parse_resume if path == '/parse' else analysis_worker.analyze_resume
+                try:
+                    return 200, await self.service.run(fn, body, filename)
+                except ValueError as e:
+                    # the upload itself is at fault, e.g. a PDF rejected by the extraction sandbox
+                    return 422, {'error': str(e)}
+            if path == '/jobs':
+                filename = query.get('filename', '')
+                if file_extension(filename) not in upload_types:
+                    return 400, {'error': f"Pass ?filename= with one of {', '.join(upload_types)}"}
+                metadata = {key: value for key, value in query.items() if key != 'filename'}
+                metadata['filename'] = filename
+                job_id = job_queue.submit('analyze', {'filename': filename, 'metadata': metadata}, body)
+                return 202, {'job_id': job_id}
+            if path == '/score':
+                data = json.loads(body or b'{}')
+                try:
+                    no_of_pages = int(data.get('no_of_pages', 1))
+                except (TypeError, ValueError):
+                    return 400, {'error': 'no_of_pages must be an integer'}
+                return 200, await self.service.run(analysis_worker.score_resume, data.get('resume_text', ''),
+                                                   no_of_pages)
+            if path == '/candidates/filter':
+                # returns stored names and mail addresses, like the admin page
+                if not self._is_admin(headers or {}):
+                    return 403, {'error': 'Admin token required'}
+                data = json.loads(body or b'{}')
+                try:
+                    # index and database work run off the event loop, not in the analysis pool
+                    return 200, await asyncio.get_running_loop().run_in_executor(None, filter_candidates, data)
+                except (TypeError, ValueError):
+                    return 400, {'error': 'Scores and limit must be integers, conditions lists of strings'}
+            if path == '/classify':
+                data = json.loads(body or b'{}')
+                return 200, await self.service.run(analysis_worker.classify_skills, list(data.get('skills', [])))
+            return 404, {'error': 'Not found'}
+        except ServiceSaturated:
+            return 429, {'error': 'Analysis queue is full, retry later'}
+        except json.JSONDecodeError:
+            return 400, {'error': 'Request body must be JSON'}
+        except Exception as e:
+            logger.error(f"Error handling {method} {path}: {str(e)}")
+            return 500, {'error': 'Analysis failed'}
+
+
+class TestClient:
+    """
+    In-process client that drives the ASGI app without a server, for tests
+    and load generation:
+
+        client = TestClient(app)
+        status, payload = client.post('/classify', json_body={'skills': ['Flutter']})
+        results = client.run_concurrently([('POST', '/parse?filename=cv.pdf', data)] * 50)
+    """
+
+    def __init__(self, application: ResumeAPI):
+        self.app = application
+
+    async def request(self, method: str, path: str, body: bytes = b'',
+                      headers: Optional[Dict] = None) -> Tuple[int, Dict]:
+        path, _, query_string = path.partition('?')
+        scope = {'type': 'http', 'method': method, 'path': path, 'query_string': query_string.encode(),
+                 'headers': [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                             for name, value in (headers or {}).items()]}
+        messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+        response = {}
+
+        async def receive():
+            return messages.pop(0) if messages else {'type': 'http.disconnect'}
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                response['status'] = message['status']
+            elif message['type'] == 'http.response.body':
+                response['body'] = response.get('body', b'') + message.get('body', b'')
+
+        await self.app(scope, receive, send)
+        return response['status'], json.loads(response.get('body') or b'{}')
+
+    def get(self, path: str) -> Tuple[int, Dict]:
+        return asyncio.run(self.request('GET', path))
+
+    def post(self, path: str, body: bytes = b'', json_body: Optional[Dict] = None,
+             headers: Optional[Dict] = None) -> Tuple[int, Dict]:
+        if json_body is not None:
+            body = json.dumps(json_body).encode('utf-8')
+        return asyncio.run(self.request('POST', path, body, headers))
+
+    def run_concurrently(self, requests: List[Tuple[str, str, bytes]]) -> List[Tuple[int, Dict]]:
+        """Send all (method, path, body) requests at once and return their responses in order"""
+        async def run_all():
+            return await asyncio.gather(*(self.request(method, path, body) for method, path, body in requests))
+        return asyncio.run(run_all())
+
+# Global ASGI application
+app = ResumeAPI()
@@ -0,0 +1,302 @@
+import os
+import re
+import json
+import math
+import argparse
+import threading
+import logging
+from array import array
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from config import Config
+from index_log import IndexLog
+
+logger = logging.getLogger(__name__)
+
+TOKEN_REGEX = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens, keeping names like c++ and c# intact"""
+    return TOKEN_REGEX.findall(text.lower())
+
+
+class CandidateIndex:
+    """
+    BM25 index over stored resume text and extracted skills.
+
+    Postings are kept as compact per-term arrays (a sparse term x document
+    matrix in column form), so adding a resume only appends to the terms it
+    contains and a query only touches the postings of its own terms. Every
+    add is appended to a log shared by all app and worker processes, and
+    each search first applies lines the others appended. compact() folds
+    the log into a snapshot once it passes INDEX_LOG_MAX_BYTES; run
+        python candidate_search.py --backfill
+    to index rows stored before the index existed.
+    """
+
+    def __init__(self, index_dir: Optional[str] = None, k1: float = 1.5, b: float = 0.75):
+        self.index_dir = index_dir or Config.INDEX_FOLDER
+        self.snapshot_path = os.path.join(self.index_dir, 'candidates.npz')
+        self.log = IndexLog(os.path.join(self.index_dir, 'candidates.log'))
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self.row_ids = array('q')
+        self.doc_lengths = array('i')
+        self.postings: Dict[str, Tuple[array, array]] = {}
+        self.positions: Dict[int, int] = {}
+        # documents of removed rows, skipped by search until the next snapshot drops them
+        self.removed_docs = set()
+        self._term_cache: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._norm_cache: Optional[np.ndarray] = None
+        self._loaded = False
+
+    def _read_snapshot(self):
+        """Postings are stored flattened: every term's doc and tf arrays back to back, split by offsets"""
+        with np.load(self.snapshot_path, allow_pickle=False) as snapshot:
+            self.row_ids = array('q', snapshot['row_ids'].astype(np.int64).tobytes())
+            self.doc_lengths = array('i', snapshot['doc_lengths'].astype(np.intc).tobytes())
+            offsets = snapshot['offsets']
+            docs = snapshot['docs'].astype(np.intc)
+            tfs = snapshot['tfs'].astype(np.intc)
+            for i, term in enumerate(snapshot['terms'].tolist()):
+                start, end = offsets[i], offsets[i + 1]
+                self.postings[term] = (array('i', docs[start:end].tobytes()), array('i', tfs[start:end].tobytes()))
+        self.positions = {row_id: i for i, row_id in enumerate(self.row_ids)}
+
+    def _write_snapshot(self, f):
+        terms = list(self.postings)
+        lengths = [len(self.postings[term][0]) for term in terms]
+        np.savez(f,
+                 row_ids=np.frombuffer(self.row_ids, dtype=np.int64),
+                 doc_lengths=np.frombuffer(self.doc_lengths, dtype=np.intc),
+                 terms=np.array(terms, dtype=str),
+                 offsets=np.concatenate(([0], np.cumsum(lengths, dtype=np.int64))),
+                 docs=np.concatenate([np.frombuffer(self.postings[term][0], dtype=np.intc) for term in terms]
+                                     or [np.zeros(0, dtype=np.intc)]),
+                 tfs=np.concatenate([np.frombuffer(self.postings[term][1], dtype=np.intc) for term in terms]
+                                    or [np.zeros(0, dtype=np.intc)]))
+
+    def _catch_up(self):
+        """
+        Load the snapshot once, then apply log lines other processes appended (lock held).
+        A failed load leaves the index empty and unloaded and re-raises, so it is retried
+        and never saved over the snapshot.
+        """
+        try:
+            if not self._loaded:
+                self._reset()
+                self.log.offset, self.log.inode = 0, None
+                if os.path.exists(self.snapshot_path):
+                    self._read_snapshot()
+                self._loaded = True
+            replaced, lines = self.log.read_new()
+            if replaced:
+                # compacted by another process: its snapshot holds everything
+                self._loaded = False
+                return self._catch_up()
+            for line in lines:
+                entry = json.loads(line)
+                if 'remove' in entry:
+                    self._remove_ids(entry['remove'])
+                else:
+                    self._add_terms(entry['id'], entry['terms'])
+        except Exception:
+            self._reset()
+            raise
+
+    def load(self):
+        """Load the index, or pick up resumes other processes added since the last call"""
+        with self._lock:
+            try:
+                with self.log.locked():
+                    self._catch_up()
+            except Exception as e:
+                logger.error(f"Error loading candidate index: {str(e)}")
+
+    def save(self):
+        """Write a snapshot of the whole index and start a fresh add log"""
+        with self._lock:
+            try:
+                with self.log.locked(exclusive=True):
+                    self._catch_up()
+                    if not self._loaded:
+                        raise RuntimeError('index not loaded, keeping the existing snapshot')
+                    self._drop_removed()
+                    os.makedirs(self.index_dir, exist_ok=True)
+                    tmp_path = self.snapshot_path + '.tmp'
+                    with open(tmp_path, 'wb') as f:
+                        self._write_snapshot(f)
+                    os.replace(tmp_path, self.snapshot_path)
+                    self.log.reset()
+                logger.info(f"Candidate index compacted with {len(self.row_ids)} resumes")
+                return True
+            except Exception as e:
+                logger.error(f"Error saving candidate index: {str(e)}")
+                return False
+
+    def compact(self, max_log_bytes: Optional[int] = None) -> bool:
+        """Fold the add log into the snapshot once it grows past max_log_bytes"""
+        limit = Config.INDEX_LOG_MAX_BYTES if max_log_bytes is None else max_log_bytes
+        if self.log.size() <= limit:
+            return False
+        return self.save()
+
+    @staticmethod
+    def document_terms(resume_text: str, skills: Iterable[str]) -> Dict[str, int]:
+        """Term counts for a resume; skill terms count double"""
+        terms = Counter(tokenize(resume_text or ''))
+        for skill in skills or []:
+            for token in tokenize(skill):
+                terms[token] += 2
+        return dict(terms)
+
+    def add(self, row_id: int, resume_text: str, skills: Iterable[str]) -> bool:
+        """Index one stored resume under its user_data ID"""
+        with self._lock:
+            try:
+                with self.log.locked(exclusive=True):
+                    self._catch_up()
+                    if row_id in self.positions:
+                        return False
+                    terms = self.document_terms(resume_text, skills)
+                    self._add_terms(row_id, terms)
+                    self.log.append(json.dumps({'id': row_id, 'terms': terms}))
+            except Exception as e:
+                logger.error(f"Error indexing resume {row_id}: {str(e)}")
+                return False
+        self.compact()
+        return True
+
+    def remove(self, row_ids: Iterable[int]) -> int:
+        """Drop rows deleted from user_data (e.g. archived) from search results. Returns: rows removed"""
+        with self._lock:
+            try:
+                with self.log.locked(exclusive=True):
+                    self._catch_up()
+                    present = [int(row_id) for row_id in row_ids if row_id in self.positions]
+                    if present:
+                        self._remove_ids(present)
+                        self.log.append(json.dumps({'remove': present}))
+            except Exception as e:
+                logger.error(f"Error removing resumes from the candidate index: {str(e)}")
+                return 0
+        self.compact()
+        return len(present)
+
+    def _remove_ids(self, row_ids: Iterable[int]):
+        for row_id in row_ids:
+            doc = self.positions.pop(row_id, None)
+            if doc is not None:
+                self.removed_docs.add(doc)
+
+    def _drop_removed(self):
+        """Renumber the documents without the removed ones, before a snapshot is written"""
+        if not self.removed_docs:
+            return
+        keep = np.ones(len(self.row_ids), dtype=bool)
+        keep[list(self.removed_docs)] = False
+        renumbered = (np.cumsum(keep) - 1).astype(np.intc)
+        for term, (docs, tfs) in list(self.postings.items()):
+            docs = np.frombuffer(docs, dtype=np.intc)
+            kept = keep[docs]
+            if kept.any():
+                self.postings[term] = (array('i', renumbered[docs[kept]].tobytes()),
+                                       array('i', np.frombuffer(tfs, dtype=np.intc)[kept].tobytes()))
+            else:
+                del self.postings[term]
+        self.row_ids = array('q', np.frombuffer(self.row_ids, dtype=np.int64)[keep].tobytes())
+        self.doc_lengths = array('i', np.frombuffer(self.doc_lengths, dtype=np.intc)[keep].tobytes())
+        self.positions = {row_id: i for i, row_id in enumerate(self.row_ids)}
+        self.removed_docs = set()
+        self._term_cache = {}
+        self._norm_cache = None
+
+    def _add_terms(self, row_id: int, terms: Dict[str, int]):
+        if row_id in self.positions:
+            return
+        doc = len(self.row_ids)
+        self.row_ids.append(row_id)
+        self.doc_lengths.append(sum(terms.values()))
+        self.positions[row_id] = doc
+        for term, tf in terms.items():
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = (array('i'), array('i'))
+            postings[0].append(doc)
+            postings[1].append(tf)
+            self._term_cache.pop(term, None)
+        self._norm_cache = None
+
+    def _term_arrays(self, term: str):
+        cached = self._term_cache.get(term)
+        if cached is None:
+            postings = self.postings.get(term)
+            if postings is None:
+                return None
+            cached = (np.frombuffer(postings[0], dtype=np.intc).copy(),
+                      np.frombuffer(postings[1], dtype=np.intc).astype(np.float64))
+            self._term_cache[term] = cached
+        return cached
+
+    def _length_norm(self) -> np.ndarray:
+        if self._norm_cache is None:
+            lengths = np.frombuffer(self.doc_lengths, dtype=np.intc).astype(np.float64)
+            avg_length = lengths.mean() if len(lengths) else 1.0
+            self._norm_cache = self.k1 * (1 - self.b + self.b * lengths / max(avg_length, 1.0))
+        return self._norm_cache
+
+    def search(self, query: str, top_k: int = 10) -> List[Tuple[int, float]]:
+        """
+        Rank stored resumes against a job description
+        Returns: [(user_data ID, score), ...] best first
+        """
+        with self._lock:
+            self.load()
+            try:
+                n_docs = len(self.row_ids)
+                terms = set(tokenize(query))
+                if n_docs == 0 or not terms:
+                    return []
+                norm = self._length_norm()
+                scores = np.zeros(n_docs)
+                for term in terms:
+                    arrays = self._term_arrays(term)
+                    if arrays is None:
+                        continue
+                    docs, tfs = arrays
+                    idf = math.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+                    scores[docs] += idf * tfs * (self.k1 + 1) / (tfs + norm[docs])
+                if self.removed_docs:
+                    scores[list(self.removed_docs)] = 0
+                hits = int(np.count_nonzero(scores))
+                k = min(top_k, hits)
+                if k == 0:
+                    return []
+                best = np.argpartition(-scores, k - 1)[:k]
+                best = best[np.argsort(-scores[best])]
+                return [(int(self.row_ids[i]), float(scores[i])) for i in best]
+            except Exception as e:
+                logger.error(f"Error searching candidate index: {str(e)}")
+                return []
+
+# Global candidate index instance
+candidate_index = CandidateIndex()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Maintain the candidate search index')
+    parser.add_argument('--backfill', action='store_true', help='index stored rows missing from the index')
+    args = parser.parse_args()
+    if args.backfill:
+        from database import db_manager
+        if not db_manager.connect():
+            raise SystemExit('Database unavailable')
+        print(f"Indexed {db_manager.rebuild_candidate_index()} stored resumes")
+    elif candidate_index.save():
+        print(f"Compacted candidate index with {len(candidate_index.row_ids)} resumes")
@@ -14,11 +14,47 @@ class Config:
     # Admin Configuration
     ADMIN_USERNAME = os.getenv('ADMIN_USERNAME', 'admin')
     ADMIN_PASSWORD = os.getenv('ADMIN_PASSWORD', 'admin@resume-analyzer')
+    API_ADMIN_TOKEN = os.getenv('API_ADMIN_TOKEN', '')  # X-Admin-Token for the API's candidate endpoints, unset disables them
     
     # Application Configuration
     UPLOAD_FOLDER = os.getenv('UPLOAD_FOLDER', './Uploaded_Resumes/')
+    SAVE_UPLOADS = os.getenv('SAVE_UPLOADS', 'true').lower() in ('1', 'true', 'yes')  # keep a copy of each upload
     MAX_FILE_SIZE = int(os.getenv('MAX_FILE_SIZE', 10 * 1024 * 1024))  # 10MB
     ALLOWED_EXTENSIONS = {'pdf', 'docx', 'doc'}
+    INDEX_FOLDER = os.getenv('INDEX_FOLDER', './Index/')
+    DUPLICATE_THRESHOLD = float(os.getenv('DUPLICATE_THRESHOLD', 0.8))
+    INDEX_LOG_MAX_BYTES = int(os.getenv('INDEX_LOG_MAX_BYTES', 8388608))  # compact past 8MB
+    ANALYTICS_CACHE_TTL = int(os.getenv('ANALYTICS_CACHE_TTL', 60))  # seconds
+    FEEDBACK_RECENT_SIZE = int(os.getenv('FEEDBACK_RECENT_SIZE', 50))  # newest comments kept in memory
+    DASHBOARD_CHECK_INTERVAL = float(os.getenv('DASHBOARD_CHECK_INTERVAL', 5))  # seconds between new-row checks
+    
+    # Retention Configuration
+    ARCHIVE_FOLDER = os.getenv('ARCHIVE_FOLDER', './Archive/')
+    HOT_MONTHS = int(os.getenv('HOT_MONTHS', 6))  # months of submissions kept in user_data, 0 keeps all
+    UPLOAD_COMPRESS_DAYS = int(os.getenv('UPLOAD_COMPRESS_DAYS', 30))  # gzip uploads older than this, 0 never
+    UPLOAD_DELETE_DAYS = int(os.getenv('UPLOAD_DELETE_DAYS', 365))  # delete uploads older than this, 0 never
+    
+    # Upload Flow Deadlines (seconds)
+    UPLOAD_BUDGET = float(os.getenv('UPLOAD_BUDGET', 60))  # whole analysis of one upload
+    STAGE_TIMEOUTS = {
+        'geolocation': float(os.getenv('GEOLOCATION_TIMEOUT', 3)),
+        'parsing': float(os.getenv('PARSE_TIMEOUT', 30)),
+        'course recommendations': float(os.getenv('COURSES_TIMEOUT', 3)),
+        'database write': float(os.getenv('DB_WRITE_TIMEOUT', 5)),
+    }
+    
+    # Profiling (off by default)
+    PROFILE_SLOW_MS = float(os.getenv('PROFILE_SLOW_MS', 0))  # save a cProfile capture of analyses slower than this
+    PROFILE_FOLDER = os.getenv('PROFILE_FOLDER', './Profiles/')
+    
+    # Analysis API Configuration
+    API_WORKERS = int(os.getenv('API_WORKERS', os.cpu_count() or 1))
+    API_QUEUE_SIZE = int(os.getenv('API_QUEUE_SIZE', 4))  # in-flight requests per worker
+    
+    # Job Queue Configuration
+    JOB_DB_PATH = os.getenv('JOB_DB_PATH', './jobs.sqlite3')
+    JOB_VISIBILITY_TIMEOUT = int(os.getenv('JOB_VISIBILITY_TIMEOUT', 300))  # seconds
+    JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', 3))
     
     # Resume Scoring Weights
     SCORING_WEIGHTS = {
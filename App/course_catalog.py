@@ -0,0 +1,124 @@
+import re
+import threading
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from config import Config
+import Courses
+
+logger = logging.getLogger(__name__)
+
+# Courses.py list for every skill category in Config.SKILL_CATEGORIES
+CATEGORY_COURSES = {
+    'data_science': 'ds_course',
+    'web_development': 'web_course',
+    'android_development': 'android_course',
+    'ios_development': 'ios_course',
+    'uiux_development': 'uiux_course',
+}
+
+# a course covering a missing skill always outranks one that only matches the field
+FIELD_SCORE = 0.5
+TIE_BREAK = 0.25
+
+
+def _tokens(text: str) -> frozenset:
+    return frozenset(re.findall(r"[a-z0-9+#]+", text.lower()))
+
+
+class CourseCatalog:
+    """
+    Courses tagged with the skills they teach, ranked by how many of a
+    candidate's missing skills they cover.
+
+    The catalog is loaded once into a course x skill matrix, so ranking is a
+    single matrix-vector product and never mutates the Courses.py lists.
+    """
+
+    def __init__(self):
+        self.names: List[str] = []
+        self.links: List[str] = []
+        self.categories = np.zeros(0, dtype=np.int32)
+        self.category_ids: Dict[str, int] = {}
+        self.skills: List[str] = []
+        self.skill_ids: Dict[str, int] = {}
+        self.matrix = np.zeros((0, 0), dtype=np.float32)
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def load(self, courses: Optional[Iterable[Tuple[str, str, str]]] = None):
+        """
+        Build the catalog from (name, link, category) rows, Courses.py by default.
+        A course is tagged with every skill of its category whose words all appear in its name.
+        """
+        with self._lock:
+            try:
+                if courses is None:
+                    courses = [(name, link, category)
+                               for category, attr in CATEGORY_COURSES.items()
+                               for name, link in getattr(Courses, attr)]
+                courses = list(courses)
+                self.category_ids = {category: i for i, category in enumerate(Config.SKILL_CATEGORIES)}
+                self.skills = sorted({skill.lower()
+                                      for data in Config.SKILL_CATEGORIES.values()
+                                      for skill in data['keywords'] + data['recommended_skills']})
+                self.skill_ids = {skill: i for i, skill in enumerate(self.skills)}
+                skill_tokens = {skill: _tokens(skill) for skill in self.skills}
+
+                self.names = [name for name, _, _ in courses]
+                self.links = [link for _, link, _ in courses]
+                self.categories = np.array([self.category_ids.get(category, -1) for _, _, category in courses],
+                                           dtype=np.int32)
+                self.matrix = np.zeros((len(courses), len(self.skills)), dtype=np.float32)
+                for row, (name, _, category) in enumerate(courses):
+                    name_tokens = _tokens(name)
+                    data = Config.SKILL_CATEGORIES.get(category, {})
+                    for skill in data.get('keywords', []) + data.get('recommended_skills', []):
+                        tokens = skill_tokens[skill.lower()]
+                        if tokens and tokens <= name_tokens:
+                            self.matrix[row, self.skill_ids[skill.lower()]] = 1.0
+                self._loaded = True
+                logger.info(f"Course catalog loaded with {len(self.names)} courses")
+            except Exception as e:
+                logger.error(f"Error loading course catalog: {str(e)}")
+
+    def skill_gap(self, category: str, candidate_skills: Iterable[str]) -> np.ndarray:
+        """Vector over the skill vocabulary marking category skills the candidate lacks"""
+        gap = np.zeros(len(self.skills), dtype=np.float32)
+        data = Config.SKILL_CATEGORIES.get(category)
+        if not data:
+            return gap
+        have = {skill.lower() for skill in candidate_skills or []}
+        for skill in data['keywords'] + data['recommended_skills']:
+            if skill.lower() not in have:
+                gap[self.skill_ids[skill.lower()]] = 1.0
+        return gap
+
+    def recommend(self, category: str, candidate_skills: Iterable[str],
+                  n: int = 5, seed: int = 0) -> List[Tuple[str, str]]:
+        """
+        Rank courses of a category by the missing skills they cover
+        Returns: [(course name, link), ...] best first, same output for the same seed
+        """
+        if not self._loaded:
+            self.load()
+        try:
+            category_id = self.category_ids.get(category)
+            if category_id is None or not self.names:
+                return []
+            scores = self.matrix @ self.skill_gap(category, candidate_skills)
+            scores += FIELD_SCORE
+            scores += np.random.default_rng(seed).uniform(0, TIE_BREAK, size=len(scores))
+            scores[self.categories != category_id] = -np.inf
+            k = min(n, int(np.count_nonzero(self.categories == category_id)))
+            if k <= 0:
+                return []
+            best = np.argpartition(-scores, k - 1)[:k]
+            best = best[np.argsort(-scores[best], kind='stable')]
+            return [(self.names[i], self.links[i]) for i in best]
+        except Exception as e:
+            logger.error(f"Error recommending courses: {str(e)}")
+            return []
+
+# Global course catalog instance
+course_catalog = CourseCatalog()
@@ -1,15 +1,42 @@
+import ast
 import pymysql
 from config import Config
+from candidate_search import candidate_index
+from duplicate_detector import duplicate_detector
+from facet_index import facet_index
+from resume_analyzer import resume_analyzer, SECTION_KEYWORDS
 import logging
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def parse_list_field(value):
+    """Decode a list column stored as str(list), e.g. Actual_skills"""
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    if isinstance(value, bytes):
+        value = value.decode('utf-8', errors='ignore')
+    try:
+        parsed = ast.literal_eval(value) if value else []
+        return list(parsed) if isinstance(parsed, (list, tuple)) else []
+    except (ValueError, SyntaxError):
+        return []
+
+
+SKILL_KINDS = {'actual': 0, 'recommended': 1}
+
+
+def normalize_skill(skill):
+    """Dictionary key of a skill: lowercase with single spaces, e.g. ' React  JS' -> 'react js'"""
+    return ' '.join(str(skill).lower().split())[:100]
+
+
 class DatabaseManager:
     def __init__(self):
         self.connection = None
         self.cursor = None
+        self.skill_ids = {}  # normalized skill name -> skills.ID, filled as skills are interned
         
     def connect(self):
         """Establish database connection with error handling"""
@@ -67,7 +94,8 @@ class DatabaseManager:
                 Recommended_skills BLOB NOT NULL,
                 Recommended_courses BLOB NOT NULL,
                 pdf_name VARCHAR(50) NOT NULL,
-                PRIMARY KEY (ID)
+                PRIMARY KEY (ID),
+                INDEX idx_sec_token (sec_token)
             )
             """
             self.cursor.execute(user_data_sql)
@@ -86,6 +114,61 @@ class DatabaseManager:
             """
             self.cursor.execute(feedback_sql)
             
+            # Create resume_duplicates table linking re-uploads to earlier rows
+            duplicates_sql = """
+            CREATE TABLE IF NOT EXISTS resume_duplicates (
+                ID INT NOT NULL,
+                duplicate_of INT NOT NULL,
+                similarity FLOAT NOT NULL,
+                PRIMARY KEY (ID, duplicate_of),
+                INDEX idx_duplicate_of (duplicate_of)
+            )
+            """
+            self.cursor.execute(duplicates_sql)
+            
+            # Create resume_features table: one 0/1 column per scored section, so
+            # scores can be recomputed for new weights without re-parsing resumes
+            section_columns = ''.join(f"{section} TINYINT NOT NULL DEFAULT 0,\n                "
+                                      for section in SECTION_KEYWORDS)
+            features_sql = f"""
+            CREATE TABLE IF NOT EXISTS resume_features (
+                ID INT NOT NULL,
+                {section_columns}no_of_pages INT NOT NULL DEFAULT 1,
+                PRIMARY KEY (ID)
+            )
+            """
+            self.cursor.execute(features_sql)
+            
+            # Skill dictionary (each distinct skill once, with an integer ID) and the
+            # candidate x skill bridge, so skill counts are indexed integer joins
+            skills_sql = """
+            CREATE TABLE IF NOT EXISTS skills (
+                ID INT NOT NULL AUTO_INCREMENT,
+                name VARCHAR(100) NOT NULL,
+                label VARCHAR(100) NOT NULL,
+                PRIMARY KEY (ID),
+                UNIQUE KEY uq_skill_name (name)
+            )
+            """
+            self.cursor.execute(skills_sql)
+            candidate_skills_sql = """
+            CREATE TABLE IF NOT EXISTS candidate_skills (
+                ID INT NOT NULL,
+                kind TINYINT NOT NULL,
+                skill_id INT NOT NULL,
+                PRIMARY KEY (ID, kind, skill_id),
+                INDEX idx_skill (skill_id, kind, ID)
+            )
+            """
+            self.cursor.execute(candidate_skills_sql)
+            
+            # Real datetime for Timestamp (stored as text), indexed so analytics
+            # can filter and group by date windows inside the database
+            self.add_column_if_missing(
+                'user_data', 'submitted_at',
+                "DATETIME GENERATED ALWAYS AS (STR_TO_DATE(Timestamp, '%Y-%m-%d_%H:%i:%s')) STORED, "
+                "ADD INDEX idx_submitted_at (submitted_at)")
+            
             self.connection.commit()
             logger.info("Database tables created successfully")
             return True
@@ -94,6 +177,16 @@ class DatabaseManager:
             logger.error(f"Error creating tables: {str(e)}")
             return False
     
+    def add_column_if_missing(self, table, column, definition):
+        """ALTER TABLE ... ADD COLUMN for tables created before the column existed"""
+        self.cursor.execute("""
+        SELECT COUNT(*) AS total FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s
+        """, (table, column))
+        if self.cursor.fetchone()['total'] == 0:
+            self.cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+            logger.info(f"Added column {table}.{column}")
+    
     def insert_user_data(self, data_dict):
         """Insert user data with error handling"""
         try:
@@ -119,15 +212,156 @@ class DatabaseManager:
             
             self.cursor.execute(sql, values)
             self.connection.commit()
+            row_id = self.cursor.lastrowid
             logger.info("User data inserted successfully")
+            resume_text = data_dict.get('resume_text', '')
+            candidate_index.add(row_id, resume_text, parse_list_field(data_dict['skills']))
+            facet_index.add(row_id, parse_list_field(data_dict['skills']), data_dict['reco_field'],
+                            data_dict['cand_level'], data_dict['resume_score'])
+            self.link_duplicates(row_id, resume_text)
+            if resume_text:
+                self.store_features(row_id, resume_analyzer.section_features(resume_text), data_dict['no_of_pages'])
+            self.store_skills(row_id, parse_list_field(data_dict['skills']),
+                              parse_list_field(data_dict['recommended_skills']))
             return True
             
         except Exception as e:
             logger.error(f"Error inserting user data: {str(e)}")
             return False
     
+    def link_duplicates(self, row_id, resume_text):
+        """Record near-duplicate earlier uploads of a newly inserted resume"""
+        try:
+            signature = duplicate_detector.signature(resume_text)
+            matches = duplicate_detector.query(signature)
+            duplicate_detector.add(row_id, signature)
+            if matches:
+                sql = """
+                INSERT IGNORE INTO resume_duplicates (ID, duplicate_of, similarity)
+                VALUES (%s, %s, %s)
+                """
+                self.cursor.executemany(sql, [(row_id, other, similarity) for other, similarity in matches])
+                self.connection.commit()
+                logger.info(f"Resume {row_id} is a near-duplicate of {[other for other, _ in matches]}")
+            return matches
+            
+        except Exception as e:
+            logger.error(f"Error linking duplicates: {str(e)}")
+            return []
+    
+    def store_features(self, row_id, features, no_of_pages):
+        """Store the section presence vector of a resume for later re-scoring"""
+        try:
+            sections = list(SECTION_KEYWORDS)
+            columns = ', '.join(sections)
+            placeholders = ', '.join(['%s'] * (len(sections) + 2))
+            sql = f"REPLACE INTO resume_features (ID, {columns}, no_of_pages) VALUES ({placeholders})"
+            self.cursor.execute(sql, [row_id] + [features.get(section, 0) for section in sections]
+                                + [int(no_of_pages or 1)])
+            self.connection.commit()
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error storing resume features: {str(e)}")
+            return False
+    
+    def intern_skills(self, skills):
+        """Map skill names to skills.ID, adding names not seen before. Returns: {normalized name: ID}"""
+        labels = {}
+        for skill in skills:
+            name = normalize_skill(skill)
+            if name and name not in self.skill_ids:
+                labels.setdefault(name, str(skill).strip()[:100])
+        if labels:
+            self.cursor.executemany("INSERT IGNORE INTO skills (name, label) VALUES (%s, %s)", list(labels.items()))
+            placeholders = ', '.join(['%s'] * len(labels))
+            self.cursor.execute(f"SELECT ID, name FROM skills WHERE name IN ({placeholders})", list(labels))
+            for row in self.cursor.fetchall():
+                self.skill_ids[row['name']] = row['ID']
+        return {normalize_skill(skill): self.skill_ids[normalize_skill(skill)]
+                for skill in skills if normalize_skill(skill) in self.skill_ids}
+    
+    def store_skills(self, row_id, skills, recommended_skills=()):
+        """Record a resume's extracted and recommended skills in candidate_skills"""
+        try:
+            values = []
+            for kind, names in ((SKILL_KINDS['actual'], skills), (SKILL_KINDS['recommended'], recommended_skills)):
+                values.extend((row_id, kind, skill_id) for skill_id in set(self.intern_skills(names).values()))
+            if values:
+                self.cursor.executemany(
+                    "INSERT IGNORE INTO candidate_skills (ID, kind, skill_id) VALUES (%s, %s, %s)", values)
+            self.connection.commit()
+            return True
+            
+        except Exception as e:
+            logger.error(f"Error storing skills: {str(e)}")
+            return False
+    
+    def backfill_skills(self, batch_size=1000):
+        """
+        Fill candidate_skills for rows stored before the skill tables existed
+        Returns: number of rows backfilled
+        """
+        try:
+            added = 0
+            last_id = 0
+            while True:
+                self.cursor.execute("""
+                SELECT u.ID, convert(u.Actual_skills using utf8) as Actual_skills,
+                       convert(u.Recommended_skills using utf8) as Recommended_skills
+                FROM user_data u
+                WHERE u.ID > %s AND NOT EXISTS (SELECT 1 FROM candidate_skills c WHERE c.ID = u.ID)
+                ORDER BY u.ID LIMIT %s
+                """, (last_id, batch_size))
+                rows = self.cursor.fetchall()
+                if not rows:
+                    break
+                for row in rows:
+                    if self.store_skills(row['ID'], parse_list_field(row['Actual_skills']),
+                                         parse_list_field(row['Recommended_skills'])):
+                        added += 1
+                last_id = rows[-1]['ID']
+            logger.info(f"Skill tables backfilled with {added} rows")
+            return added
+            
+        except Exception as e:
+            logger.error(f"Error backfilling skills: {str(e)}")
+            return 0
+    
+    def rescore_all(self, weights=None):
+        """
+        Recompute resume_score of every row with stored features as one
+        weights x features product in a single UPDATE
+        Returns: number of rows whose score changed
+        """
+        try:
+            weights = weights or resume_analyzer.scoring_weights
+            expression = ' + '.join(f"%s * f.{section}" for section in SECTION_KEYWORDS)
+            sql = f"""
+            UPDATE user_data u JOIN resume_features f ON f.ID = u.ID
+            SET u.resume_score = ({expression})
+            """
+            updated = self.cursor.execute(sql, [int(weights.get(section, 0)) for section in SECTION_KEYWORDS])
+            self.connection.commit()
+            logger.info(f"Rescored {updated} resumes with weights {weights}")
+            return updated
+            
+        except Exception as e:
+            logger.error(f"Error rescoring resumes: {str(e)}")
+            return 0
+    
+    def get_duplicate_count(self):
+        """Count user_data rows that re-upload an earlier resume"""
+        try:
+            self.cursor.execute("SELECT COUNT(DISTINCT ID) AS total FROM resume_duplicates")
+            return self.cursor.fetchone()['total']
+            
+        except Exception as e:
+            logger.error(f"Error counting duplicates: {str(e)}")
+            return 0
+    
     def insert_feedback(self, feedback_dict):
-        """Insert feedback data with error handling"""
+        """Insert feedback data with error handling. Returns: the new row's ID, or False"""
         try:
             sql = """
             INSERT INTO user_feedback (feed_name, feed_email, feed_score, comments, Timestamp)
@@ -143,7 +377,7 @@ class DatabaseManager:
             self.cursor.execute(sql, values)
             self.connection.commit()
             logger.info("Feedback data inserted successfully")
-            return True
+            return self.cursor.lastrowid
             
         except Exception as e:
             logger.error(f"Error inserting feedback: {str(e)}")
@@ -181,6 +415,51 @@ class DatabaseManager:
             logger.error(f"Error fetching feedback data: {str(e)}")
             return []
     
+    def get_feedback_after(self, last_id, limit=1000):
+        """Feedback rows with ID > last_id, oldest first (keyset scan for incremental loads)"""
+        try:
+            sql = """
+            SELECT ID, feed_name, feed_email, feed_score, comments, Timestamp
+            FROM user_feedback WHERE ID > %s ORDER BY ID LIMIT %s
+            """
+            self.cursor.execute(sql, (last_id, limit))
+            return self.cursor.fetchall()
+            
+        except Exception as e:
+            logger.error(f"Error fetching new feedback: {str(e)}")
+            return []
+    
+    def get_feedback_page(self, before_id=None, limit=20):
+        """Feedback rows older than before_id, newest first (keyset pagination, no OFFSET)"""
+        try:
+            sql = """
+            SELECT ID, feed_name, feed_email, feed_score, comments, Timestamp
+            FROM user_feedback WHERE ID < %s ORDER BY ID DESC LIMIT %s
+            """
+            self.cursor.execute(sql, (before_id if before_id is not None else 2 ** 31 - 1, limit))
+            return self.cursor.fetchall()
+            
+        except Exception as e:
+            logger.error(f"Error fetching feedback page: {str(e)}")
+            return []
+    
+    def get_feedback_by_ids(self, ids):
+        """Feedback rows for the given IDs, newest first"""
+        try:
+            if not ids:
+                return []
+            placeholders = ', '.join(['%s'] * len(ids))
+            sql = f"""
+            SELECT ID, feed_name, feed_email, feed_score, comments, Timestamp
+            FROM user_feedback WHERE ID IN ({placeholders}) ORDER BY ID DESC
+            """
+            self.cursor.execute(sql, list(ids))
+            return self.cursor.fetchall()
+            
+        except Exception as e:
+            logger.error(f"Error fetching feedback: {str(e)}")
+            return []
+    
     def get_analytics_data(self):
         """Fetch data for analytics charts"""
         try:
@@ -198,5 +477,57 @@ class DatabaseManager:
             logger.error(f"Error fetching analytics data: {str(e)}")
             return []
 
+    def rebuild_candidate_index(self):
+        """Index stored rows missing from the candidate index (skills and field only, no text is stored)"""
+        try:
+            sql = """
+            SELECT ID, convert(Predicted_Field using utf8) as Predicted_Field,
+                   convert(Actual_skills using utf8) as Actual_skills
+            FROM user_data
+            """
+            self.cursor.execute(sql)
+            added = 0
+            for row in self.cursor.fetchall():
+                if candidate_index.add(row['ID'], row['Predicted_Field'] or '',
+                                       parse_list_field(row['Actual_skills'])):
+                    added += 1
+            candidate_index.save()
+            logger.info(f"Candidate index backfilled with {added} rows")
+            return added
+            
+        except Exception as e:
+            logger.error(f"Error rebuilding candidate index: {str(e)}")
+            return 0
+    
+    def user_data_exists(self, sec_token):
+        """Whether a user_data row was already stored under this sec_token"""
+        try:
+            self.cursor.execute("SELECT ID FROM user_data WHERE sec_token = %s LIMIT 1", (sec_token,))
+            return self.cursor.fetchone() is not None
+            
+        except Exception as e:
+            logger.error(f"Error checking user data: {str(e)}")
+            return False
+    
+    def get_candidates_by_ids(self, ids):
+        """Fetch summary rows for the given user_data IDs"""
+        try:
+            if not ids:
+                return []
+            placeholders = ', '.join(['%s'] * len(ids))
+            sql = f"""
+            SELECT ID, Name, Email_ID, resume_score,
+                   convert(Predicted_Field using utf8) as Predicted_Field,
+                   convert(User_level using utf8) as User_level,
+                   convert(Actual_skills using utf8) as Actual_skills, Timestamp
+            FROM user_data WHERE ID IN ({placeholders})
+            """
+            self.cursor.execute(sql, list(ids))
+            return self.cursor.fetchall()
+            
+        except Exception as e:
+            logger.error(f"Error fetching candidates: {str(e)}")
+            return []
+
 # Global database manager instance
 db_manager = DatabaseManager() 
\ No newline at end of file
@@ -0,0 +1,83 @@
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Callable, List, Optional, Tuple
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# shared by every session; a stage that overruns keeps its thread until it
+# returns, so the pool is sized for a few stragglers at once
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='stage')
+
+
+class DeadlineExceeded(Exception):
+    """A required stage did not finish within its deadline"""
+
+    def __init__(self, stage: str, seconds: float):
+        super().__init__(f"{stage} took longer than {seconds:.0f}s")
+        self.stage = stage
+        self.seconds = seconds
+
+
+class Budget:
+    """
+    Latency budget for one pass through the upload flow.
+
+    Each stage runs on a worker thread and is waited for at most its own
+    timeout (STAGE_TIMEOUTS) and never past the overall UPLOAD_BUDGET.
+    An optional stage that overruns or fails returns its default and is
+    noted in `skipped`; a required one raises DeadlineExceeded. Stage
+    functions must not call Streamlit, which only works on the script
+    thread.
+    """
+
+    def __init__(self, total: Optional[float] = None):
+        self.total = Config.UPLOAD_BUDGET if total is None else total
+        self.started = time.monotonic()
+        self.skipped: List[Tuple[str, str]] = []
+
+    def remaining(self) -> float:
+        return self.total - (time.monotonic() - self.started)
+
+    def skip(self, stage: str, reason: str):
+        logger.warning(f"Skipped {stage}: {reason}")
+        self.skipped.append((stage, reason))
+
+    def allows(self, stage: str) -> bool:
+        """Whether time is left for a stage that needs no thread; records the skip when not"""
+        if self.remaining() > 0:
+            return True
+        self.skip(stage, 'time budget used up')
+        return False
+
+    def run(self, stage: str, func: Callable, *args, default=None, required: bool = False,
+            background: bool = False, **kwargs):
+        """
+        Run func(*args, **kwargs) within the stage's deadline
+        Returns: func's result, or `default` when an optional stage is skipped
+        """
+        limit = min(Config.STAGE_TIMEOUTS.get(stage, self.total), self.remaining())
+        if limit <= 0:
+            if required:
+                raise DeadlineExceeded(stage, self.total)
+            self.skip(stage, 'time budget used up')
+            return default
+        future = _executor.submit(func, *args, **kwargs)
+        try:
+            return future.result(timeout=limit)
+        except FutureTimeout:
+            if required:
+                raise DeadlineExceeded(stage, limit)
+            # the thread can't be stopped; a background stage (e.g. a write) still finishes on its own
+            self.skip(stage, 'still finishing in the background' if background else f"took longer than {limit:.0f}s")
+            return default
+        except Exception as e:
+            if required:
+                raise
+            self.skip(stage, f"failed: {str(e)}")
+            return default
+
+    def summary(self) -> str:
+        """One line for the user naming every stage that was skipped"""
+        return '; '.join(f"{stage} ({reason})" for stage, reason in self.skipped)
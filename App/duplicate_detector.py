@@ -0,0 +1,216 @@
+import os
+import zlib
+import argparse
+import threading
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from config import Config
+from candidate_search import tokenize
+from index_log import IndexLog
+
+logger = logging.getLogger(__name__)
+
+MERSENNE_PRIME = (1 << 61) - 1
+
+
+class DuplicateDetector:
+    """
+    MinHash signatures of resume text stored in an LSH index.
+
+    Signatures are split into bands; two resumes become candidates when any
+    band hashes to the same bucket, so a lookup only compares against the
+    few rows sharing a bucket instead of the whole table. Adds go to a log
+    shared by all processes, like the candidate index, and compact() folds
+    it into a snapshot once it passes INDEX_LOG_MAX_BYTES.
+    """
+
+    def __init__(self, index_dir: Optional[str] = None, num_perm: int = 128,
+                 bands: int = 16, shingle_size: int = 5, threshold: Optional[float] = None):
+        self.index_dir = index_dir or Config.INDEX_FOLDER
+        self.snapshot_path = os.path.join(self.index_dir, 'minhash.npz')
+        self.log = IndexLog(os.path.join(self.index_dir, 'minhash.log'))
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.threshold = Config.DUPLICATE_THRESHOLD if threshold is None else threshold
+        # fixed seed so signatures stay comparable across restarts
+        rng = np.random.RandomState(1)
+        self.a = rng.randint(1, 1 << 31, size=num_perm, dtype=np.uint64)
+        self.b = rng.randint(0, 1 << 31, size=num_perm, dtype=np.uint64)
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self.signatures: Dict[int, np.ndarray] = {}
+        self.buckets = [defaultdict(list) for _ in range(self.bands)]
+        self._loaded = False
+
+    def signature(self, resume_text: str) -> Optional[np.ndarray]:
+        """MinHash signature over word shingles, None for empty text"""
+        tokens = tokenize(resume_text or '')
+        if not tokens:
+            return None
+        size = min(self.shingle_size, len(tokens))
+        shingles = {' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+        hashes = np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingles),
+                             dtype=np.uint64, count=len(shingles))
+        permuted = (np.outer(self.a, hashes) + self.b[:, None]) % np.uint64(MERSENNE_PRIME)
+        return permuted.min(axis=1)
+
+    def _band_keys(self, sig: np.ndarray):
+        for band in range(self.bands):
+            yield band, sig[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def _catch_up(self):
+        """
+        Load stored signatures once, then apply log lines other processes appended (lock held).
+        A failed load leaves the index empty and unloaded and re-raises, so it is retried
+        and never saved over the snapshot.
+        """
+        try:
+            if not self._loaded:
+                self._reset()
+                self.log.offset, self.log.inode = 0, None
+                if os.path.exists(self.snapshot_path):
+                    with np.load(self.snapshot_path, allow_pickle=False) as snapshot:
+                        for row_id, sig in zip(snapshot['row_ids'].tolist(), snapshot['signatures']):
+                            self._insert(row_id, sig)
+                self._loaded = True
+            replaced, lines = self.log.read_new()
+            if replaced:
+                # compacted by another process: its snapshot holds everything
+                self._loaded = False
+                return self._catch_up()
+            for line in lines:
+                if line.startswith('-'):
+                    # "-<row_id>": the row was deleted from user_data
+                    self._discard(int(line[1:]))
+                    continue
+                row_id, hex_sig = line.split()
+                self._insert(int(row_id), np.frombuffer(bytes.fromhex(hex_sig), dtype=np.uint64))
+        except Exception:
+            self._reset()
+            raise
+
+    def load(self):
+        """Load stored signatures, or pick up ones other processes added since the last call"""
+        with self._lock:
+            try:
+                with self.log.locked():
+                    self._catch_up()
+            except Exception as e:
+                logger.error(f"Error loading duplicate index: {str(e)}")
+
+    def save(self):
+        """Write all signatures to a snapshot and start a fresh add log"""
+        with self._lock:
+            try:
+                with self.log.locked(exclusive=True):
+                    self._catch_up()
+                    if not self._loaded:
+                        raise RuntimeError('index not loaded, keeping the existing snapshot')
+                    os.makedirs(self.index_dir, exist_ok=True)
+                    tmp_path = self.snapshot_path + '.tmp'
+                    with open(tmp_path, 'wb') as f:
+                        np.savez(f, row_ids=np.array(list(self.signatures), dtype=np.int64),
+                                 signatures=np.array(list(self.signatures.values()), dtype=np.uint64)
+                                 .reshape(len(self.signatures), self.num_perm))
+                    os.replace(tmp_path, self.snapshot_path)
+                    self.log.reset()
+                logger.info(f"Duplicate index compacted with {len(self.signatures)} signatures")
+                return True
+            except Exception as e:
+                logger.error(f"Error saving duplicate index: {str(e)}")
+                return False
+
+    def compact(self, max_log_bytes: Optional[int] = None) -> bool:
+        """Fold the add log into the snapshot once it grows past max_log_bytes"""
+        limit = Config.INDEX_LOG_MAX_BYTES if max_log_bytes is None else max_log_bytes
+        if self.log.size() <= limit:
+            return False
+        return self.save()
+
+    def _insert(self, row_id: int, sig: np.ndarray):
+        if row_id in self.signatures:
+            return
+        self.signatures[row_id] = sig
+        for band, key in self._band_keys(sig):
+            self.buckets[band][key].append(row_id)
+
+    def _discard(self, row_id: int):
+        sig = self.signatures.pop(row_id, None)
+        if sig is None:
+            return
+        for band, key in self._band_keys(sig):
+            bucket = self.buckets[band].get(key)
+            if bucket is not None:
+                bucket.remove(row_id)
+                if not bucket:
+                    del self.buckets[band][key]
+
+    def remove(self, row_ids: Iterable[int]) -> int:
+        """Forget rows deleted from user_data (e.g. archived). Returns: signatures removed"""
+        with self._lock:
+            try:
+                with self.log.locked(exclusive=True):
+                    self._catch_up()
+                    present = [int(row_id) for row_id in row_ids if row_id in self.signatures]
+                    for row_id in present:
+                        self._discard(row_id)
+                    if present:
+                        self.log.append('\n'.join(f"-{row_id}" for row_id in present))
+            except Exception as e:
+                logger.error(f"Error removing signatures: {str(e)}")
+                return 0
+        self.compact()
+        return len(present)
+
+    def query(self, sig: Optional[np.ndarray]) -> List[Tuple[int, float]]:
+        """
+        Find stored resumes whose estimated Jaccard similarity reaches the threshold
+        Returns: [(user_data ID, similarity), ...] most similar first
+        """
+        if sig is None:
+            return []
+        with self._lock:
+            self.load()
+            candidates = set()
+            for band, key in self._band_keys(sig):
+                candidates.update(self.buckets[band].get(key, ()))
+            matches = []
+            for row_id in candidates:
+                similarity = float(np.mean(self.signatures[row_id] == sig))
+                if similarity >= self.threshold:
+                    matches.append((row_id, similarity))
+            return sorted(matches, key=lambda m: -m[1])
+
+    def add(self, row_id: int, sig: Optional[np.ndarray]) -> bool:
+        """Store a signature under its user_data ID"""
+        if sig is None:
+            return False
+        with self._lock:
+            try:
+                with self.log.locked(exclusive=True):
+                    self._catch_up()
+                    if row_id in self.signatures:
+                        return False
+                    self._insert(row_id, sig)
+                    self.log.append(f"{row_id} {sig.astype(np.uint64).tobytes().hex()}")
+            except Exception as e:
+                logger.error(f"Error storing signature for {row_id}: {str(e)}")
+                return False
+        self.compact()
+        return True
+
+# Global duplicate detector instance
+duplicate_detector = DuplicateDetector()
+
+
+if __name__ == '__main__':
+    argparse.ArgumentParser(description='Compact the duplicate detection index').parse_args()
+    if duplicate_detector.save():
+        print(f"Compacted duplicate index with {len(duplicate_detector.signatures)} signatures")
+
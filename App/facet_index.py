@@ -0,0 +1,222 @@
+import threading
+import logging
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1 << 16
+# a chunk's sorted array of row offsets outgrows a 65536-bit bitset (8 KB) past this many rows
+SPARSE_LIMIT = 4096
+BATCH_SIZE = 5000
+
+
+def to_bits(offsets: array) -> int:
+    """Bitset (as an int) of a sorted array of row offsets within one chunk"""
+    bits = np.zeros(CHUNK_SIZE, dtype=np.uint8)
+    bits[np.frombuffer(offsets, dtype=np.uint16)] = 1
+    return int.from_bytes(np.packbits(bits, bitorder='little').tobytes(), 'little')
+
+
+def from_bits(bits: int) -> np.ndarray:
+    """Row offsets set in a chunk bitset, ascending"""
+    packed = np.frombuffer(bits.to_bytes(CHUNK_SIZE // 8, 'little'), dtype=np.uint8)
+    return np.flatnonzero(np.unpackbits(packed, bitorder='little'))
+
+
+class Bitmap:
+    """
+    Compressed set of row IDs, split into chunks of 65536 IDs (a simplified
+    roaring bitmap). A chunk is a sorted array of 16-bit offsets while it
+    is sparse and an int bitset once it is dense, so rare values cost a few
+    bytes per row and common ones one bit per row.
+    """
+
+    __slots__ = ('chunks',)
+
+    def __init__(self):
+        self.chunks: Dict[int, object] = {}
+
+    def add(self, row_id: int):
+        key, offset = divmod(row_id, CHUNK_SIZE)
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            self.chunks[key] = array('H', [offset])
+        elif isinstance(chunk, int):
+            self.chunks[key] = chunk | (1 << offset)
+        else:
+            i = bisect_left(chunk, offset)
+            if i == len(chunk) or chunk[i] != offset:
+                chunk.insert(i, offset)
+                if len(chunk) > SPARSE_LIMIT:
+                    self.chunks[key] = to_bits(chunk)
+
+    def bits(self, key: int) -> int:
+        """One chunk as a bitset, 0 when empty"""
+        chunk = self.chunks.get(key)
+        if chunk is None:
+            return 0
+        return chunk if isinstance(chunk, int) else to_bits(chunk)
+
+    def __len__(self) -> int:
+        return sum(bin(chunk).count('1') if isinstance(chunk, int) else len(chunk)
+                   for chunk in self.chunks.values())
+
+    def nbytes(self) -> int:
+        return sum(CHUNK_SIZE // 8 if isinstance(chunk, int) else chunk.itemsize * len(chunk)
+                   for chunk in self.chunks.values())
+
+
+class FacetIndex:
+    """
+    In-memory bitmap index of stored candidates by skill, predicted field,
+    experience level and resume score (one bucket per point, so score
+    ranges are exact).
+
+    Boolean filters such as "Flutter AND Kotlin AND NOT Swift, level
+    Intermediate, score >= 70" are answered with bitwise AND / OR / AND NOT
+    over the matching bitmaps, chunk by chunk, without touching MySQL. The
+    index is built from user_data on first use; rows inserted by this
+    process are added at once and rows inserted by other processes are
+    picked up by ID watermark before each query.
+    """
+
+    def __init__(self):
+        self.bitmaps: Dict[Tuple[str, object], Bitmap] = {}
+        self.labels: Dict[str, str] = {}
+        self.universe = Bitmap()
+        self.last_id = 0
+        self.loaded = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _bucket(score) -> Optional[int]:
+        try:
+            return max(0, min(100, int(float(score))))
+        except (TypeError, ValueError):
+            return None
+
+    def _index(self, row_id: int, skills: Iterable[str], field: str, level: str, score):
+        from database import normalize_skill
+        keys = [('field', field or ''), ('level', level or '')]
+        bucket = self._bucket(score)
+        if bucket is not None:
+            keys.append(('score', bucket))
+        for skill in skills:
+            name = normalize_skill(skill)
+            if name:
+                self.labels.setdefault(name, str(skill).strip())
+                keys.append(('skill', name))
+        for key in keys:
+            bitmap = self.bitmaps.get(key)
+            if bitmap is None:
+                bitmap = self.bitmaps[key] = Bitmap()
+            bitmap.add(row_id)
+        self.universe.add(row_id)
+
+    def add(self, row_id: int, skills: Iterable[str], field: str, level: str, score):
+        """Index a row this process just inserted (rows from other processes come in on refresh)"""
+        with self._lock:
+            if self.loaded:
+                self._index(row_id, skills, field, level, score)
+
+    def refresh(self) -> int:
+        """Index user_data rows stored since the last refresh (everything on first use). Returns: rows added"""
+        from database import db_manager, parse_list_field
+        added = 0
+        with self._lock:
+            try:
+                if db_manager.connection is None and not db_manager.connect():
+                    return 0
+                while True:
+                    db_manager.cursor.execute("""
+                    SELECT ID, convert(Actual_skills using utf8) AS skills,
+                           convert(Predicted_Field using utf8) AS field,
+                           convert(User_level using utf8) AS level, resume_score
+                    FROM user_data WHERE ID > %s ORDER BY ID LIMIT %s
+                    """, (self.last_id, BATCH_SIZE))
+                    rows = db_manager.cursor.fetchall()
+                    for row in rows:
+                        self._index(row['ID'], parse_list_field(row['skills']), row['field'], row['level'],
+                                    row['resume_score'])
+                        self.last_id = row['ID']
+                    added += len(rows)
+                    if len(rows) < BATCH_SIZE:
+                        break
+                self.loaded = True
+
+            except Exception as e:
+                logger.error(f"Error refreshing facet index: {str(e)}")
+        if added:
+            logger.info(f"Facet index added {added} rows")
+        return added
+
+    def reset(self):
+        """Drop the index so the next query rebuilds it (after rows are deleted or archived)"""
+        with self._lock:
+            self.bitmaps.clear()
+            self.labels.clear()
+            self.universe = Bitmap()
+            self.last_id = 0
+            self.loaded = False
+
+    def values(self, facet: str) -> List[Tuple[str, int]]:
+        """Indexed values of one facet with their row counts, most common first"""
+        self.refresh()
+        with self._lock:
+            counts = [(self.labels.get(value, value) if facet == 'skill' else value, len(bitmap))
+                      for (kind, value), bitmap in self.bitmaps.items() if kind == facet]
+        return sorted(counts, key=lambda item: -item[1])
+
+    def _union(self, keys: List[Tuple[str, object]], chunk: int) -> int:
+        bits = 0
+        for key in keys:
+            bitmap = self.bitmaps.get(key)
+            if bitmap is not None:
+                bits |= bitmap.bits(chunk)
+        return bits
+
+    def query(self, all_skills: Iterable[str] = (), any_skills: Iterable[str] = (),
+              no_skills: Iterable[str] = (), fields: Iterable[str] = (), levels: Iterable[str] = (),
+              min_score: Optional[int] = None, max_score: Optional[int] = None) -> List[int]:
+        """
+        Row IDs matching every condition; empty lists mean no condition
+        Returns: matching user_data IDs, newest first
+        """
+        from database import normalize_skill
+        self.refresh()
+        required = [[('skill', normalize_skill(skill))] for skill in all_skills]
+        if any_skills:
+            required.append([('skill', normalize_skill(skill)) for skill in any_skills])
+        if fields:
+            required.append([('field', field) for field in fields])
+        if levels:
+            required.append([('level', level) for level in levels])
+        if min_score is not None or max_score is not None:
+            low = 0 if min_score is None else max(0, int(min_score))
+            high = 100 if max_score is None else min(100, int(max_score))
+            required.append([('score', bucket) for bucket in range(low, high + 1)])
+        excluded = [('skill', normalize_skill(skill)) for skill in no_skills]
+        matches = []
+        with self._lock:
+            for chunk in sorted(self.universe.chunks, reverse=True):
+                bits = self.universe.bits(chunk)
+                for keys in required:
+                    if not bits:
+                        break
+                    bits &= self._union(keys, chunk)
+                if bits and excluded:
+                    bits &= ~self._union(excluded, chunk)
+                if bits:
+                    matches.append(from_bits(bits)[::-1] + chunk * CHUNK_SIZE)
+        return np.concatenate(matches).tolist() if matches else []
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'rows': len(self.universe), 'bitmaps': len(self.bitmaps),
+                    'bytes': sum(bitmap.nbytes() for bitmap in self.bitmaps.values())}
+
+# Global facet index instance
+facet_index = FacetIndex()
@@ -0,0 +1,126 @@
+import re
+import threading
+import logging
+from array import array
+from bisect import bisect_left
+from collections import Counter, deque
+from typing import Dict, List, Optional
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+WORD_REGEX = re.compile(r"[a-z0-9]+")
+BATCH_SIZE = 1000
+
+
+def comment_terms(text: str) -> set:
+    """Distinct lowercase words of a comment"""
+    return set(WORD_REGEX.findall((text or '').lower()))
+
+
+class FeedbackStore:
+    """
+    Feedback served without reading the whole user_feedback table.
+
+    New rows are pulled by ID watermark (ID > last seen), so each view costs
+    one indexed range query that is usually empty. The newest comments live
+    in a ring buffer, older ones are paged by keyset (ID < cursor) and
+    keyword search walks an inverted index of comment words -> feedback IDs.
+    Rating counts are kept alongside so the chart needs no query either.
+    """
+
+    def __init__(self, recent_size: Optional[int] = None):
+        self.recent_size = recent_size or Config.FEEDBACK_RECENT_SIZE
+        self.recent = deque(maxlen=self.recent_size)
+        self.postings: Dict[str, array] = {}
+        self.ratings = Counter()
+        self.last_id = 0
+        self._lock = threading.Lock()
+
+    def _index(self, row: Dict):
+        # rows arrive in ID order, so every postings array stays sorted
+        for term in comment_terms(row['comments']):
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = array('i')
+            postings.append(row['ID'])
+        self.ratings[str(row['feed_score'])] += 1
+        self.recent.appendleft(row)
+        self.last_id = max(self.last_id, row['ID'])
+
+    def refresh(self) -> int:
+        """Index feedback added since the last call. Returns: number of new rows"""
+        from database import db_manager
+        added = 0
+        with self._lock:
+            while True:
+                rows = db_manager.get_feedback_after(self.last_id, BATCH_SIZE)
+                for row in rows:
+                    self._index(row)
+                added += len(rows)
+                if len(rows) < BATCH_SIZE:
+                    break
+        if added:
+            logger.info(f"Feedback store indexed {added} new comments")
+        return added
+
+    def add(self, feedback_dict: Dict) -> bool:
+        """Insert feedback and index it straight away"""
+        from database import db_manager
+        row_id = db_manager.insert_feedback(feedback_dict)
+        if not row_id:
+            return False
+        # pick up anything other sessions inserted before this row, then this row
+        self.refresh()
+        return True
+
+    def latest(self, n: int = 20) -> List[Dict]:
+        """Newest comments from the ring buffer"""
+        self.refresh()
+        return list(self.recent)[:n]
+
+    def page(self, before_id: Optional[int] = None, limit: int = 20) -> List[Dict]:
+        """Comments older than before_id, newest first; pass the last row's ID to get the next page"""
+        from database import db_manager
+        self.refresh()
+        if before_id is not None:
+            buffered = [row for row in self.recent if row['ID'] < before_id]
+            if len(buffered) >= limit:
+                return buffered[:limit]
+        elif len(self.recent) >= limit:
+            return list(self.recent)[:limit]
+        return db_manager.get_feedback_page(before_id, limit)
+
+    def search(self, query: str, limit: int = 20, before_id: Optional[int] = None) -> List[Dict]:
+        """Comments containing every word of the query, newest first"""
+        from database import db_manager
+        self.refresh()
+        terms = comment_terms(query)
+        if not terms:
+            return []
+        with self._lock:
+            postings = sorted((self.postings.get(term, array('i')) for term in terms), key=len)
+            matches = []
+            rest = postings[1:]
+            # walk the rarest term's IDs newest first, probing the others by binary search
+            for row_id in reversed(postings[0]):
+                if before_id is not None and row_id >= before_id:
+                    continue
+                if all(self._contains(other, row_id) for other in rest):
+                    matches.append(row_id)
+                    if len(matches) == limit:
+                        break
+        return db_manager.get_feedback_by_ids(matches)
+
+    @staticmethod
+    def _contains(postings: array, row_id: int) -> bool:
+        i = bisect_left(postings, row_id)
+        return i < len(postings) and postings[i] == row_id
+
+    def rating_counts(self) -> List[tuple]:
+        """Counts of each rating. Returns: [(rating, count), ...]"""
+        self.refresh()
+        return sorted(self.ratings.items())
+
+# Global feedback store instance
+feedback_store = FeedbackStore()
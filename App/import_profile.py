@@ -0,0 +1,93 @@
+"""
+Import-time profile of the Streamlit app, per page.
+
+Runs `python -X importtime` in a fresh interpreter for the modules App.py
+imports at startup, then for each page's lazy imports on top, and reports
+the total and the slowest top-level imports:
+
+    python import_profile.py
+"""
+import os
+import re
+import sys
+import subprocess
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# module level imports of App.py, i.e. what runs before the first page renders
+STARTUP_IMPORTS = ['streamlit', 'pandas', 'pymysql', 'PIL.Image', 'text_extraction',
+                   'Courses', 'resources']
+
+PAGE_IMPORTS = {
+    'About': [],
+    'Feedback': ['plotly.express', 'database', 'feedback_store'],
+    'User': ['geocoder', 'geopy.geocoders', 'pyresparser', 'streamlit_tags', 'database', 'course_catalog', 'upload_store', 'deadlines', 'profiling', 'resume_analyzer'],
+    'Admin': ['plotly.express', 'database', 'candidate_search', 'analytics', 'facet_index', 'table_cache'],
+}
+
+LINE_REGEX = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def _top_level_imports(code: str) -> Tuple[List[Tuple[str, float]], str]:
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                          cwd=APP_DIR, capture_output=True, text=True)
+    top_level = []
+    errors = []
+    for line in proc.stderr.splitlines():
+        match = LINE_REGEX.match(line)
+        if match is None:
+            if not line.startswith('import time:'):
+                errors.append(line)
+        # nesting is shown by indentation; a single space marks a top-level import
+        elif len(match.group(3)) == 1:
+            top_level.append((match.group(4), int(match.group(2)) / 1e6))
+    return top_level, '\n'.join(errors) if proc.returncode else ''
+
+
+@lru_cache(maxsize=1)
+def baseline_modules() -> frozenset:
+    """Modules the interpreter imports before running any code (site, encodings, ...)"""
+    # measured on first use, so importing this module never spawns a process
+    return frozenset(module for module, _ in _top_level_imports('pass')[0])
+
+
+def profile_imports(modules: List[str]) -> Tuple[float, List[Tuple[str, float]], str]:
+    """
+    Import modules in a fresh interpreter
+    Returns: (total seconds, [(top-level module, cumulative seconds)] slowest first, error output)
+    """
+    if not modules:
+        return 0.0, [], ''
+    top_level, error = _top_level_imports('; '.join(f"import {module}" for module in modules))
+    top_level = [(module, seconds) for module, seconds in top_level if module not in baseline_modules()]
+    total = sum(seconds for _, seconds in top_level)
+    return total, sorted(top_level, key=lambda item: -item[1]), error
+
+
+def report(top_n: int = 8) -> Dict[str, float]:
+    """Print the startup import cost and each page's additional lazy imports"""
+    totals = {}
+    startup, slowest, error = profile_imports(STARTUP_IMPORTS)
+    startup_modules = {module for module, _ in slowest}
+    totals['startup'] = startup
+    print(f"startup (before first paint): {startup:.3f}s")
+    for module, seconds in slowest[:top_n]:
+        print(f"    {seconds:8.3f}s  {module}")
+    if error:
+        print(f"    import failed:\n{error}")
+    for page, modules in PAGE_IMPORTS.items():
+        total, slowest, error = profile_imports(STARTUP_IMPORTS + modules)
+        totals[page] = total
+        print(f"{page} page: {total:.3f}s total, {total - startup:+.3f}s imported lazily on first visit")
+        lazy = [(module, seconds) for module, seconds in slowest if module not in startup_modules]
+        for module, seconds in lazy[:top_n]:
+            print(f"    {seconds:8.3f}s  {module}")
+        if error:
+            print(f"    import failed:\n{error}")
+    return totals
+
+
+if __name__ == '__main__':
+    report()
@@ -0,0 +1,87 @@
+import os
+import logging
+from contextlib import contextmanager
+from typing import List, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process deployments only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class IndexLog:
+    """
+    Append-only log shared by every process that updates an on-disk index.
+
+    Appends and compaction take an exclusive flock on a sidecar lock file;
+    readers take a shared one. Each process remembers how far into the log
+    it has read, so new lines written by other processes are picked up
+    without reloading. Compaction swaps in a fresh log file, which readers
+    notice by its changed inode and answer with a full reload.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock_path = path + '.lock'
+        self.offset = 0
+        self.inode = None
+
+    @contextmanager
+    def locked(self, exclusive: bool = False):
+        """Hold the cross-process lock (not re-entrant: never nest it)"""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.lock_path, 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.path)
+            return stat.st_ino, stat.st_size
+        except FileNotFoundError:
+            return None, 0
+
+    def read_new(self) -> Tuple[bool, List[str]]:
+        """
+        Lines appended since the last call; call while holding the lock
+        Returns: (log was replaced since the last read, new lines)
+        """
+        inode, size = self._stat()
+        replaced = self.inode is not None and inode != self.inode
+        if replaced:
+            self.offset = 0
+        self.inode = inode
+        if inode is None or size <= self.offset:
+            return replaced, []
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            data = f.read(size - self.offset)
+        # a line is only complete once its newline is written
+        end = data.rfind(b'\n') + 1
+        self.offset += end
+        return replaced, data[:end].decode('utf-8').splitlines()
+
+    def append(self, line: str):
+        """Append one line; call right after read_new() under the exclusive lock"""
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(line + '\n')
+            # everything before this line has just been read, so skip our own write
+            self.offset = f.tell()
+        self.inode = self._stat()[0]
+
+    def size(self) -> int:
+        return self._stat()[1]
+
+    def reset(self):
+        """Swap in an empty log after a snapshot; call while holding the exclusive lock"""
+        tmp_path = self.path + '.tmp'
+        open(tmp_path, 'w').close()
+        os.replace(tmp_path, self.path)
+        self.inode, self.offset = self._stat()[0], 0
@@ -0,0 +1,229 @@
+"""
+Durable local job queue for asynchronous resume analysis.
+
+Jobs live in a SQLite file, so submissions survive crashes and no broker
+is needed. A claimed job stays invisible for JOB_VISIBILITY_TIMEOUT
+seconds; if its worker dies it becomes claimable again. Failed jobs are
+retried with backoff up to JOB_MAX_ATTEMPTS, then dead-lettered.
+
+Run workers with:
+    python job_queue.py --workers 4
+"""
+import os
+import json
+import time
+import uuid
+import sqlite3
+import argparse
+import threading
+import logging
+import multiprocessing as mp
+from typing import Callable, Dict, List, Optional
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+DEAD = 'dead'
+
+
+class JobQueue:
+    def __init__(self, path: Optional[str] = None, visibility_timeout: Optional[int] = None,
+                 max_attempts: Optional[int] = None):
+        self.path = path or Config.JOB_DB_PATH
+        self.visibility_timeout = visibility_timeout or Config.JOB_VISIBILITY_TIMEOUT
+        self.max_attempts = max_attempts or Config.JOB_MAX_ATTEMPTS
+        self._local = threading.local()
+        self._initialized = False
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread, autocommit mode with explicit transactions"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.row_factory = sqlite3.Row
+            connection.execute('PRAGMA journal_mode=WAL')
+            self._local.connection = connection
+        if not self._initialized:
+            connection.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                status TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                data BLOB,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                visible_at REAL NOT NULL,
+                result TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """)
+            connection.execute('CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs (status, visible_at)')
+            self._initialized = True
+        return connection
+
+    def submit(self, kind: str, payload: Dict, data: bytes = b'', job_id: Optional[str] = None) -> str:
+        """
+        Persist a job and return its ID immediately. Submitting again with the
+        same job_id (e.g. on a page rerun) leaves the existing job untouched.
+        """
+        job_id = job_id or uuid.uuid4().hex
+        now = time.time()
+        cursor = self._connection().execute(
+            'INSERT OR IGNORE INTO jobs (id, kind, status, payload, data, visible_at, created_at, updated_at) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            (job_id, kind, QUEUED, json.dumps(payload), data, now, now, now))
+        if cursor.rowcount == 1:
+            logger.info(f"Job {job_id} ({kind}) queued")
+        return job_id
+
+    def claim(self) -> Optional[Dict]:
+        """
+        Take the oldest visible job, hiding it for the visibility timeout.
+        Jobs whose worker vanished after their last allowed attempt are dead-lettered here.
+        """
+        connection = self._connection()
+        now = time.time()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            while True:
+                row = connection.execute(
+                    'SELECT * FROM jobs WHERE status IN (?, ?) AND visible_at <= ? '
+                    'ORDER BY created_at LIMIT 1', (QUEUED, RUNNING, now)).fetchone()
+                if row is None:
+                    connection.execute('COMMIT')
+                    return None
+                if row['attempts'] >= self.max_attempts:
+                    connection.execute(
+                        'UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE id = ?',
+                        (DEAD, row['error'] or 'Visibility timeout expired', now, row['id']))
+                    continue
+                connection.execute(
+                    'UPDATE jobs SET status = ?, attempts = attempts + 1, visible_at = ?, updated_at = ? '
+                    'WHERE id = ?', (RUNNING, now + self.visibility_timeout, now, row['id']))
+                connection.execute('COMMIT')
+                job = dict(row)
+                job['attempts'] += 1
+                job['payload'] = json.loads(job['payload'])
+                return job
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+
+    # complete() and fail() only apply while the caller still owns the claim:
+    # the job must be running under the same attempt number it was claimed
+    # with, so a worker whose visibility timeout expired (and whose job was
+    # re-claimed by another worker) cannot overwrite the newer attempt.
+
+    def complete(self, job_id: str, attempts: int, result: Dict) -> bool:
+        """Store the result. Returns: False if the claim was lost"""
+        cursor = self._connection().execute(
+            'UPDATE jobs SET status = ?, result = ?, data = NULL, error = NULL, updated_at = ? '
+            'WHERE id = ? AND status = ? AND attempts = ?',
+            (DONE, json.dumps(result, default=str), time.time(), job_id, RUNNING, attempts))
+        return cursor.rowcount == 1
+
+    def fail(self, job_id: str, attempts: int, error: str, retry: bool = True) -> bool:
+        """
+        Retry with exponential backoff, or dead-letter once attempts run out
+        (at once when retry is False, e.g. for an unreadable upload).
+        Returns: False if the claim was lost
+        """
+        now = time.time()
+        if attempts >= self.max_attempts or not retry:
+            cursor = self._connection().execute(
+                'UPDATE jobs SET status = ?, error = ?, updated_at = ? '
+                'WHERE id = ? AND status = ? AND attempts = ?',
+                (DEAD, error, now, job_id, RUNNING, attempts))
+            if cursor.rowcount == 1:
+                logger.error(f"Job {job_id} dead-lettered after {attempts} attempts: {error}")
+        else:
+            cursor = self._connection().execute(
+                'UPDATE jobs SET status = ?, error = ?, visible_at = ?, updated_at = ? '
+                'WHERE id = ? AND status = ? AND attempts = ?',
+                (QUEUED, error, now + 2 ** attempts, now, job_id, RUNNING, attempts))
+            if cursor.rowcount == 1:
+                logger.warning(f"Job {job_id} failed (attempt {attempts}), retrying: {error}")
+        return cursor.rowcount == 1
+
+    def status(self, job_id: str) -> Optional[Dict]:
+        """Status, attempts and result/error of a job, without its input data"""
+        row = self._connection().execute(
+            'SELECT id, kind, status, attempts, result, error, created_at, updated_at FROM jobs WHERE id = ?',
+            (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        return job
+
+    def dead_letters(self, limit: int = 50) -> List[Dict]:
+        rows = self._connection().execute(
+            'SELECT id, kind, attempts, error, updated_at FROM jobs WHERE status = ? '
+            'ORDER BY updated_at DESC LIMIT ?', (DEAD, limit)).fetchall()
+        return [dict(row) for row in rows]
+
+    def requeue(self, job_id: str) -> bool:
+        """Give a dead-lettered job a fresh set of attempts"""
+        cursor = self._connection().execute(
+            'UPDATE jobs SET status = ?, attempts = 0, visible_at = ?, updated_at = ? WHERE id = ? AND status = ?',
+            (QUEUED, time.time(), time.time(), job_id, DEAD))
+        return cursor.rowcount == 1
+
+
+def _handlers() -> Dict[str, Callable]:
+    import analysis_worker
+    return {'analyze': analysis_worker.run_analysis_job}
+
+
+def work(queue: Optional[JobQueue] = None, poll_interval: float = 1.0,
+         stop: Optional[threading.Event] = None):
+    """Claim and run jobs until stop is set"""
+    queue = queue or JobQueue()
+    handlers = _handlers()
+    while stop is None or not stop.is_set():
+        job = queue.claim()
+        if job is None:
+            time.sleep(poll_interval)
+            continue
+        try:
+            result = handlers[job['kind']](job['data'], job['payload'], job['id'])
+        except Exception as e:
+            # ValueError means the upload itself is at fault (e.g. a PDF the
+            # extraction sandbox rejected); running it again would not help
+            if not queue.fail(job['id'], job['attempts'], str(e), retry=not isinstance(e, ValueError)):
+                logger.warning(f"Job {job['id']} failed after its claim expired: {str(e)}")
+            continue
+        if queue.complete(job['id'], job['attempts'], result):
+            logger.info(f"Job {job['id']} done")
+        else:
+            logger.warning(f"Job {job['id']} finished after its claim expired; result discarded")
+
+
+def _worker_main():
+    import analysis_worker
+    analysis_worker.init_worker()
+    work()
+
+
+def run_workers(workers: int):
+    """Start worker processes and wait for them"""
+    processes = [mp.Process(target=_worker_main, daemon=True) for _ in range(workers)]
+    for process in processes:
+        process.start()
+    logger.info(f"Started {workers} job workers on {Config.JOB_DB_PATH}")
+    for process in processes:
+        process.join()
+
+# Global job queue instance
+job_queue = JobQueue()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Run resume analysis job workers')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    run_workers(parser.parse_args().workers)
@@ -0,0 +1,250 @@
+"""
+Concurrent-session load test for the upload -> analyze -> insert flow and
+the admin dashboard.
+
+Each simulated session is a thread, like a Streamlit session, and all of
+them share one database manager, like the app's shared connection. The
+harness ramps the number of sessions and reports throughput, p50/p99
+latency and error rate per operation at every level:
+
+    python load_test.py resumes/ --levels 1 2 4 8 16 --duration 30
+    python load_test.py resumes/ --db sqlite        # no MySQL needed
+    python load_test.py --no-parse --db sqlite      # database layer only
+
+--db mysql drives the real db_manager and analytics module against the
+configured database; --db sqlite swaps in a SQLite stand-in with the same
+insert and dashboard queries.
+"""
+import os
+import time
+import random
+import sqlite3
+import argparse
+import datetime
+import threading
+import logging
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# canned analysis used with --no-parse, shaped like analysis_worker.analyze_resume
+SAMPLE_RESULT = {
+    'name': 'Load Test', 'email': 'load@test.local', 'skills': ['Python', 'Flask', 'SQL'],
+    'no_of_pages': 1, 'resume_text': 'Objective Education Experience Skills Projects Python Flask SQL',
+    'resume_score': 60, 'cand_level': 'Experienced', 'reco_field': 'Data Science',
+    'recommended_skills': ['Data Visualization'],
+}
+
+
+class SQLiteStandIn:
+    """The inserts and dashboard queries of the app against one shared SQLite connection"""
+
+    def __init__(self, path: str = ':memory:'):
+        self.connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.lock = threading.Lock()
+        self.connection.execute("""
+        CREATE TABLE IF NOT EXISTS user_data (
+            ID INTEGER PRIMARY KEY AUTOINCREMENT, sec_token TEXT, ip_add TEXT, act_name TEXT,
+            act_mail TEXT, Name TEXT, Email_ID TEXT, resume_score TEXT, Timestamp TEXT,
+            submitted_at TEXT, Page_no TEXT, Predicted_Field TEXT, User_level TEXT,
+            Actual_skills TEXT, Recommended_skills TEXT, Recommended_courses TEXT,
+            pdf_name TEXT, city TEXT, state TEXT, country TEXT
+        )""")
+        self.connection.execute('CREATE INDEX IF NOT EXISTS idx_submitted_at ON user_data (submitted_at)')
+
+    def insert_user_data(self, data: Dict) -> bool:
+        submitted_at = datetime.datetime.strptime(data['timestamp'], '%Y-%m-%d_%H:%M:%S').isoformat(' ')
+        with self.lock:
+            self.connection.execute(
+                'INSERT INTO user_data (sec_token, ip_add, act_name, act_mail, Name, Email_ID, resume_score, '
+                'Timestamp, submitted_at, Page_no, Predicted_Field, User_level, Actual_skills, '
+                'Recommended_skills, Recommended_courses, pdf_name, city, state, country) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (data['sec_token'], data['ip_add'], data['act_name'], data['act_mail'], data['name'],
+                 data['email'], data['resume_score'], data['timestamp'], submitted_at, data['no_of_pages'],
+                 data['reco_field'], data['cand_level'], data['skills'], data['recommended_skills'],
+                 data['courses'], data['pdf_name'], data['city'], data['state'], data['country']))
+        return True
+
+    def dashboard(self) -> int:
+        """Run the admin page's aggregate queries plus its user table read"""
+        since = (datetime.datetime.now() - datetime.timedelta(days=30)).isoformat(' ')
+        queries = [
+            ('SELECT COUNT(*) FROM user_data', ()),
+            ("SELECT strftime('%Y-%m-%d', submitted_at) AS bucket, COUNT(*) FROM user_data "
+             'WHERE submitted_at >= ? GROUP BY bucket', (since,)),
+            ('SELECT CAST(resume_score AS INTEGER) / 10 * 10 AS bin, COUNT(*) FROM user_data GROUP BY bin', ()),
+            ('SELECT Predicted_Field, User_level, COUNT(*) FROM user_data GROUP BY Predicted_Field, User_level', ()),
+            ('SELECT country, COUNT(*) FROM user_data GROUP BY country', ()),
+            ('SELECT * FROM user_data', ()),
+        ]
+        rows = 0
+        with self.lock:
+            for sql, params in queries:
+                rows += len(self.connection.execute(sql, params).fetchall())
+        return rows
+
+
+class MySQLBackend:
+    """The app's own db_manager and analytics module against the configured MySQL database"""
+
+    def __init__(self, cache_ttl: int = 0):
+        from database import db_manager
+        from analytics import Analytics
+        if not db_manager.connect():
+            raise SystemExit('Database unavailable; use --db sqlite for a local stand-in')
+        db_manager.create_tables()
+        self.db = db_manager
+        self.analytics = Analytics(ttl=cache_ttl)
+
+    def insert_user_data(self, data: Dict) -> bool:
+        return self.db.insert_user_data(data)
+
+    def dashboard(self) -> int:
+        now = datetime.datetime.now()
+        rows = self.analytics.total_users()
+        rows += len(self.analytics.submissions_over_time(now - datetime.timedelta(days=30), now, 'day'))
+        rows += len(self.analytics.score_histogram())
+        rows += len(self.analytics.field_level_mix())
+        rows += len(self.analytics.value_counts('country'))
+        rows += len(self.db.get_user_data())
+        return rows
+
+
+class LoadTest:
+    def __init__(self, backend, resumes: List[Tuple[str, bytes]], admin_ratio: float = 0.1,
+                 think_time: float = 0.0, seed: int = 0):
+        self.backend = backend
+        self.resumes = resumes
+        self.admin_ratio = admin_ratio
+        self.think_time = think_time
+        self.seed = seed
+
+    def _analyze(self, filename: str, data: bytes) -> Dict:
+        if data is None:
+            return dict(SAMPLE_RESULT)
+        import analysis_worker
+        return analysis_worker.analyze_resume(data, filename)
+
+    def _upload(self, session: int, rng: random.Random) -> Dict[str, float]:
+        """One user upload; returns the seconds spent in each stage"""
+        import analysis_worker
+        filename, data = rng.choice(self.resumes)
+        timings = {}
+        started = time.perf_counter()
+        result = self._analyze(filename, data)
+        timings['analyze'] = time.perf_counter() - started
+        started = time.perf_counter()
+        metadata = {'ip_add': f"10.0.0.{session % 250}", 'act_name': f"session-{session}",
+                    'act_mail': f"session-{session}@load.test", 'act_mob': '0000000000',
+                    'city': 'Load', 'state': 'Test', 'country': 'Local', 'filename': filename}
+        record = analysis_worker.build_user_record(result, metadata, [])
+        if not self.backend.insert_user_data(record):
+            raise RuntimeError('insert failed')
+        timings['insert'] = time.perf_counter() - started
+        return timings
+
+    def _session(self, session: int, deadline: float, samples: Dict[str, List[float]],
+                 errors: Dict[str, int], lock: threading.Lock):
+        rng = random.Random(self.seed * 100003 + session)
+        while time.monotonic() < deadline:
+            kind = 'dashboard' if rng.random() < self.admin_ratio else 'upload'
+            started = time.perf_counter()
+            try:
+                if kind == 'dashboard':
+                    self.backend.dashboard()
+                    stages = {}
+                else:
+                    stages = self._upload(session, rng)
+                elapsed = time.perf_counter() - started
+                with lock:
+                    samples[kind].append(elapsed)
+                    for stage, seconds in stages.items():
+                        samples[stage].append(seconds)
+            except Exception as e:
+                logger.debug(f"Session {session} {kind} failed: {str(e)}")
+                with lock:
+                    errors[kind] += 1
+            if self.think_time:
+                time.sleep(rng.uniform(0, 2 * self.think_time))
+
+    def run_level(self, sessions: int, duration: float) -> Dict[str, Dict[str, float]]:
+        """
+        Run `sessions` concurrent sessions for `duration` seconds
+        Returns: {operation: {ops, throughput, p50_ms, p99_ms, error_rate}}
+        """
+        samples: Dict[str, List[float]] = defaultdict(list)
+        errors: Dict[str, int] = defaultdict(int)
+        lock = threading.Lock()
+        deadline = time.monotonic() + duration
+        started = time.monotonic()
+        threads = [threading.Thread(target=self._session, args=(i, deadline, samples, errors, lock), daemon=True)
+                   for i in range(sessions)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+        stats = {}
+        for kind in sorted(set(samples) | set(errors)):
+            latencies = np.array(samples.get(kind, []))
+            ops = len(latencies)
+            failed = errors.get(kind, 0)
+            stats[kind] = {
+                'ops': ops,
+                'throughput': ops / elapsed if elapsed else 0.0,
+                'p50_ms': float(np.percentile(latencies, 50) * 1000) if ops else float('nan'),
+                'p99_ms': float(np.percentile(latencies, 99) * 1000) if ops else float('nan'),
+                'error_rate': failed / (ops + failed) if ops + failed else 0.0,
+            }
+        return stats
+
+    def ramp(self, levels: List[int], duration: float) -> Dict[int, Dict[str, Dict[str, float]]]:
+        """Run every concurrency level in turn and print a report line per operation"""
+        report = {}
+        print(f"{'sessions':>8} {'operation':>10} {'ops':>7} {'ops/s':>8} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+        for sessions in levels:
+            report[sessions] = stats = self.run_level(sessions, duration)
+            for kind, row in stats.items():
+                print(f"{sessions:>8} {kind:>10} {row['ops']:>7} {row['throughput']:>8.2f} "
+                      f"{row['p50_ms']:>9.1f} {row['p99_ms']:>9.1f} {row['error_rate']:>7.1%}")
+        return report
+
+
+def load_resumes(directory: str) -> List[Tuple[str, bytes]]:
+    """(filename, bytes) of every readable resume in a directory"""
+    from text_extraction import resume_readers, file_extension
+    resumes = []
+    for name in sorted(os.listdir(directory)):
+        if file_extension(name) in resume_readers:
+            with open(os.path.join(directory, name), 'rb') as f:
+                resumes.append((name, f.read()))
+    if not resumes:
+        raise SystemExit(f"No pdf/docx resumes in {directory}")
+    return resumes
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Ramp concurrent sessions through upload and dashboard flows')
+    parser.add_argument('directory', nargs='?', help='folder of sample resumes (omit with --no-parse)')
+    parser.add_argument('--levels', type=int, nargs='+', default=[1, 2, 4, 8, 16])
+    parser.add_argument('--duration', type=float, default=20.0, help='seconds per concurrency level')
+    parser.add_argument('--db', choices=['mysql', 'sqlite'], default='sqlite')
+    parser.add_argument('--sqlite-path', default=':memory:')
+    parser.add_argument('--admin-ratio', type=float, default=0.1, help='share of operations that load the dashboard')
+    parser.add_argument('--think-time', type=float, default=0.0, help='mean pause between operations (seconds)')
+    parser.add_argument('--cache-ttl', type=int, default=0, help='analytics cache TTL for --db mysql')
+    parser.add_argument('--no-parse', action='store_true', help='skip parsing and insert a canned analysis')
+    args = parser.parse_args()
+    if args.no_parse:
+        resumes = [('sample.pdf', None)]
+    else:
+        if not args.directory:
+            parser.error('pass a folder of resumes, or --no-parse')
+        resumes = load_resumes(args.directory)
+        import analysis_worker
+        analysis_worker.init_worker()
+    backend = MySQLBackend(args.cache_ttl) if args.db == 'mysql' else SQLiteStandIn(args.sqlite_path)
+    LoadTest(backend, resumes, args.admin_ratio, args.think_time).ramp(args.levels, args.duration)
@@ -0,0 +1,147 @@
+"""
+Opt-in cProfile capture for slow analyses.
+
+With PROFILE_SLOW_MS set above 0, every analysis runs under cProfile and
+any run slower than the threshold is saved to PROFILE_FOLDER as
+<file hash>_<stage>_<time>_<ms>ms.prof. Inspect captures offline with
+
+    python profiling.py list
+    python profiling.py top Profiles/<capture>.prof
+    python profiling.py collapse Profiles/<capture>.prof > capture.folded
+
+Collapsed stacks load in speedscope or render with flamegraph.pl. cProfile
+records caller -> callee edges rather than whole stacks, so the stacks are
+rebuilt by splitting each function's time across its callers.
+"""
+import os
+import time
+import pstats
+import hashlib
+import argparse
+import cProfile
+import datetime
+import threading
+import logging
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+_active = threading.local()
+
+
+@contextmanager
+def profiled(stage: str, data, threshold_ms: Optional[float] = None):
+    """Profile the block and save the capture when it runs slower than the threshold"""
+    threshold_ms = Config.PROFILE_SLOW_MS if threshold_ms is None else threshold_ms
+    if threshold_ms <= 0 or getattr(_active, 'on', False):
+        # off, or nested inside a block that is already profiling
+        yield
+        return
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:
+        # another profiler already runs (Python 3.12+ allows one per process)
+        yield
+        return
+    _active.on = True
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        _active.on = False
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if elapsed_ms >= threshold_ms:
+            save_capture(profiler, stage, data, elapsed_ms)
+
+
+def save_capture(profiler: cProfile.Profile, stage: str, data, elapsed_ms: float) -> str:
+    """Write a capture named after the hash of the analysed file. Returns: its path, '' on failure"""
+    try:
+        os.makedirs(Config.PROFILE_FOLDER, exist_ok=True)
+        file_hash = hashlib.sha1(data).hexdigest()[:16]
+        stamp = datetime.datetime.now().strftime('%Y%m%d-%H%M%S')
+        path = os.path.join(Config.PROFILE_FOLDER, f"{file_hash}_{stage}_{stamp}_{elapsed_ms:.0f}ms.prof")
+        profiler.dump_stats(path)
+        logger.warning(f"Slow {stage} ({elapsed_ms:.0f}ms), profile saved to {path}")
+        return path
+
+    except Exception as e:
+        logger.error(f"Error saving profile: {str(e)}")
+        return ''
+
+
+def frame_label(func: Tuple[str, int, str]) -> str:
+    filename, line, name = func
+    if filename == '~':
+        return name  # builtins, e.g. <method 'search' of 're.Pattern' objects>
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+
+def collapsed_stacks(path: str, max_depth: int = 64, min_seconds: float = 1e-6) -> Dict[str, float]:
+    """
+    Rebuild stacks from a capture's caller -> callee edges
+    Returns: {'root;caller;callee': seconds of own time}
+    """
+    stats = pstats.Stats(path).stats
+    callees = defaultdict(list)
+    for func, (_, _, _, _, callers) in stats.items():
+        for caller, edge in callers.items():
+            callees[caller].append((func, edge[3]))
+    roots = [func for func, entry in stats.items() if not entry[4]]
+    stacks: Dict[str, float] = defaultdict(float)
+
+    def walk(func, path: List[str], seconds: float, seen: frozenset):
+        total = stats[func][3]
+        share = seconds / total if total else 0.0
+        stack = path + [frame_label(func)]
+        stacks[';'.join(stack)] += stats[func][2] * share
+        if len(stack) >= max_depth:
+            return
+        for child, child_seconds in callees.get(func, ()):
+            # recursion folds into the first occurrence of the function; tiny
+            # branches are dropped so wide call graphs stay tractable
+            if child not in seen and child_seconds * share >= min_seconds:
+                walk(child, stack, child_seconds * share, seen | {child})
+
+    for root in roots:
+        walk(root, [], stats[root][3], frozenset([root]))
+    return stacks
+
+
+def list_captures() -> List[Tuple[str, int]]:
+    """Saved captures, newest first. Returns: [(path, bytes), ...]"""
+    if not os.path.isdir(Config.PROFILE_FOLDER):
+        return []
+    paths = [os.path.join(Config.PROFILE_FOLDER, name) for name in os.listdir(Config.PROFILE_FOLDER)
+             if name.endswith('.prof')]
+    paths.sort(key=os.path.getmtime, reverse=True)
+    return [(path, os.path.getsize(path)) for path in paths]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Inspect profiles captured for slow analyses')
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('list', help='list saved captures')
+    top = commands.add_parser('top', help='print the most expensive functions of a capture')
+    top.add_argument('capture')
+    top.add_argument('--limit', type=int, default=25)
+    top.add_argument('--sort', default='cumulative', help='pstats sort key, e.g. cumulative or tottime')
+    collapse = commands.add_parser('collapse', help='print collapsed stacks (speedscope, flamegraph.pl)')
+    collapse.add_argument('capture')
+    collapse.add_argument('--max-depth', type=int, default=64)
+    args = parser.parse_args()
+    if args.command == 'list':
+        for path, size in list_captures():
+            print(f"{size / 1024:8.1f} KB  {path}")
+    elif args.command == 'top':
+        pstats.Stats(args.capture).sort_stats(args.sort).print_stats(args.limit)
+    else:
+        for stack, seconds in sorted(collapsed_stacks(args.capture, args.max_depth).items()):
+            # flamegraph.pl wants integer sample counts; use microseconds
+            if int(seconds * 1e6) > 0:
+                print(f"{stack} {int(seconds * 1e6)}")
@@ -0,0 +1,46 @@
+import os
+import importlib.util
+import logging
+from typing import List
+
+logger = logging.getLogger(__name__)
+
+# NLTK data and spaCy models the parser needs, checked on disk only
+NLTK_RESOURCES = {'stopwords': 'corpora/stopwords'}
+SPACY_MODELS = ['en_core_web_sm']
+# a module the repo's pyresparser overlay adds to the stock pip package
+OVERLAY_MARKER = 'resume_data.py'
+
+
+def missing_nlp_resources() -> List[str]:
+    """
+    List NLTK corpora and spaCy models that are not installed locally.
+    Nothing is downloaded; install them once with
+        python -m nltk.downloader stopwords
+        python -m spacy download en_core_web_sm
+    and copy the repo's pyresparser modules over the pip package with
+        python pyresparser/install_overlay.py
+    """
+    missing = []
+    try:
+        import nltk
+        for name, path in NLTK_RESOURCES.items():
+            try:
+                nltk.data.find(path)
+            except LookupError:
+                missing.append(f"nltk:{name}")
+    except ImportError:
+        missing.append("nltk")
+    for model in SPACY_MODELS:
+        # find_spec locates the model package without importing spaCy
+        if importlib.util.find_spec(model) is None:
+            missing.append(f"spacy:{model}")
+    spec = importlib.util.find_spec('pyresparser')
+    if spec is None:
+        missing.append("pyresparser")
+    elif not any(os.path.exists(os.path.join(location, OVERLAY_MARKER))
+                 for location in spec.submodule_search_locations or []):
+        missing.append("pyresparser:overlay")
+    if missing:
+        logger.warning(f"Missing NLP resources: {', '.join(missing)}")
+    return missing
@@ -6,6 +6,20 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Keywords marking each scored section, keyed like Config.SCORING_WEIGHTS
+SECTION_KEYWORDS = {
+    'objective': ['Objective', 'Summary'],
+    'education': ['Education', 'School', 'College'],
+    'experience': ['EXPERIENCE', 'Experience'],
+    'internships': ['INTERNSHIPS', 'INTERNSHIP', 'Internships', 'Internship'],
+    'skills': ['SKILLS', 'SKILL', 'Skills', 'Skill'],
+    'hobbies': ['HOBBIES', 'Hobbies'],
+    'interests': ['INTERESTS', 'Interests'],
+    'achievements': ['ACHIEVEMENTS', 'Achievements'],
+    'certifications': ['CERTIFICATIONS', 'Certifications', 'Certification'],
+    'projects': ['PROJECTS', 'PROJECT', 'Projects', 'Project'],
+}
+
 class ResumeAnalyzer:
     def __init__(self):
         self.scoring_weights = Config.SCORING_WEIGHTS
@@ -17,12 +31,12 @@ class ResumeAnalyzer:
         Returns: (level, message)
         """
         try:
+            present = self.section_features(resume_text)
             if no_of_pages < 1:
                 return "NA", "You are at Fresher level!"
             
             # Check for internship experience
-            internship_keywords = ['INTERNSHIP', 'INTERNSHIPS', 'Internship', 'Internships']
-            if any(keyword in resume_text for keyword in internship_keywords):
+            if present['internships']:
                 return "Intermediate", "You are at intermediate level!"
             
             # Check for work experience
@@ -58,17 +72,28 @@ class ResumeAnalyzer:
             logger.error(f"Error analyzing skills: {str(e)}")
             return "NA", ["Error in skill analysis"], "Error occurred during skill analysis"
     
+    def section_features(self, resume_text: str) -> Dict[str, int]:
+        """Section presence flags (1/0) keyed like the scoring weights; stored per resume for re-scoring"""
+        return {section: int(any(keyword in resume_text for keyword in keywords))
+                for section, keywords in SECTION_KEYWORDS.items()}
+    
+    def score_features(self, features: Dict[str, int], weights: Optional[Dict[str, int]] = None) -> int:
+        """Resume score of stored section features under the given (or current) weights"""
+        weights = weights or self.scoring_weights
+        return sum(weights[section] * features.get(section, 0) for section in weights)
+    
     def calculate_resume_score(self, resume_text: str) -> Tuple[int, List[Dict]]:
         """
         Calculate resume score based on content analysis
         Returns: (total_score, score_details)
         """
         try:
+            present = self.section_features(resume_text)
             score = 0
             score_details = []
             
             # Check for Objective/Summary
-            if any(keyword in resume_text for keyword in ['Objective', 'Summary']):
+            if present['objective']:
                 score += self.scoring_weights['objective']
                 score_details.append({
                     'component': 'Objective/Summary',
@@ -85,7 +110,7 @@ class ResumeAnalyzer:
                 })
             
             # Check for Education
-            if any(keyword in resume_text for keyword in ['Education', 'School', 'College']):
+            if present['education']:
                 score += self.scoring_weights['education']
                 score_details.append({
                     'component': 'Education',
@@ -102,7 +127,7 @@ class ResumeAnalyzer:
                 })
             
             # Check for Experience
-            if any(keyword in resume_text for keyword in ['EXPERIENCE', 'Experience']):
+            if present['experience']:
                 score += self.scoring_weights['experience']
                 score_details.append({
                     'component': 'Experience',
@@ -137,8 +162,7 @@ class ResumeAnalyzer:
                 })
             
             # Check for Skills
-            skills_keywords = ['SKILLS', 'SKILL', 'Skills', 'Skill']
-            if any(keyword in resume_text for keyword in skills_keywords):
+            if present['skills']:
                 score += self.scoring_weights['skills']
                 score_details.append({
                     'component': 'Skills',
@@ -155,7 +179,7 @@ class ResumeAnalyzer:
                 })
             
             # Check for Hobbies
-            if any(keyword in resume_text for keyword in ['HOBBIES', 'Hobbies']):
+            if present['hobbies']:
                 score += self.scoring_weights['hobbies']
                 score_details.append({
                     'component': 'Hobbies',
@@ -172,7 +196,7 @@ class ResumeAnalyzer:
                 })
             
             # Check for Interests
-            if any(keyword in resume_text for keyword in ['INTERESTS', 'Interests']):
+            if present['interests']:
                 score += self.scoring_weights['interests']
                 score_details.append({
                     'component': 'Interests',
@@ -189,7 +213,7 @@ class ResumeAnalyzer:
                 })
             
             # Check for Achievements
-            if any(keyword in resume_text for keyword in ['ACHIEVEMENTS', 'Achievements']):
+            if present['achievements']:
                 score += self.scoring_weights['achievements']
                 score_details.append({
                     'component': 'Achievements',
@@ -206,7 +230,7 @@ class ResumeAnalyzer:
                 })
             
             # Check for Certifications
-            if any(keyword in resume_text for keyword in ['CERTIFICATIONS', 'Certifications', 'Certification']):
+            if present['certifications']:
                 score += self.scoring_weights['certifications']
                 score_details.append({
                     'component': 'Certifications',
@@ -223,7 +247,7 @@ class ResumeAnalyzer:
                 })
             
             # Check for Projects
-            if any(keyword in resume_text for keyword in ['PROJECTS', 'PROJECT', 'Projects', 'Project']):
+            if present['projects']:
                 score += self.scoring_weights['projects']
                 score_details.append({
                     'component': 'Projects',
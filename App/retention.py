@@ -0,0 +1,252 @@
+import os
+import glob
+import gzip
+import json
+import shutil
+import argparse
+import datetime
+import time
+import logging
+from typing import Dict, List, Optional, Tuple
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+
+
+def month_start(day: datetime.date, months_back: int = 0) -> datetime.datetime:
+    """Midnight on the first day of the month `months_back` months before `day`"""
+    index = day.year * 12 + day.month - 1 - months_back
+    return datetime.datetime(index // 12, index % 12 + 1, 1)
+
+
+def plain_value(value):
+    """Column value as something json can write (BLOB columns hold utf-8 text)"""
+    if isinstance(value, bytes):
+        return value.decode('utf-8', errors='ignore')
+    return value
+
+
+class RetentionManager:
+    """
+    Keeps user_data and Uploaded_Resumes down to a hot working set.
+
+    Submissions are handled one calendar month at a time. Months older than
+    HOT_MONTHS (0 keeps everything) are written to a gzipped JSON-lines file
+    per month under ARCHIVE_FOLDER (rows plus their section features) and
+    then deleted from the hot tables, so dashboard queries and full-table
+    reads only ever see recent months. An archived month can be loaded back with restore_month().
+    Uploaded files are gzipped after UPLOAD_COMPRESS_DAYS and deleted after
+    UPLOAD_DELETE_DAYS (0 disables either step).
+    """
+
+    def __init__(self, archive_dir: Optional[str] = None, hot_months: Optional[int] = None):
+        self.archive_dir = archive_dir or Config.ARCHIVE_FOLDER
+        self.hot_months = Config.HOT_MONTHS if hot_months is None else hot_months
+
+    def cutoff(self, today: Optional[datetime.date] = None) -> datetime.datetime:
+        """Start of the oldest hot month; rows submitted before it are cold"""
+        return month_start(today or datetime.date.today(), max(self.hot_months - 1, 0))
+
+    def archive_path(self, month: str, part: int = 0) -> str:
+        suffix = f".{part}" if part else ''
+        return os.path.join(self.archive_dir, f"user_data_{month}{suffix}.jsonl.gz")
+
+    def cold_months(self, today: Optional[datetime.date] = None) -> List[Tuple[str, int]]:
+        """Months still in user_data that are older than the hot window. Returns: [(YYYY-MM, rows), ...]"""
+        from database import db_manager
+        try:
+            db_manager.cursor.execute("""
+            SELECT DATE_FORMAT(submitted_at, %s) AS month, COUNT(*) AS total
+            FROM user_data WHERE submitted_at < %s
+            GROUP BY month ORDER BY month
+            """, ('%Y-%m', self.cutoff(today)))
+            return [(row['month'], row['total']) for row in db_manager.cursor.fetchall()]
+
+        except Exception as e:
+            logger.error(f"Error listing cold months: {str(e)}")
+            return []
+
+    def archive_month(self, month: str) -> int:
+        """Move one month of user_data rows into its archive file. Returns: number of rows archived"""
+        from database import db_manager
+        start = datetime.datetime.strptime(month, '%Y-%m')
+        end = month_start(datetime.date(start.year, start.month, 28), -1)
+        os.makedirs(self.archive_dir, exist_ok=True)
+        part = 0
+        while os.path.exists(self.archive_path(month, part)):
+            part += 1
+        path = self.archive_path(month, part)
+        tmp_path = path + '.tmp'
+        archived = 0
+        try:
+            ids = []
+            last_id = 0
+            with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+                while True:
+                    db_manager.cursor.execute("""
+                    SELECT * FROM user_data
+                    WHERE submitted_at >= %s AND submitted_at < %s AND ID > %s
+                    ORDER BY ID LIMIT %s
+                    """, (start, end, last_id, BATCH_SIZE))
+                    rows = db_manager.cursor.fetchall()
+                    if not rows:
+                        break
+                    features = self._features([row['ID'] for row in rows])
+                    for row in rows:
+                        record = {column: plain_value(value) for column, value in row.items()
+                                  if column != 'submitted_at'}  # generated from Timestamp
+                        record['features'] = features.get(row['ID'])
+                        f.write(json.dumps(record) + '\n')
+                        ids.append(row['ID'])
+                    last_id = rows[-1]['ID']
+            if not ids:
+                os.remove(tmp_path)
+                return 0
+            # the file is complete before any row leaves the hot tables
+            os.replace(tmp_path, path)
+            for i in range(0, len(ids), BATCH_SIZE):
+                archived += self._delete(ids[i:i + BATCH_SIZE])
+            logger.info(f"Archived {archived} rows of {month} to {path}")
+            return archived
+
+        except Exception as e:
+            logger.error(f"Error archiving {month}: {str(e)}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return archived
+
+    def _features(self, ids: List[int]) -> Dict[int, Dict]:
+        from database import db_manager
+        placeholders = ', '.join(['%s'] * len(ids))
+        db_manager.cursor.execute(f"SELECT * FROM resume_features WHERE ID IN ({placeholders})", ids)
+        return {row.pop('ID'): row for row in db_manager.cursor.fetchall()}
+
+    def _delete(self, ids: List[int]) -> int:
+        from database import db_manager
+        placeholders = ', '.join(['%s'] * len(ids))
+        db_manager.cursor.execute(f"DELETE FROM resume_features WHERE ID IN ({placeholders})", ids)
+        db_manager.cursor.execute(f"DELETE FROM candidate_skills WHERE ID IN ({placeholders})", ids)
+        db_manager.cursor.execute(f"""
+        DELETE FROM resume_duplicates WHERE ID IN ({placeholders}) OR duplicate_of IN ({placeholders})
+        """, ids + ids)
+        deleted = db_manager.cursor.execute(f"DELETE FROM user_data WHERE ID IN ({placeholders})", ids)
+        db_manager.connection.commit()
+        # keep search results and duplicate links to rows that still exist
+        from candidate_search import candidate_index
+        from duplicate_detector import duplicate_detector
+        candidate_index.remove(ids)
+        duplicate_detector.remove(ids)
+        return deleted
+
+    def archive_cold(self, today: Optional[datetime.date] = None) -> Dict[str, int]:
+        """Archive every month older than the hot window. Returns: {YYYY-MM: rows archived}"""
+        from analytics import analytics
+        if not self.hot_months:
+            return {}
+        from facet_index import facet_index
+        archived = {month: self.archive_month(month) for month, _ in self.cold_months(today)}
+        if archived:
+            analytics.clear()
+            facet_index.reset()
+        return archived
+
+    def archived_months(self) -> List[str]:
+        paths = glob.glob(os.path.join(self.archive_dir, 'user_data_*.jsonl.gz'))
+        return sorted({os.path.basename(path)[len('user_data_'):len('user_data_') + 7] for path in paths})
+
+    def restore_month(self, month: str) -> int:
+        """Load an archived month back into user_data. Returns: number of rows restored"""
+        from database import db_manager, parse_list_field
+        restored = 0
+        try:
+            for path in sorted(glob.glob(os.path.join(self.archive_dir, f"user_data_{month}*.jsonl.gz"))):
+                with gzip.open(path, 'rt', encoding='utf-8') as f:
+                    for line in f:
+                        record = json.loads(line)
+                        features = record.pop('features', None)
+                        columns = ', '.join(record)
+                        placeholders = ', '.join(['%s'] * len(record))
+                        restored += db_manager.cursor.execute(
+                            f"INSERT IGNORE INTO user_data ({columns}) VALUES ({placeholders})", list(record.values()))
+                        db_manager.store_skills(record['ID'], parse_list_field(record['Actual_skills']),
+                                                parse_list_field(record['Recommended_skills']))
+                        if features:
+                            no_of_pages = features.pop('no_of_pages', 1)
+                            db_manager.store_features(record['ID'], features, no_of_pages)
+                db_manager.connection.commit()
+                os.remove(path)
+            logger.info(f"Restored {restored} rows of {month}")
+            if restored:
+                # restored IDs are below the index's watermark, so rebuild it
+                from facet_index import facet_index
+                facet_index.reset()
+            return restored
+
+        except Exception as e:
+            logger.error(f"Error restoring {month}: {str(e)}")
+            return restored
+
+    def prune_uploads(self, upload_dir: Optional[str] = None, now: Optional[float] = None) -> Dict[str, int]:
+        """Gzip uploads past UPLOAD_COMPRESS_DAYS and delete those past UPLOAD_DELETE_DAYS"""
+        upload_dir = upload_dir or Config.UPLOAD_FOLDER
+        now = now or time.time()
+        compress_before = now - Config.UPLOAD_COMPRESS_DAYS * 86400 if Config.UPLOAD_COMPRESS_DAYS else None
+        delete_before = now - Config.UPLOAD_DELETE_DAYS * 86400 if Config.UPLOAD_DELETE_DAYS else None
+        counts = {'compressed': 0, 'deleted': 0, 'bytes_freed': 0}
+        if not os.path.isdir(upload_dir):
+            return counts
+        for entry in os.scandir(upload_dir):
+            if not entry.is_file():
+                continue
+            try:
+                stat = entry.stat()
+                if delete_before is not None and stat.st_mtime < delete_before:
+                    os.remove(entry.path)
+                    counts['deleted'] += 1
+                    counts['bytes_freed'] += stat.st_size
+                elif (compress_before is not None and stat.st_mtime < compress_before
+                      and not entry.name.endswith('.gz')):
+                    with open(entry.path, 'rb') as src, gzip.open(entry.path + '.gz', 'wb') as dst:
+                        shutil.copyfileobj(src, dst)
+                    # keep the upload time so the delete age still counts from it
+                    shutil.copystat(entry.path, entry.path + '.gz')
+                    os.remove(entry.path)
+                    counts['compressed'] += 1
+                    counts['bytes_freed'] += stat.st_size - os.path.getsize(entry.path + '.gz')
+            except OSError as e:
+                logger.error(f"Error pruning {entry.path}: {str(e)}")
+        logger.info(f"Uploads pruned: {counts}")
+        return counts
+
+    def run(self) -> Dict:
+        """Apply the whole retention policy"""
+        return {'archived': self.archive_cold(), 'uploads': self.prune_uploads()}
+
+# Global retention manager instance
+retention_manager = RetentionManager()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Archive cold user_data months and prune old uploads')
+    parser.add_argument('--dry-run', action='store_true', help='list the cold months without moving anything')
+    parser.add_argument('--restore', metavar='YYYY-MM', help='load an archived month back into user_data')
+    args = parser.parse_args()
+    from database import db_manager
+    if not db_manager.connect():
+        raise SystemExit('Database unavailable')
+    # adds submitted_at, which the month queries rely on, to older tables
+    db_manager.create_tables()
+    if args.restore:
+        print(f"Restored {retention_manager.restore_month(args.restore)} rows of {args.restore}")
+    elif args.dry_run:
+        for month, total in retention_manager.cold_months():
+            print(f"{month}: {total} rows would be archived")
+        print(f"Archived already: {', '.join(retention_manager.archived_months()) or 'none'}")
+    else:
+        result = retention_manager.run()
+        for month, total in result['archived'].items():
+            print(f"{month}: archived {total} rows")
+        print(f"Uploads: {result['uploads']['compressed']} compressed, {result['uploads']['deleted']} deleted, "
+              f"{result['uploads']['bytes_freed'] / 1048576:.1f} MB freed")
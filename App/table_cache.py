@@ -0,0 +1,115 @@
+import time
+import threading
+import logging
+from typing import Dict, List, Optional, Tuple
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 5000
+
+# (select expression, DataFrame column) per cached table, in display order
+TABLES: Dict[str, List[Tuple[str, str]]] = {
+    'user_data': [
+        ('ID', 'ID'), ('sec_token', 'Token'), ('ip_add', 'IP Address'), ('act_name', 'Name'),
+        ('act_mail', 'Mail'), ('act_mob', 'Mobile Number'),
+        ('convert(Predicted_Field using utf8)', 'Predicted Field'), ('Timestamp', 'Timestamp'),
+        ('Name', 'Predicted Name'), ('Email_ID', 'Predicted Mail'), ('resume_score', 'Resume Score'),
+        ('Page_no', 'Total Page'), ('pdf_name', 'File Name'), ('convert(User_level using utf8)', 'User Level'),
+        ('convert(Actual_skills using utf8)', 'Actual Skills'),
+        ('convert(Recommended_skills using utf8)', 'Recommended Skills'),
+        ('convert(Recommended_courses using utf8)', 'Recommended Course'), ('city', 'City'),
+        ('state', 'State'), ('country', 'Country'), ('latlong', 'Lat Long'), ('os_name_ver', 'Server OS'),
+        ('host_name', 'Server Name'), ('dev_user', 'Server User'),
+    ],
+}
+
+
+class TableCache:
+    """
+    Admin dashboard DataFrames, one per table, kept in memory and grown by
+    ID watermark instead of re-read on every load.
+
+    A load checks MIN(ID) and MAX(ID) (two primary key lookups) at most
+    once per DASHBOARD_CHECK_INTERVAL seconds and runs no query in
+    between. A higher MAX(ID) fetches just the newer rows and appends them;
+    a changed MIN(ID) means rows were archived or restored, so the table is
+    read again. Call reset() after updating existing rows in place.
+    """
+
+    def __init__(self, check_interval: Optional[float] = None):
+        self.check_interval = Config.DASHBOARD_CHECK_INTERVAL if check_interval is None else check_interval
+        self.frames: Dict[str, object] = {}
+        self.first_ids: Dict[str, Optional[int]] = {}
+        self.last_ids: Dict[str, int] = {}
+        self.checked: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _bounds(self, table: str) -> Tuple[Optional[int], int]:
+        from database import db_manager
+        db_manager.cursor.execute(f"SELECT MIN(ID) AS first_id, MAX(ID) AS last_id FROM {table}")
+        row = db_manager.cursor.fetchone()
+        return row['first_id'], row['last_id'] or 0
+
+    def _fetch_after(self, table: str, last_id: int) -> List[List]:
+        from database import db_manager
+        columns = ', '.join(expression for expression, _ in TABLES[table])
+        rows = []
+        while True:
+            db_manager.cursor.execute(f"SELECT {columns} FROM {table} WHERE ID > %s ORDER BY ID LIMIT %s",
+                                      (last_id, BATCH_SIZE))
+            batch = db_manager.cursor.fetchall()
+            rows.extend(list(row.values()) for row in batch)
+            if len(batch) < BATCH_SIZE:
+                return rows
+            last_id = batch[-1]['ID']
+
+    def frame(self, table: str):
+        """
+        The table as a DataFrame, refreshed from rows newer than the watermark.
+        The frame is shared between sessions, so don't modify it in place.
+        Returns: pandas DataFrame (the last good one if the database is unreachable)
+        """
+        import pandas as pd
+        from database import db_manager
+        columns = [name for _, name in TABLES[table]]
+        with self._lock:
+            cached = previous = self.frames.get(table)
+            now = time.monotonic()
+            if cached is not None and now - self.checked.get(table, 0) < self.check_interval:
+                return cached
+            try:
+                if db_manager.connection is None and not db_manager.connect():
+                    return previous if previous is not None else pd.DataFrame(columns=columns)
+                first_id, last_id = self._bounds(table)
+                watermark = self.last_ids.get(table, 0)
+                if cached is None or first_id != self.first_ids[table]:
+                    # first load, or rows were archived or restored below the watermark
+                    cached, watermark = pd.DataFrame(columns=columns), 0
+                if last_id > watermark:
+                    rows = self._fetch_after(table, watermark)
+                    if rows:
+                        new = pd.DataFrame(rows, columns=columns)
+                        cached = pd.concat([cached, new], ignore_index=True) if len(cached) else new
+                        logger.info(f"Dashboard cache of {table} added {len(rows)} rows")
+                    # rows inserted since the MAX(ID) check may have come along too
+                    watermark = max(last_id, rows[-1][0]) if rows else last_id
+                self.frames[table] = cached
+                self.first_ids[table] = first_id
+                self.last_ids[table] = watermark
+                self.checked[table] = now
+                return cached
+
+            except Exception as e:
+                logger.error(f"Error refreshing dashboard cache of {table}: {str(e)}")
+                return previous if previous is not None else pd.DataFrame(columns=columns)
+
+    def reset(self, table: Optional[str] = None):
+        """Drop one cached table (all when None) so the next load reads it again"""
+        with self._lock:
+            for name in ([table] if table else list(self.frames)):
+                self.frames.pop(name, None)
+                self.checked.pop(name, None)
+
+# Global table cache instance
+table_cache = TableCache()
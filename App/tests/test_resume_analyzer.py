@@ -0,0 +1,16 @@
+from resume_analyzer import resume_analyzer
+
+
+def test_internship_resume_is_intermediate():
+    text = "Education\nB.Tech, XYZ College\nINTERNSHIPS\nAndroid intern at ABC"
+    assert resume_analyzer.analyze_experience_level(text, 1) == ("Intermediate", "You are at intermediate level!")
+
+
+def test_experience_resume_is_experienced():
+    text = "Work Experience\nSoftware engineer at ABC"
+    assert resume_analyzer.analyze_experience_level(text, 2)[0] == "Experienced"
+
+
+def test_resume_without_either_is_fresher():
+    assert resume_analyzer.analyze_experience_level("Education\nSkills", 1)[0] == "Fresher"
+    assert resume_analyzer.analyze_experience_level("", 0)[0] == "NA"
@@ -0,0 +1,39 @@
+import logging
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+def pdf_reader(file):
+    """Read the text of a pdf given its path or a binary file object"""
+    # pages already read by ResumeParser come from its page cache, so the
+    # score text costs no second extraction
+    from pyresparser.page_cache import page_cache
+    return ''.join(page_text for _, page_text in page_cache.pages(file))
+
+
+def docx_reader(file):
+    """Read the text of a docx by streaming word/document.xml paragraph by paragraph"""
+    # importing the pyresparser package loads spaCy, so only do it when reading
+    from pyresparser.docx_reader import extract_text_from_docx
+    return extract_text_from_docx(file)
+
+
+# text readers for every upload format we can score (legacy binary .doc is not a zip container)
+resume_readers = {'pdf': pdf_reader, 'docx': docx_reader}
+upload_types = [ext for ext in sorted(Config.ALLOWED_EXTENSIONS) if ext in resume_readers]
+
+
+def file_extension(filename: str) -> str:
+    """Lowercased extension of an uploaded file name, '' when it has none"""
+    if '.' not in filename:
+        return ''
+    return filename.rsplit('.', 1)[-1].lower()
+
+
+def extract_resume_text(file, filename: str) -> str:
+    """Read resume text with the reader matching the file name's extension"""
+    ext = file_extension(filename)
+    if ext not in resume_readers:
+        raise ValueError(f"No text reader for .{ext} files")
+    return resume_readers[ext](file)
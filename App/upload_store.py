@@ -0,0 +1,51 @@
+import os
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class UploadStore:
+    """
+    Optional copy of every upload in UPLOAD_FOLDER, written off the request path.
+
+    Parsing works on the upload's in-memory buffer, so nothing waits for the
+    disk. When SAVE_UPLOADS is on, save() hands a snapshot of the bytes to a
+    single background thread that writes it under a temporary name and then
+    renames it into place, so readers never see a half-written file.
+    """
+
+    def __init__(self, upload_dir: Optional[str] = None, enabled: Optional[bool] = None):
+        self.upload_dir = upload_dir or Config.UPLOAD_FOLDER
+        self.enabled = Config.SAVE_UPLOADS if enabled is None else enabled
+        self._executor = None
+
+    def _write(self, path: str, data: bytes) -> str:
+        tmp_path = path + '.tmp'
+        try:
+            os.makedirs(self.upload_dir, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            return path
+
+        except Exception as e:
+            logger.error(f"Error saving upload {path}: {str(e)}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return ''
+
+    def save(self, filename: str, data) -> Optional[Future]:
+        """Queue the upload to be written; returns the write's Future, or None when saving is off"""
+        if not self.enabled:
+            return None
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='upload-store')
+        # the upload buffer belongs to the Streamlit session, so copy it before the thread runs
+        path = os.path.join(self.upload_dir, os.path.basename(filename))
+        return self._executor.submit(self._write, path, bytes(data))
+
+# Global upload store instance
+upload_store = UploadStore()
@@ -0,0 +1,139 @@
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+ContactMatch = namedtuple('ContactMatch', ['kind', 'value', 'start', 'end'])
+
+# Alternatives are tried left to right at every position, so emails win
+# over the profile URLs and digit runs that can appear inside them.
+# Phone numbers need a +/00 country prefix, an area code in parentheses,
+# 3-3-4 grouping with spaces, hyphens or dots, 5-5 grouping with spaces or
+# hyphens, or exactly ten digits, so year lists, version strings and long
+# IDs are not taken for numbers.
+CONTACT_REGEX = re.compile(
+    r'''
+    (?P<email>[A-Za-z0-9._%+\-]+@[A-Za-z0-9\-]+(?:\.[A-Za-z0-9\-]+)*\.[A-Za-z]{2,})
+    |(?P<linkedin>(?:https?://)?(?:[a-z]{2,3}\.)?linkedin\.com/(?:in|pub)/[\w\-%]+/?)
+    |(?P<github>(?:https?://)?(?:www\.)?github\.com/[\w\-]+(?:/[\w.\-]+)?/?)
+    |(?P<portfolio>(?:https?://|www\.)[\w\-]+(?:\.[\w\-]+)+(?:/[^\s,;()<>]*)?)
+    |(?<![\w+.\-])(?P<phone>
+        (?:\+|00)\d{1,3}(?:[\s.\-]?(?:\(\d{1,4}\)|\d{1,5})){1,6}
+        |\(\d{2,4}\)[ \-]?\d{3,4}[ \-]?\d{4}
+        |\d{3}[ ]\d{3}[ ]\d{4}
+        |\d{3}-\d{3}-\d{4}
+        |\d{3}\.\d{3}\.\d{4}
+        |\d{5}[ \-]\d{5}
+        |0?\d{10}
+    )(?![\w.\-]\d|\w)
+    ''',
+    re.IGNORECASE | re.VERBOSE
+)
+
+MIN_NATIONAL_DIGITS = 10
+MIN_INTERNATIONAL_DIGITS = 8
+YEAR_GROUP = re.compile(r'(?<!\d)(?:19|20)\d\d(?!\d)')
+
+
+@lru_cache(maxsize=32)
+def _compile(pattern):
+    return re.compile(pattern)
+
+
+def normalize_phone(number, default_country_code=None):
+    '''
+    Helper function to normalize a phone number to `+<country><number>`
+
+    :param number: phone number as written in the resume
+    :param default_country_code: country code for numbers written without
+                                 one, e.g. '91'; left bare when None
+    :return: normalized number, or None if it has too few digits
+    '''
+    digits = re.sub(r'\D', '', number)
+    stripped = number.lstrip()
+    if stripped.startswith('+'):
+        international = True
+    elif stripped.startswith('00'):
+        digits = digits[2:]
+        international = True
+    else:
+        international = False
+    if international:
+        if len(digits) < MIN_INTERNATIONAL_DIGITS:
+            return None
+        return '+' + digits
+    if len(digits) < MIN_NATIONAL_DIGITS:
+        return None
+    # trunk prefix, e.g. 09876543210
+    if len(digits) == MIN_NATIONAL_DIGITS + 1 and digits.startswith('0'):
+        digits = digits[1:]
+    if default_country_code:
+        return '+' + default_country_code.lstrip('+') + digits
+    return digits
+
+
+def scan(text, default_country_code=None):
+    '''
+    Scan text once for emails, phone numbers and profile URLs
+
+    :param text: plain text extracted from resume file
+    :param default_country_code: see `normalize_phone`
+    :return: list of `ContactMatch` in document order
+    '''
+    matches = []
+    for match in CONTACT_REGEX.finditer(text):
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == 'phone':
+            # date ranges such as 2016 - 2018 2020
+            if len(YEAR_GROUP.findall(value)) > 1:
+                continue
+            value = normalize_phone(value, default_country_code)
+            if value is None:
+                continue
+        elif kind == 'email':
+            value = value.strip('.;')
+        else:
+            value = value.rstrip('/.')
+        matches.append(ContactMatch(kind, value, match.start(), match.end()))
+    return matches
+
+
+def extract_contacts(text, custom_regex=None, default_country_code=None):
+    '''
+    Helper function to extract contact details from text without any
+    spacy pipeline
+
+    :param text: plain text extracted from resume file
+    :param custom_regex: optional pattern that overrides phone detection
+    :param default_country_code: see `normalize_phone`
+    :return: dict with the first email, mobile number, LinkedIn, GitHub
+             and portfolio URL, plus every match under `matches`
+    '''
+    matches = scan(text, default_country_code)
+    if custom_regex:
+        matches = [m for m in matches if m.kind != 'phone']
+        for match in _compile(custom_regex).finditer(text):
+            value = ''.join(g for g in match.groups() if g) or match.group()
+            matches.append(
+                ContactMatch('phone', value, match.start(), match.end())
+            )
+        matches.sort(key=lambda m: m.start)
+    first = {}
+    for match in matches:
+        first.setdefault(match.kind, match.value)
+    return {
+        'email': first.get('email'),
+        'mobile_number': first.get('phone'),
+        'linkedin': first.get('linkedin'),
+        'github': first.get('github'),
+        'portfolio': first.get('portfolio'),
+        'matches': matches,
+    }
+
+
+def extract_email(text):
+    return extract_contacts(text)['email']
+
+
+def extract_mobile_number(text, custom_regex=None):
+    return extract_contacts(text, custom_regex)['mobile_number']
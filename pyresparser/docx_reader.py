@@ -0,0 +1,77 @@
+import zipfile
+import xml.etree.ElementTree as ET
+
+WORD_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+PROPS_NS = (
+    '{http://schemas.openxmlformats.org/officeDocument/2006/'
+    'extended-properties}'
+)
+
+_TEXT = WORD_NS + 't'
+_TAB = WORD_NS + 'tab'
+_BREAKS = (WORD_NS + 'br', WORD_NS + 'cr')
+_PARAGRAPH = WORD_NS + 'p'
+
+
+def iter_paragraphs(docx):
+    '''
+    Generator that streams paragraph text out of `word/document.xml`
+    with `iterparse`, discarding every paragraph once it is read so
+    memory stays flat regardless of document size
+
+    :param docx: path or file-like object of the .docx file
+    :return: iterator of paragraph strings
+    '''
+    with zipfile.ZipFile(docx) as archive:
+        with archive.open('word/document.xml') as document:
+            stack = []
+            parts = []
+            for event, elem in ET.iterparse(
+                        document,
+                        events=('start', 'end')
+            ):
+                if event == 'start':
+                    stack.append(elem)
+                    continue
+                stack.pop()
+                if elem.tag == _TEXT:
+                    parts.append(elem.text or '')
+                elif elem.tag == _TAB:
+                    parts.append('\t')
+                elif elem.tag in _BREAKS:
+                    parts.append('\n')
+                elif elem.tag == _PARAGRAPH:
+                    yield ''.join(parts)
+                    parts = []
+                    elem.clear()
+                    if stack:
+                        stack[-1].remove(elem)
+
+
+def extract_text_from_docx(docx):
+    '''
+    Helper function to extract plain text from a .docx file
+
+    :param docx: path or file-like object of the .docx file
+    :return: extracted text, one paragraph per line
+    '''
+    return '\n'.join(iter_paragraphs(docx))
+
+
+def get_number_of_pages(docx):
+    '''
+    Helper function to read the page count Word stores in
+    `docProps/app.xml`
+
+    :param docx: path or file-like object of the .docx file
+    :return: number of pages, or None if Word did not record it
+    '''
+    try:
+        with zipfile.ZipFile(docx) as archive:
+            with archive.open('docProps/app.xml') as props:
+                for _, elem in ET.iterparse(props):
+                    if elem.tag == PROPS_NS + 'Pages':
+                        return int(elem.text)
+    except (KeyError, ValueError, TypeError, zipfile.BadZipFile):
+        return None
+    return None
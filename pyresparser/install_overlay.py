@@ -0,0 +1,48 @@
+'''
+Install the modules in this folder over the pip `pyresparser` package.
+
+The repo only carries the files it changes or adds (resume_parser.py,
+docx_reader.py, resume_data.py, ...); utils, constants, skills.csv and
+the custom spaCy model still come from `pip install pyresparser==1.0.6`.
+Run once after installing requirements, and again after pulling changes:
+
+    python pyresparser/install_overlay.py
+'''
+import os
+import sys
+import glob
+import shutil
+import importlib.util
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def package_dir():
+    '''
+    Helper function to locate the installed pyresparser package
+
+    :return: package directory, or None if pyresparser is not installed
+    '''
+    # find_spec on a top-level name does not import the package (or spaCy)
+    spec = importlib.util.find_spec('pyresparser')
+    if spec is None or not spec.submodule_search_locations:
+        return None
+    target = list(spec.submodule_search_locations)[0]
+    if os.path.abspath(target) == HERE:
+        return None
+    return target
+
+
+def install():
+    target = package_dir()
+    if target is None:
+        sys.exit('pyresparser is not installed: pip install -r App/requirements.txt first')
+    for path in sorted(glob.glob(os.path.join(HERE, '*.py'))):
+        if os.path.basename(path) == os.path.basename(__file__):
+            continue
+        shutil.copy2(path, target)
+        print('installed', os.path.basename(path), '->', target)
+
+
+if __name__ == '__main__':
+    install()
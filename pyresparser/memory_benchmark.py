@@ -0,0 +1,48 @@
+'''
+Memory benchmark for batch parsing. Parses `--count` resumes (cycling
+through the files of a directory), keeps every result like a batch
+caller would, and prints resident memory as it goes. With compact
+results RSS should level off after the first few hundred resumes
+
+    python -m pyresparser.memory_benchmark resumes/ --count 10000
+'''
+import os
+import time
+import argparse
+from .resume_parser import ResumeParser
+from .process_stats import current_rss_mb
+
+
+def run(directory, count, report_every):
+    files = sorted(
+        os.path.join(root, name)
+        for root, _, names in os.walk(directory)
+        for name in names
+        if name.lower().endswith(('.pdf', '.docx'))
+    )
+    if not files:
+        raise SystemExit('No .pdf or .docx files under %s' % directory)
+    results = []
+    samples = []
+    start = time.time()
+    for i in range(count):
+        results.append(ResumeParser(files[i % len(files)]).get_extracted_data())
+        if (i + 1) % report_every == 0 or i + 1 == count:
+            rss = current_rss_mb()
+            if rss is None:
+                raise SystemExit('RSS is not measurable on this platform')
+            samples.append(rss)
+            print('%7d resumes  %8.1f MB RSS  %6.1f resumes/s' % (
+                i + 1, rss, (i + 1) / (time.time() - start)))
+    if len(samples) > 2:
+        print('RSS growth after warm-up: %+.1f MB' % (samples[-1] - samples[1]))
+    return samples
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('directory')
+    parser.add_argument('--count', type=int, default=10000)
+    parser.add_argument('--report-every', type=int, default=500)
+    args = parser.parse_args()
+    run(args.directory, args.count, args.report_every)
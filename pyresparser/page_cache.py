@@ -0,0 +1,188 @@
+import io
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from pdfminer.converter import TextConverter
+from pdfminer.layout import LAParams
+from pdfminer.pdfinterp import PDFPageInterpreter
+from pdfminer.pdfinterp import PDFResourceManager
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdftypes import resolve1
+
+MAX_PAGES = int(os.getenv('PYRESPARSER_PAGE_CACHE_SIZE', 256))
+# extract in a resource-capped child process (see sandbox.py); 0 extracts in-process
+SANDBOX = os.getenv('PYRESPARSER_SANDBOX', '1') != '0'
+
+
+def page_key(page):
+    '''
+    Helper function to hash what a PDF page draws: its media box and the
+    decoded bytes of its content streams. A re-uploaded resume with one
+    edited page keeps the keys of all the other pages
+
+    :param page: `pdfminer.pdfpage.PDFPage`
+    :return: hex digest, or None if a stream could not be decoded
+    '''
+    digest = hashlib.sha1(repr(page.mediabox).encode('ascii'))
+    try:
+        for stream in page.contents:
+            digest.update(resolve1(stream).get_data())
+    except Exception:
+        return None
+    return digest.hexdigest()
+
+
+def extract_page_text(page, resource_manager):
+    '''
+    Helper function to extract the plain text of one PDF page
+
+    :param page: `pdfminer.pdfpage.PDFPage`
+    :param resource_manager: `PDFResourceManager` shared by the document's pages
+    :return: page text, ending in a form feed
+    '''
+    fake_file_handle = io.StringIO()
+    converter = TextConverter(
+        resource_manager,
+        fake_file_handle,
+        laparams=LAParams()
+    )
+    try:
+        PDFPageInterpreter(resource_manager, converter).process_page(page)
+        return fake_file_handle.getvalue()
+    finally:
+        converter.close()
+        fake_file_handle.close()
+
+
+class PageCache(object):
+    '''
+    Per-process LRU cache of PDF page text and page-level analysis, keyed
+    by `page_key`. Revised uploads of a resume only extract and analyse
+    the pages that changed; every other page is served from the cache
+    '''
+
+    def __init__(self, max_pages=MAX_PAGES):
+        self.max_pages = max_pages
+        self._entries = OrderedDict()
+        # sandboxed documents seen lately -> their page keys, so reading
+        # the same file again needs no child process
+        self._documents = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _put(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_pages:
+                self._entries.popitem(last=False)
+
+    def pages(self, pdf):
+        '''
+        Read a PDF page by page, extracting only pages not seen before
+
+        :param pdf: path or binary file object of the PDF
+        :return: list of (page key or None, page text) in page order
+        '''
+        if SANDBOX:
+            return self._sandboxed_pages(pdf)
+        fh = open(pdf, 'rb') if isinstance(pdf, str) else pdf
+        try:
+            if fh is pdf:
+                fh.seek(0)
+            resource_manager = PDFResourceManager(caching=True)
+            result = []
+            for page in PDFPage.get_pages(
+                        fh,
+                        caching=True,
+                        check_extractable=True
+            ):
+                key = page_key(page)
+                entry = self._get(key) if key else None
+                if entry is None:
+                    entry = {'text': extract_page_text(page, resource_manager),
+                             'analysis': {}}
+                    if key:
+                        self._put(key, entry)
+                result.append((key, entry['text']))
+            return result
+        finally:
+            if fh is not pdf:
+                fh.close()
+
+    def _sandboxed_pages(self, pdf):
+        from .sandbox import extract_pages
+        if isinstance(pdf, str):
+            with open(pdf, 'rb') as fh:
+                data = fh.read()
+            filename = os.path.basename(pdf)
+        else:
+            pdf.seek(0)
+            data = pdf.getbuffer() if isinstance(pdf, io.BytesIO) else pdf.read()
+            filename = getattr(pdf, 'name', None)
+        try:
+            digest = hashlib.sha1(data).hexdigest()
+            with self._lock:
+                keys = self._documents.get(digest)
+            if keys is not None:
+                entries = [self._get(key) for key in keys]
+                if all(entries):
+                    return [(key, entry['text']) for key, entry in zip(keys, entries)]
+            with self._lock:
+                known = list(self._entries)
+            pages = extract_pages(data, known, filename)
+            entries = [self._get(key) if text is None else None for key, text in pages]
+            if any(text is None and entry is None for (_, text), entry in zip(pages, entries)):
+                # a cached page was evicted meanwhile; extract everything
+                pages = extract_pages(data, (), filename)
+                entries = [None] * len(pages)
+        finally:
+            if isinstance(data, memoryview):
+                data.release()
+        result = []
+        for (key, text), entry in zip(pages, entries):
+            if entry is None:
+                entry = {'text': text, 'analysis': {}}
+                if key:
+                    self._put(key, entry)
+            result.append((key, entry['text']))
+        if all(key for key, _ in pages):
+            with self._lock:
+                self._documents[digest] = [key for key, _ in pages]
+                while len(self._documents) > self.max_pages:
+                    self._documents.popitem(last=False)
+        return result
+
+    def analysis(self, key, text, variant, analyse):
+        '''
+        Page-level analysis, computed once per page and variant
+
+        :param key: page key from `pages`, None disables caching
+        :param text: page text
+        :param variant: hashable settings the analysis depends on, e.g.
+                        the skills file
+        :param analyse: function of the page text computing the analysis
+        :return: the analysis result
+        '''
+        entry = self._get(key) if key else None
+        if entry is None:
+            return analyse(text)
+        result = entry['analysis'].get(variant)
+        if result is None:
+            result = entry['analysis'][variant] = analyse(text)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._documents.clear()
+
+
+page_cache = PageCache()
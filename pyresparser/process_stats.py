@@ -0,0 +1,42 @@
+import os
+import sys
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def current_rss_mb():
+    '''
+    Helper function to read the current resident set size
+
+    :return: RSS in megabytes (peak RSS where /proc is unavailable), or
+             None if unknown
+    '''
+    try:
+        with open('/proc/self/statm') as fh:
+            pages = int(fh.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        if resource is None:
+            return None
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # kilobytes on Linux, bytes on macOS
+        return peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+def available_memory_mb():
+    '''
+    Helper function to read available system memory
+
+    :return: MemAvailable in megabytes, or None if unknown
+    '''
+    try:
+        with open('/proc/meminfo') as fh:
+            for line in fh:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
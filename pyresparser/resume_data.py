@@ -0,0 +1,74 @@
+class ResumeData(object):
+    '''
+    Extracted fields of one resume. Slotted so batch callers holding
+    thousands of results keep only these values alive, not per-instance
+    dicts. Supports mapping-style access (`data['name']`) for callers
+    written against the old dict result
+    '''
+
+    __slots__ = (
+        'name',
+        'email',
+        'mobile_number',
+        'linkedin',
+        'github',
+        'portfolio',
+        'skills',
+        'degree',
+        'no_of_pages',
+    )
+
+    def __init__(self, **fields):
+        for key in self.__slots__:
+            setattr(self, key, fields.get(key))
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self.__slots__
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def __len__(self):
+        return len(self.__slots__)
+
+    def __bool__(self):
+        return True
+
+    def __eq__(self, other):
+        if isinstance(other, ResumeData):
+            other = other.to_dict()
+        return self.to_dict() == other
+
+    def __repr__(self):
+        return 'ResumeData(%s)' % ', '.join(
+            '%s=%r' % (key, getattr(self, key)) for key in self.__slots__
+        )
+
+    def __getstate__(self):
+        return self.to_dict()
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default) if key in self.__slots__ \
+            else default
+
+    def keys(self):
+        return list(self.__slots__)
+
+    def items(self):
+        return [(key, getattr(self, key)) for key in self.__slots__]
+
+    def to_dict(self):
+        return {key: getattr(self, key) for key in self.__slots__}
@@ -1,13 +1,98 @@
 import os
-import multiprocessing as mp
 import io
 import spacy
 import pprint
 from spacy.matcher import Matcher
 from . import utils
+from . import docx_reader
+from . import skills_gazetteer
+from . import contact_extractor
+from .page_cache import page_cache
+from .resume_data import ResumeData
+
+_models = {}
+
+
+def load_models():
+    '''
+    Load the NLP pipeline once per process. Call it before forking
+    workers so they share the loaded models copy-on-write.
+
+    The custom Name/Degree entity recognizer is added to the end of the
+    base `en_core_web_sm` pipeline, whose own parser and NER are never
+    used and stay disabled, so one tokenization and one `Doc` per resume
+    serve the tagger (name matching), the skills gazetteer and the custom
+    entities
+
+    :return: the merged `Language` pipeline
+    '''
+    if not _models:
+        nlp = spacy.load('en_core_web_sm', disable=['parser', 'ner'])
+        custom_nlp = spacy.load(
+            os.path.dirname(os.path.abspath(__file__))
+        )
+        custom_ner = custom_nlp.get_pipe('ner')
+        # entity labels are stored as hashes; the base vocab must know their
+        # strings for `ent.label_` to resolve
+        for label in custom_ner.labels:
+            nlp.vocab.strings.add(label)
+        nlp.add_pipe(custom_ner, name='custom_ner', last=True)
+        _models['nlp'] = nlp
+    return _models['nlp']
+
+
+def analyse_text(nlp, text_raw, skills_file=None):
+    '''
+    Run the NLP pipeline over one page (or a whole document) of raw text
+
+    :param nlp: pipeline from `load_models`
+    :param text_raw: extracted text with its line breaks
+    :param skills_file: path of the skills csv, defaults to the bundled one
+    :return: dict of custom `entities`, matcher `name` and `skills`
+    '''
+    # the custom model was trained on raw text with its line breaks, so
+    # the shared Doc is built from that; whitespace tokens are skipped
+    # by the skills gazetteer
+    doc = nlp(text_raw)
+    return {
+        'entities': utils.extract_entities_wih_custom_model(doc),
+        'name': utils.extract_name(doc, matcher=Matcher(nlp.vocab)),
+        'skills': skills_gazetteer.extract_skills(doc, skills_file),
+    }
+
+
+def merge_analyses(analyses):
+    '''
+    Combine page-level analyses into one for the document: entities and
+    skills are unioned in page order, the matcher name comes from the
+    first page that has one
+
+    :param analyses: list of `analyse_text` results in page order
+    :return: merged analysis
+    '''
+    entities = {}
+    skills = []
+    name = None
+    for analysis in analyses:
+        for label, values in analysis['entities'].items():
+            merged = entities.setdefault(label, [])
+            merged.extend(v for v in values if v not in merged)
+        skills.extend(s for s in analysis['skills'] if s not in skills)
+        if name is None:
+            name = analysis['name']
+    return {'entities': entities, 'name': name, 'skills': skills}
 
 
 class ResumeParser(object):
+    '''
+    Extracts fields from a resume while constructing. Only the compact
+    `ResumeData` result is kept on the instance; the spaCy Doc, raw and
+    normalized text and the input buffer are dropped as soon as
+    extraction finishes.
+
+    PDFs are read and analysed page by page through `page_cache`, so a
+    revised upload only re-extracts and re-analyses its changed pages
+    '''
 
     def __init__(
         self,
@@ -15,74 +100,70 @@ class ResumeParser(object):
         skills_file=None,
         custom_regex=None
     ):
-        nlp = spacy.load('en_core_web_sm')
-        custom_nlp = spacy.load(os.path.dirname(os.path.abspath(__file__)))
-        self.__skills_file = skills_file
-        self.__custom_regex = custom_regex
-        self.__matcher = Matcher(nlp.vocab)
-        self.__details = {
-            'name': None,
-            'email': None,
-            'mobile_number': None,
-            'skills': None,
-            'degree': None,
-            'no_of_pages': None,
-        }
-        self.__resume = resume
-        if not isinstance(self.__resume, io.BytesIO):
-            ext = os.path.splitext(self.__resume)[1].split('.')[1]
+        nlp = load_models()
+        if not isinstance(resume, io.BytesIO):
+            ext = os.path.splitext(resume)[1].lstrip('.')
+        else:
+            ext = os.path.splitext(resume.name)[1].lstrip('.')
+        ext = ext.lower()
+        if ext == 'pdf':
+            pages = page_cache.pages(resume)
+            text_raw = ' '.join(page_text for _, page_text in pages)
+            analysis = merge_analyses([
+                page_cache.analysis(
+                    key,
+                    page_text,
+                    skills_file,
+                    lambda page_text: analyse_text(nlp, page_text, skills_file)
+                )
+                for key, page_text in pages
+            ])
+            no_of_pages = len(pages)
         else:
-            ext = self.__resume.name.split('.')[1]
-        self.__text_raw = utils.extract_text(self.__resume, '.' + ext)
-        self.__text = ' '.join(self.__text_raw.split())
-        self.__nlp = nlp(self.__text)
-        self.__custom_nlp = custom_nlp(self.__text_raw)
-        self.__noun_chunks = list(self.__nlp.noun_chunks)
-        self.__get_basic_details()
+            if ext == 'docx':
+                text_raw = docx_reader.extract_text_from_docx(resume)
+                no_of_pages = docx_reader.get_number_of_pages(resume)
+            else:
+                text_raw = utils.extract_text(resume, '.' + ext)
+                no_of_pages = utils.get_number_of_pages(resume)
+            analysis = analyse_text(nlp, text_raw, skills_file)
+        self.__details = self.__get_basic_details(
+            ' '.join(text_raw.split()),
+            analysis,
+            no_of_pages,
+            custom_regex
+        )
 
     def get_extracted_data(self):
         return self.__details
 
-    def __get_basic_details(self):
-        cust_ent = utils.extract_entities_wih_custom_model(
-                            self.__custom_nlp
-                        )
-        name = utils.extract_name(self.__nlp, matcher=self.__matcher)
-        email = utils.extract_email(self.__text)
-        mobile = utils.extract_mobile_number(self.__text, self.__custom_regex)
-        skills = utils.extract_skills(
-                    self.__nlp,
-                    self.__noun_chunks,
-                    self.__skills_file
-                )
-
-        entities = utils.extract_entity_sections_grad(self.__text_raw)
+    @staticmethod
+    def __get_basic_details(text, analysis, no_of_pages, custom_regex):
+        details = ResumeData()
+        cust_ent = analysis['entities']
+        contacts = contact_extractor.extract_contacts(text, custom_regex)
 
         # extract name
         try:
-            self.__details['name'] = cust_ent['Name'][0]
+            details.name = cust_ent['Name'][0]
         except (IndexError, KeyError):
-            self.__details['name'] = name
-
-        # extract email
-        self.__details['email'] = email
+            details.name = analysis['name']
 
-        # extract mobile number
-        self.__details['mobile_number'] = mobile
+        # extract email, mobile number and profile links
+        for key in ('email', 'mobile_number', 'linkedin', 'github',
+                    'portfolio'):
+            details[key] = contacts[key]
 
         # extract skills
-        self.__details['skills'] = skills
+        details.skills = analysis['skills']
 
         # no of pages
-        self.__details['no_of_pages'] = utils.get_number_of_pages(self.__resume)
+        details.no_of_pages = no_of_pages
 
         # extract education Degree
-        try:
-            self.__details['degree'] = cust_ent['Degree']
-        except KeyError:
-            pass
+        details.degree = cust_ent.get('Degree')
 
-        return
+        return details
 
 
 def resume_result_wrapper(resume):
@@ -91,22 +172,15 @@ def resume_result_wrapper(resume):
 
 
 if __name__ == '__main__':
-    pool = mp.Pool(mp.cpu_count())
+    from .worker_pool import RecyclingPool
 
     resumes = []
-    data = []
     for root, directories, filenames in os.walk('resumes'):
         for filename in filenames:
             file = os.path.join(root, filename)
             resumes.append(file)
 
-    results = [
-        pool.apply_async(
-            resume_result_wrapper,
-            args=(x,)
-        ) for x in resumes
-    ]
-
-    results = [p.get() for p in results]
+    with RecyclingPool(initializer=load_models) as pool:
+        results = pool.map(resume_result_wrapper, resumes)
 
     pprint.pprint(results)
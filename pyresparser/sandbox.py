@@ -0,0 +1,214 @@
+'''
+Runs PDF text extraction in a resource-capped child process.
+
+The child is this file run as a script, so it imports pdfminer and
+`page_cache` but never spaCy. Before reading the PDF it caps its own CPU
+time and address space; it refuses documents with too many objects or
+pages and gives every page a time limit. A PDF that trips any limit (or
+fails to parse) is copied into the quarantine directory with a JSON
+report and `ExtractionRejected` is raised, leaving the caller's process
+untouched.
+'''
+import io
+import os
+import sys
+import json
+import signal
+import hashlib
+import logging
+import datetime
+import subprocess
+
+try:
+    import resource
+except ImportError:  # Windows: no rlimits, only the wall-clock timeout
+    resource = None
+
+LIMITS = {
+    'cpu_seconds': int(os.getenv('PYRESPARSER_SANDBOX_CPU_SECONDS', 30)),
+    'memory_mb': int(os.getenv('PYRESPARSER_SANDBOX_MEMORY_MB', 1024)),
+    'page_seconds': float(os.getenv('PYRESPARSER_SANDBOX_PAGE_SECONDS', 10)),
+    'max_pages': int(os.getenv('PYRESPARSER_SANDBOX_MAX_PAGES', 50)),
+    'max_objects': int(os.getenv('PYRESPARSER_SANDBOX_MAX_OBJECTS', 100000)),
+}
+# the child is killed outright past this, whatever it is doing
+WALL_SECONDS = float(os.getenv('PYRESPARSER_SANDBOX_WALL_SECONDS', 60))
+QUARANTINE_DIR = os.getenv('PYRESPARSER_QUARANTINE_DIR')
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractionRejected(ValueError):
+    '''
+    Raised when a PDF trips a sandbox limit or cannot be parsed
+    '''
+
+
+class PageTimeout(Exception):
+    pass
+
+
+def quarantine_dir():
+    '''
+    Helper function to locate the quarantine directory, by default next
+    to the gazetteer cache
+
+    :return: directory path
+    '''
+    if QUARANTINE_DIR:
+        return QUARANTINE_DIR
+    from .skills_gazetteer import CACHE_DIR
+    return os.path.join(CACHE_DIR, 'quarantine')
+
+
+def quarantine(data, reason, filename=None):
+    '''
+    Helper function to keep a rejected PDF and a report of why, named by
+    the file's hash so repeated uploads of it share one entry
+
+    :param data: PDF bytes
+    :param reason: why the file was rejected
+    :param filename: original file name, if known
+    :return: path of the report
+    '''
+    digest = hashlib.sha1(data).hexdigest()
+    directory = quarantine_dir()
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    with open(os.path.join(directory, digest + '.pdf'), 'wb') as fh:
+        fh.write(data)
+    report_path = os.path.join(directory, digest + '.json')
+    with open(report_path, 'w', encoding='utf-8') as fh:
+        json.dump({
+            'sha1': digest,
+            'filename': filename,
+            'reason': reason,
+            'bytes': len(data),
+            'time': datetime.datetime.now().isoformat(timespec='seconds'),
+            'limits': LIMITS,
+        }, fh)
+    return report_path
+
+
+def quarantined():
+    '''
+    Helper function to list the reports of quarantined files
+
+    :return: list of report dicts, newest first
+    '''
+    directory = quarantine_dir()
+    if not os.path.isdir(directory):
+        return []
+    reports = []
+    for name in os.listdir(directory):
+        if name.endswith('.json'):
+            try:
+                with open(os.path.join(directory, name), encoding='utf-8') as fh:
+                    reports.append(json.load(fh))
+            except (OSError, ValueError):
+                continue
+    return sorted(reports, key=lambda report: report.get('time', ''), reverse=True)
+
+
+def _exit_reason(returncode, stderr):
+    # SIGXCPU (soft CPU limit) and SIGKILL (hard limit) only exist on POSIX
+    cpu_signals = {getattr(signal, 'SIGXCPU', None), getattr(signal, 'SIGKILL', None)} - {None}
+    if -returncode in cpu_signals:
+        return 'exceeded the CPU time limit of %ds' % LIMITS['cpu_seconds']
+    lines = stderr.decode('utf-8', 'replace').strip().splitlines()
+    if lines and 'MemoryError' in lines[-1]:
+        return 'exceeded the memory limit of %d MB' % LIMITS['memory_mb']
+    return 'extractor exited with status %d: %s' % (returncode, lines[-1] if lines else '')
+
+
+def extract_pages(data, known=(), filename=None):
+    '''
+    Extract page keys and text of a PDF in a resource-capped child process
+
+    :param data: PDF bytes (or a memoryview of them)
+    :param known: page keys whose text the caller has cached; those pages
+                  come back with text None
+    :param filename: original file name, recorded if the file is quarantined
+    :return: list of (page key or None, page text or None) in page order
+    '''
+    settings = dict(LIMITS, known=sorted(known))
+    try:
+        proc = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), json.dumps(settings)],
+            input=data,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            timeout=WALL_SECONDS
+        )
+    except subprocess.TimeoutExpired:
+        reason = 'took longer than %ds' % WALL_SECONDS
+    else:
+        if proc.returncode == 0:
+            result = json.loads(proc.stdout)
+            if 'pages' in result:
+                return [tuple(page) for page in result['pages']]
+            reason = result['error']
+        else:
+            reason = _exit_reason(proc.returncode, proc.stderr)
+    report = quarantine(bytes(data), reason, filename)
+    logger.warning('Quarantined %s: %s (report: %s)', filename, reason, report)
+    raise ExtractionRejected('PDF rejected: %s' % reason)
+
+
+def _on_alarm(signum, frame):
+    raise PageTimeout()
+
+
+def _child(settings):
+    if resource is not None:
+        cpu = settings['cpu_seconds']
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu, cpu + 1))
+        memory = settings['memory_mb'] * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (memory, memory))
+    data = sys.stdin.buffer.read()
+
+    # run as a script, so these are the plain modules next to this file
+    from page_cache import page_key, extract_page_text
+    from pdfminer.pdfdocument import PDFDocument
+    from pdfminer.pdfinterp import PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+    from pdfminer.pdfparser import PDFParser
+
+    known = set(settings['known'])
+    try:
+        document = PDFDocument(PDFParser(io.BytesIO(data)))
+        objects = sum(len(list(xref.get_objids())) for xref in document.xrefs)
+        if objects > settings['max_objects']:
+            return {'error': 'has %d objects, more than the limit of %d'
+                             % (objects, settings['max_objects'])}
+        if not document.is_extractable:
+            return {'error': 'does not allow text extraction'}
+        resource_manager = PDFResourceManager(caching=True)
+        # no interval timers on Windows; the parent's wall-clock timeout still applies
+        page_timer = hasattr(signal, 'setitimer')
+        if page_timer:
+            signal.signal(signal.SIGALRM, _on_alarm)
+        pages = []
+        for number, page in enumerate(PDFPage.create_pages(document), start=1):
+            if number > settings['max_pages']:
+                return {'error': 'has more than %d pages' % settings['max_pages']}
+            if page_timer:
+                signal.setitimer(signal.ITIMER_REAL, settings['page_seconds'])
+            try:
+                key = page_key(page)
+                text = None if key in known else extract_page_text(page, resource_manager)
+            except PageTimeout:
+                return {'error': 'page %d took longer than %gs'
+                                 % (number, settings['page_seconds'])}
+            finally:
+                if page_timer:
+                    signal.setitimer(signal.ITIMER_REAL, 0)
+            pages.append((key, text))
+        return {'pages': pages}
+    except MemoryError:
+        return {'error': 'exceeded the memory limit of %d MB' % settings['memory_mb']}
+    except Exception as e:
+        return {'error': 'could not be parsed (%s: %s)' % (type(e).__name__, e)}
+
+
+if __name__ == '__main__':
+    sys.stdout.write(json.dumps(_child(json.loads(sys.argv[1]))))
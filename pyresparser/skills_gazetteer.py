@@ -0,0 +1,169 @@
+import os
+import csv
+import json
+import hashlib
+import threading
+
+DEFAULT_SKILLS_FILE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    'skills.csv'
+)
+# per-user cache directory; compiled tries are stored as plain JSON so a
+# cache file can never execute code when it is read back
+CACHE_DIR = os.getenv(
+    'PYRESPARSER_CACHE_DIR',
+    os.path.join(
+        os.getenv('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache')),
+        'pyresparser'
+    )
+)
+
+# marks the end of a complete skill inside a trie node
+_END = ''
+
+_loaded = {}
+_lock = threading.Lock()
+
+
+class SkillsGazetteer(object):
+    '''
+    Token trie over every skill in a skills file. Multi-word skills are
+    stored as paths of lowercased tokens, so a resume is matched in one
+    left-to-right pass over its tokens
+    '''
+
+    def __init__(self, trie, max_len, checksum):
+        self.trie = trie
+        self.max_len = max_len
+        self.checksum = checksum
+
+    @classmethod
+    def compile(cls, skills, checksum):
+        trie = {}
+        max_len = 0
+        for skill in skills:
+            parts = skill.lower().split()
+            if not parts:
+                continue
+            node = trie
+            for part in parts:
+                node = node.setdefault(part, {})
+            node[_END] = True
+            max_len = max(max_len, len(parts))
+        return cls(trie, max_len, checksum)
+
+    def to_json(self):
+        return json.dumps(
+            {'checksum': self.checksum, 'max_len': self.max_len, 'trie': self.trie},
+            separators=(',', ':')
+        )
+
+    @classmethod
+    def from_json(cls, data, checksum):
+        state = json.loads(data)
+        if state.get('checksum') != checksum:
+            raise ValueError('gazetteer cache does not match the skills file')
+        return cls(state['trie'], state['max_len'], checksum)
+
+    def match(self, tokens, stop_words=()):
+        '''
+        Find skills in a token sequence, preferring the longest match at
+        each position
+
+        :param tokens: lowercased token strings in document order
+        :param stop_words: indexes of tokens that may not match alone
+        :return: set of matched skills (lowercased)
+        '''
+        found = set()
+        i = 0
+        n = len(tokens)
+        while i < n:
+            node = self.trie
+            end = 0
+            j = i
+            while j < n and j - i < self.max_len:
+                node = node.get(tokens[j])
+                if node is None:
+                    break
+                j += 1
+                if _END in node:
+                    end = j
+            if end and not (end - i == 1 and i in stop_words):
+                found.add(' '.join(tokens[i:end]))
+                i = end
+            else:
+                i += 1
+        return found
+
+
+def _checksum(path):
+    digest = hashlib.sha1()
+    with open(path, 'rb') as fh:
+        for block in iter(lambda: fh.read(1 << 16), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _read_skills(path):
+    # skills.csv keeps every skill in its single header row
+    with open(path, newline='', encoding='utf-8') as fh:
+        for row in csv.reader(fh):
+            return [cell.strip() for cell in row if cell.strip()]
+    return []
+
+
+def load_gazetteer(skills_file=None):
+    '''
+    Load the compiled gazetteer for a skills file. Compiled tries are
+    saved as JSON under `CACHE_DIR` keyed by the file's checksum and kept in
+    memory, so every parser in the process shares one instance
+
+    :param skills_file: path of the skills csv, defaults to the bundled one
+    :return: `SkillsGazetteer`
+    '''
+    path = os.path.abspath(skills_file or DEFAULT_SKILLS_FILE)
+    stat = os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _loaded.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    with _lock:
+        cached = _loaded.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        checksum = _checksum(path)
+        cache_path = os.path.join(CACHE_DIR, checksum + '.json')
+        try:
+            with open(cache_path, encoding='utf-8') as fh:
+                gazetteer = SkillsGazetteer.from_json(fh.read(), checksum)
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            gazetteer = SkillsGazetteer.compile(_read_skills(path), checksum)
+            try:
+                os.makedirs(CACHE_DIR, mode=0o700, exist_ok=True)
+                tmp_path = cache_path + '.%d.tmp' % os.getpid()
+                with open(tmp_path, 'w', encoding='utf-8') as fh:
+                    fh.write(gazetteer.to_json())
+                os.replace(tmp_path, cache_path)
+            except OSError:
+                pass
+        _loaded[path] = (stamp, gazetteer)
+        return gazetteer
+
+
+def extract_skills(nlp_text, skills_file=None):
+    '''
+    Helper function to extract skills from spacy nlp text in a single
+    pass over its tokens
+
+    :param nlp_text: object of `spacy.tokens.doc.Doc`
+    :param skills_file: path of the skills csv, defaults to the bundled one
+    :return: list of skills extracted
+    '''
+    gazetteer = load_gazetteer(skills_file)
+    # line breaks and runs of spaces are tokens of their own; drop them so
+    # multi-word skills still match across them
+    words = [token for token in nlp_text if not token.is_space]
+    tokens = [token.text.lower() for token in words]
+    stop_words = {i for i, token in enumerate(words) if token.is_stop}
+    skills = gazetteer.match(tokens, stop_words)
+    return [skill.capitalize() for skill in skills]
@@ -0,0 +1,25 @@
+import os
+import re
+import importlib.util
+
+# loaded by path: importing the pyresparser package pulls in spaCy
+spec = importlib.util.spec_from_file_location(
+    'contact_extractor',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'contact_extractor.py'))
+contact_extractor = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(contact_extractor)
+
+
+def test_grouped_numbers_are_found():
+    for number in ['555 123 4567', '555-123-4567', '555.123.4567', '(555) 123-4567', '98765 43210']:
+        assert contact_extractor.extract_mobile_number('Phone: %s\n' % number) == re.sub(r'\D', '', number), number
+
+
+def test_dotted_number_at_end_of_sentence():
+    contacts = contact_extractor.extract_contacts('Call me on 555.123.4567. Mail jane@example.com')
+    assert contacts['mobile_number'] == '5551234567'
+    assert contacts['email'] == 'jane@example.com'
+
+
+def test_years_and_versions_are_not_numbers():
+    assert not contact_extractor.extract_mobile_number('2016 2017 2018 2019, Python 3.10.12, v1.555.123.4567')
@@ -0,0 +1,174 @@
+import os
+import logging
+import traceback
+import multiprocessing as mp
+from multiprocessing.connection import wait
+from .process_stats import current_rss_mb, available_memory_mb
+
+logger = logging.getLogger(__name__)
+
+# rough resident size of one parsing worker (spaCy models + pdfminer)
+WORKER_MEMORY_MB = int(os.getenv('PYRESPARSER_WORKER_MB', 600))
+MAX_TASKS_PER_CHILD = 200
+# times an item may take down its worker before it is given up on
+MAX_ATTEMPTS = 3
+IDLE = -1
+
+
+def default_processes(worker_memory_mb=WORKER_MEMORY_MB):
+    '''
+    Helper function to size a pool by CPU count and available memory
+
+    :param worker_memory_mb: expected resident size of one worker
+    :return: number of worker processes
+    '''
+    processes = mp.cpu_count()
+    available = available_memory_mb()
+    if available is not None:
+        processes = min(processes, int(available // worker_memory_mb))
+    return max(1, processes)
+
+
+def _worker(slot, current, tasks, results, initializer, maxtasks, max_rss_mb):
+    # results is this worker's own pipe: send() writes synchronously, so
+    # nothing already reported is lost if the worker is killed later
+    if initializer is not None:
+        initializer()
+    done = 0
+    while True:
+        task = tasks.get()
+        if task is None:
+            results.send(('exit', slot, None, None))
+            return
+        index, func, args = task
+        # written straight to shared memory, so the parent can see which
+        # item a worker held even if it is killed before anything is sent
+        current[slot] = index
+        try:
+            results.send(('ok', slot, index, func(*args)))
+        except Exception:
+            results.send(('error', slot, index, traceback.format_exc()))
+        done += 1
+        rss = current_rss_mb() if max_rss_mb else None
+        if done >= maxtasks or (rss is not None and rss > max_rss_mb):
+            results.send(('exit', slot, None, None))
+            return
+
+
+class RecyclingPool(object):
+    '''
+    Process pool whose workers load models once and are replaced after
+    `maxtasksperchild` tasks or once their RSS passes `max_rss_mb`, so
+    long runs do not grow memory without bound. With the fork start
+    method the initializer also runs in the parent first, so workers
+    share the loaded models copy-on-write instead of loading them again
+    '''
+
+    def __init__(self, processes=None, initializer=None,
+                 maxtasksperchild=MAX_TASKS_PER_CHILD, max_rss_mb=None,
+                 max_attempts=MAX_ATTEMPTS):
+        methods = mp.get_all_start_methods()
+        self.context = mp.get_context('fork' if 'fork' in methods else None)
+        if initializer is not None and 'fork' in methods:
+            initializer()
+        self.processes = processes or default_processes()
+        self.initializer = initializer
+        self.maxtasksperchild = maxtasksperchild
+        self.max_rss_mb = max_rss_mb
+        self.max_attempts = max_attempts
+        self.tasks = self.context.Queue()
+        self.current = self.context.RawArray('l', [IDLE] * self.processes)
+        self.workers = {}
+        self.pipes = {}
+        for slot in range(self.processes):
+            self.__spawn(slot)
+
+    def __spawn(self, slot):
+        self.current[slot] = IDLE
+        reader, writer = self.context.Pipe(duplex=False)
+        process = self.context.Process(
+            target=_worker,
+            args=(slot, self.current, self.tasks, writer,
+                  self.initializer, self.maxtasksperchild, self.max_rss_mb),
+            daemon=True
+        )
+        process.start()
+        writer.close()
+        self.workers[slot] = process
+        self.pipes[slot] = reader
+
+    def __retire(self, slot):
+        process = self.workers.pop(slot, None)
+        if process is not None:
+            process.join()
+            self.pipes.pop(slot).close()
+
+    def map(self, func, iterable):
+        '''
+        Run `func` over every item, replacing workers as they retire or die
+
+        :param func: picklable function taking one item
+        :param iterable: items to process
+        :return: results in input order; failed items hold a
+                 `RuntimeError` with the worker's traceback, or a note
+                 that the item killed its worker `max_attempts` times
+        '''
+        items = list(iterable)
+        for index, item in enumerate(items):
+            self.tasks.put((index, func, (item,)))
+        results = [None] * len(items)
+        attempts = [0] * len(items)
+        pending = set(range(len(items)))
+        while pending:
+            wait(list(self.pipes.values()), timeout=1)
+            for slot in list(self.workers):
+                self.__collect(slot, results, pending)
+                if not self.workers[slot].is_alive():
+                    # drain again: it may have reported just before dying
+                    self.__collect(slot, results, pending)
+                    self.__replace_dead(slot, func, items, results, attempts, pending)
+        return results
+
+    def __collect(self, slot, results, pending):
+        reader = self.pipes[slot]
+        try:
+            while reader.poll():
+                kind, _, index, value = reader.recv()
+                if kind == 'exit':
+                    self.__retire(slot)
+                    self.__spawn(slot)
+                    return
+                if index in pending:
+                    pending.discard(index)
+                    results[index] = value if kind == 'ok' else RuntimeError(value)
+        except EOFError:
+            # the worker died; map replaces it
+            pass
+
+    def __replace_dead(self, slot, func, items, results, attempts, pending):
+        lost = self.current[slot]
+        self.__retire(slot)
+        self.__spawn(slot)
+        if lost == IDLE or lost not in pending:
+            return
+        attempts[lost] += 1
+        if attempts[lost] >= self.max_attempts:
+            logger.error('Task %d killed its worker %d times, giving up', lost, attempts[lost])
+            pending.discard(lost)
+            results[lost] = RuntimeError(
+                'Worker died {} times processing this item'.format(attempts[lost]))
+        else:
+            logger.warning('Worker in slot %d died, retrying task %d', slot, lost)
+            self.tasks.put((lost, func, (items[lost],)))
+
+    def close(self):
+        for _ in list(self.workers):
+            self.tasks.put(None)
+        for slot in list(self.workers):
+            self.__retire(slot)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()